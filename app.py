@@ -3,19 +3,28 @@
 StoryWeaver 동화책을 활용한 영어 학습 프로그램
 """
 
+from dotenv import load_dotenv
+
+# 프로젝트 모듈은 가져올 때 .env 설정(os.getenv)을 읽으므로 가장 먼저 불러옴
+load_dotenv()
+
 import streamlit as st
 import json
 import os
-from gtts import gTTS
 import base64
 from io import BytesIO
-import speech_recognition as sr
-from difflib import SequenceMatcher
 import random
 from datetime import datetime, timedelta
-from crawler import StoryWeaverCrawler
-from pdf_processor import PDFProcessor
-from gemini_helper import evaluate_pronunciation, generate_vocabulary_quiz
+import story_store
+import lazy_translation
+import enrichment_worker
+import pronunciation_scorer
+import tts_prefetch
+import audio_encoding
+
+# gTTS, speech_recognition, 크롤러(requests/bs4/deep_translator), PDF 처리(fitz/PIL),
+# Gemini(google.generativeai)는 불러오는 데 오래 걸리므로 해당 기능을 처음 쓸 때 가져옵니다.
+# 시작 시간 확인: python bench_import_time.py
 
 # 페이지 설정
 st.set_page_config(
@@ -757,11 +766,7 @@ if st.session_state.ui_high_contrast:
 
 def load_stories():
     """저장된 동화책 목록을 불러옵니다."""
-    try:
-        with open('stories.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except:
-        return []
+    return story_store.load_stories()
 
 
 def load_learning_stats():
@@ -862,60 +867,9 @@ def mark_story_completed(story_id, story_title):
 
 
 def text_to_speech(text, lang='en', speed=1.0):
-    """텍스트를 음성으로 변환합니다. (속도 조절 가능)"""
+    """텍스트를 음성으로 변환합니다. (속도 조절 가능, 한 번 만든 음성은 캐시에서 바로 반환)"""
     try:
-        from pydub import AudioSegment
-        import tempfile
-        import os
-        import time
-
-        # gTTS로 음성 생성
-        # speed가 0.7 이하면 slow=True 사용
-        slow = (speed <= 0.7)
-        tts = gTTS(text=text, lang=lang, slow=slow)
-
-        # 임시 파일에 저장 (자동 삭제하지 않음)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-        temp_path = temp_file.name
-        temp_file.close()  # 파일 핸들을 먼저 닫음
-
-        tts.save(temp_path)
-
-        # 오디오 로드
-        audio = AudioSegment.from_mp3(temp_path)
-
-        # 속도 조절 (slow=True일 때는 이미 느리므로 추가 조절 안함)
-        if not slow and speed != 1.0:
-            # frame_rate를 조절하여 속도 변경
-            new_frame_rate = int(audio.frame_rate * (1.0 / speed))
-            audio = audio._spawn(audio.raw_data, overrides={'frame_rate': new_frame_rate})
-            audio = audio.set_frame_rate(44100)  # 표준 샘플링 레이트로 재설정
-
-        # BytesIO로 변환
-        fp = BytesIO()
-        audio.export(fp, format='mp3')
-        fp.seek(0)
-
-        # 임시 파일 삭제 시도 (실패해도 무시)
-        try:
-            time.sleep(0.1)  # 짧은 대기
-            os.unlink(temp_path)
-        except Exception:
-            pass  # 삭제 실패 시 무시 (시스템이 나중에 정리)
-
-        return fp
-    except ImportError:
-        # pydub가 없으면 기본 gTTS만 사용
-        try:
-            slow = (speed <= 0.7)
-            tts = gTTS(text=text, lang=lang, slow=slow)
-            fp = BytesIO()
-            tts.write_to_fp(fp)
-            fp.seek(0)
-            return fp
-        except Exception as e:
-            st.error(f"음성 변환 오류: {str(e)}")
-            return None
+        return BytesIO(tts_prefetch.get_audio(text, lang, speed))
     except Exception as e:
         st.error(f"음성 변환 오류: {str(e)}")
         return None
@@ -924,24 +878,60 @@ def text_to_speech(text, lang='en', speed=1.0):
 def play_audio(audio_fp, autoplay=True):
     """오디오를 재생합니다."""
     if audio_fp:
-        st.audio(audio_fp, format='audio/mp3', autoplay=autoplay)
-
-
-def recognize_speech():
-    """마이크로 음성을 인식합니다."""
+        st.audio(audio_fp, format=audio_encoding.mime_type(audio_fp.getvalue()), autoplay=autoplay)
+
+
+def recognize_speech(poll_seconds=0.3):
+    """
+    마이크로 음성을 인식합니다.
+    녹음과 인식은 백그라운드에서 실행하고, 스크립트는 기다리지 않고 진행 상태만 표시합니다.
+    아직 끝나지 않았으면 None을 반환하고 poll_seconds 뒤에 화면을 다시 그려 상태를 확인합니다.
+    주변 소음 크기는 세션에서 처음 한 번만 잽니다.
+
+    사용법 (말하기를 시작한 뒤 다시 그릴 때마다 호출):
+        if st.button("🎤 말하기"):
+            st.session_state.listening = True
+        if st.session_state.get('listening'):
+            spoken = recognize_speech()
+
+    Returns:
+        str: 인식한 텍스트 (진행 중이거나 실패하면 None, 끝나면 listening이 False가 됨)
+    """
+    placeholder = st.empty()
     try:
-        import pyaudio
-        # 명시적으로 PyAudio를 사용하도록 설정
-        recognizer = sr.Recognizer()
-        with sr.Microphone() as source:
-            st.info("🎤 듣고 있습니다... 말씀해주세요!")
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
-
-        st.info("🔄 음성을 분석하고 있습니다...")
-        text = recognizer.recognize_google(audio, language='en-US')
-        return text
+        import queue
+        import speech_recognition as sr
+        import speech_capture
+
+        capture = st.session_state.get('speech_capture')
+        if capture is None:
+            statuses = queue.Queue()
+            capture = {
+                'statuses': statuses,
+                'status': None,
+                'future': speech_capture.start(
+                    st.session_state.get('noise_floor'),
+                    lambda status, **fields: statuses.put((status, fields)),
+                ),
+            }
+            st.session_state.speech_capture = capture
+
+        while True:
+            try:
+                status, fields = capture['statuses'].get_nowait()
+            except queue.Empty:
+                break
+            if 'noise_floor' in fields:
+                st.session_state.noise_floor = fields['noise_floor']
+            capture['status'] = status
+
+        if capture['future'].done():
+            _finish_speech_capture()
+            return capture['future'].result()['text']
+        if capture['status']:
+            placeholder.info(speech_capture.STATUS_LABELS.get(capture['status'], capture['status']))
     except ImportError:
+        _finish_speech_capture()
         st.error("오디오 처리를 위한 라이브러리가 설치되지 않았습니다.")
         return None
     except sr.WaitTimeoutError:
@@ -977,12 +967,21 @@ def recognize_speech():
             st.error(f"오류가 발생했습니다: {original_msg}")
         return None
 
+    # 진행 중이면 스크립트를 붙잡지 않고 잠시 뒤 다시 그려서 상태를 확인함
+    import time
+    time.sleep(poll_seconds)
+    st.rerun()
+
+
+def _finish_speech_capture():
+    """녹음 상태를 정리합니다. (다음 말하기에서 새로 시작)"""
+    st.session_state.pop('speech_capture', None)
+    st.session_state.listening = False
+
 
 def calculate_similarity(text1, text2):
-    """두 텍스트의 유사도를 계산합니다."""
-    text1 = text1.lower().strip()
-    text2 = text2.lower().strip()
-    return SequenceMatcher(None, text1, text2).ratio()
+    """두 텍스트의 유사도를 계산합니다. (단어 정렬 기반 발음 점수)"""
+    return pronunciation_scorer.score_pronunciation(text1, text2)['score']
 
 
 # ==================== 사이드바 ====================
@@ -1060,6 +1059,25 @@ with st.sidebar:
 
     st.markdown("---")
 
+    # 동화책 준비 작업 상태 (백그라운드에서 단어/카드/번역 준비)
+    enrichment_jobs = enrichment_worker.get_jobs()
+    if enrichment_jobs:
+        with st.expander("🛠️ 동화책 준비 상태"):
+            for job in enrichment_jobs:
+                label = enrichment_worker.STATUS_LABELS.get(job['status'], job['status'])
+                step = f" · {job['step']}" if job.get('step') else ""
+                st.caption(f"{label} {job.get('title', '')}{step}")
+                if job.get('error'):
+                    st.caption(f"  오류: {job['error']}")
+            import tts_cache
+            cache_stats = tts_cache.stats()
+            st.caption(f"🔊 음성 캐시: 적중률 {cache_stats['hit_rate']:.0%} · "
+                       f"{cache_stats['disk_items']}개 ({cache_stats['disk_mb']:.1f}MB)")
+            if st.button("🔄 상태 새로고침", use_container_width=True, key="refresh_enrichment"):
+                st.rerun()
+
+        st.markdown("---")
+
     # 4. 동화책 추가 (expander)
     with st.expander("➕ 동화책 추가하기"):
         # 수동 동화책 추가
@@ -1085,9 +1103,10 @@ with st.sidebar:
             with col1:
                 if st.button("➕ 페이지 추가", use_container_width=True):
                     if page_text.strip():
-                        from deep_translator import GoogleTranslator
-                        translator = GoogleTranslator(source='en', target='ko')
-                        ko_text = translator.translate(page_text.strip())
+                        from crawler import StoryWeaverCrawler
+                        crawler = StoryWeaverCrawler()
+                        # 크롤러와 같은 번역 경로 (실패하면 원문 사용, translation_metrics에 기록)
+                        ko_text = crawler._translate_to_korean(page_text.strip())
 
                         st.session_state.manual_pages.append({
                             'image_url': page_image,
@@ -1104,8 +1123,8 @@ with st.sidebar:
                                 'source_url': 'manual',
                                 'pages': st.session_state.manual_pages
                             }
-                            crawler = StoryWeaverCrawler()
                             if crawler.save_story(story_data):
+                                enrichment_worker.enqueue(story_data['id'], story_data['title'])
                                 st.success(f"✅ '{story_data['title']}' 동화책이 저장되었습니다!")
                                 st.balloons()
                                 st.session_state.creating_manual = False
@@ -1136,14 +1155,23 @@ with st.sidebar:
             key="pdf_title"
         )
 
+        pdf_lazy_translation = st.checkbox(
+            "⚡ 빠르게 추가하기 (읽으면서 번역)",
+            value=True,
+            key="pdf_lazy_translation",
+            help="번역을 미리 하지 않고, 페이지를 볼 때 번역합니다. 큰 동화책도 바로 읽을 수 있어요."
+        )
+
         if st.button("🚀 PDF 처리하기", use_container_width=True, key="process_pdf"):
             if pdf_file:
                 try:
                     with st.spinner("PDF를 처리하고 번역하는 중입니다... 조금만 기다려주세요! ⏳"):
+                        from pdf_processor import PDFProcessor
                         processor = PDFProcessor()
                         story_data = processor.process_pdf(
                             pdf_file,
-                            title=pdf_title if pdf_title else None
+                            title=pdf_title if pdf_title else None,
+                            lazy_translation=pdf_lazy_translation
                         )
 
                         # 에러 체크
@@ -1162,6 +1190,7 @@ with st.sidebar:
                         # 정상 처리
                         elif story_data and story_data.get('pages') and len(story_data['pages']) > 0:
                             if processor.save_story(story_data):
+                                enrichment_worker.enqueue(story_data['id'], story_data['title'])
                                 st.success(f"✅ '{story_data['title']}' 동화책이 추가되었습니다!")
                                 st.info(f"📚 총 {len(story_data['pages'])} 페이지가 추출되었습니다.")
                                 st.balloons()
@@ -1199,12 +1228,7 @@ with st.sidebar:
                 with col1:
                     if st.button("✅ 예, 삭제합니다", use_container_width=True):
                         # 동화책 삭제
-                        stories = load_stories()
-                        stories = [s for s in stories if s['id'] != st.session_state.current_story['id']]
-
-                        # JSON 파일에 저장
-                        with open('stories.json', 'w', encoding='utf-8') as f:
-                            json.dump(stories, f, ensure_ascii=False, indent=2)
+                        story_store.delete_story(st.session_state.current_story['id'])
 
                         st.success("삭제되었습니다!")
                         st.session_state.current_story = None
@@ -1262,16 +1286,11 @@ with st.sidebar:
                 with col1:
                     if st.button("💾 저장", use_container_width=True):
                         # 텍스트 업데이트
-                        stories = load_stories()
-                        for story in stories:
-                            if story['id'] == st.session_state.current_story['id']:
-                                story['pages'][selected_page_idx]['en'] = new_en_text
-                                story['pages'][selected_page_idx]['ko'] = new_ko_text
-                                break
+                        def _apply_edit(story):
+                            story['pages'][selected_page_idx]['en'] = new_en_text
+                            story['pages'][selected_page_idx]['ko'] = new_ko_text
 
-                        # JSON 파일에 저장
-                        with open('stories.json', 'w', encoding='utf-8') as f:
-                            json.dump(stories, f, ensure_ascii=False, indent=2)
+                        story_store.update_story(st.session_state.current_story['id'], _apply_edit)
 
                         st.success("저장되었습니다!")
                         st.session_state.current_story['pages'][selected_page_idx]['en'] = new_en_text
@@ -1331,6 +1350,11 @@ else:
             current_page = st.session_state.current_page
             page = story['pages'][current_page]
 
+            # 아직 번역되지 않은 페이지는 읽는 동안 미리 번역
+            lazy_translation.prefetch(story, current_page)
+            # 듣기 버튼을 누르기 전에 현재/다음 페이지 음성을 선택한 속도로 미리 만듦
+            tts_prefetch.prefetch(story, current_page, st.session_state.speech_speed)
+
             # 컨텐츠 영역 시작 (하단 네비게이션을 위한 여백 추가)
             st.markdown('<div class="content-with-fixed-nav">', unsafe_allow_html=True)
 
@@ -1392,7 +1416,11 @@ else:
             if page['image_url']:
                 st.markdown(f'<img src="{page["image_url"]}" alt="{story["title"]} - 페이지 {current_page + 1} 삽화" class="story-image">', unsafe_allow_html=True)
 
-            # 한국어 번역 표시
+            # 한국어 번역 표시 (미리 번역이 끝나지 않았다면 기다림)
+            if st.session_state.show_korean and lazy_translation.needs_translation(page):
+                with st.spinner("번역 중..."):
+                    lazy_translation.get_translation(story, current_page)
+
             if st.session_state.show_korean and page['ko']:
                 st.markdown(f'<div class="korean-text">{page["ko"]}</div>', unsafe_allow_html=True)
 
@@ -1446,41 +1474,46 @@ else:
             st.session_state.current_card_index = 0
         if 'show_answer' not in st.session_state:
             st.session_state.show_answer = False
-        if 'last_vocabulary_story_id' not in st.session_state:
-            st.session_state.last_vocabulary_story_id = None
+        if 'last_vocabulary_key' not in st.session_state:
+            st.session_state.last_vocabulary_key = None
 
-        # 책이 변경되면 vocabulary 데이터 리셋
-        if st.session_state.last_vocabulary_story_id != story['id']:
+        # 책이 바뀌거나 페이지 텍스트가 수정되면 vocabulary 데이터 리셋
+        import vocabulary_store
+        vocabulary_key = vocabulary_store.cache_key(story)
+        if st.session_state.last_vocabulary_key != vocabulary_key:
             st.session_state.vocabulary_data = None
             st.session_state.vocabulary_cards = []
             st.session_state.current_card_index = 0
             st.session_state.show_answer = False
-            st.session_state.last_vocabulary_story_id = story['id']
+            st.session_state.last_vocabulary_key = vocabulary_key
 
-        # 핵심 단어 추출
+        # 핵심 단어 추출 (저장된 분석 결과가 있으면 바로 사용)
         if st.session_state.vocabulary_data is None:
-            with st.spinner("핵심 단어를 분석하고 있습니다..."):
-                from gemini_helper import extract_key_vocabulary, generate_vocabulary_cards
-                st.session_state.vocabulary_data = extract_key_vocabulary(story)
+            from gemini_helper import generate_vocabulary_cards
+            cached_vocabulary = vocabulary_store.get_cached(story)
 
-                if st.session_state.vocabulary_data and st.session_state.vocabulary_data.get('vocabulary'):
-                    st.session_state.vocabulary_cards = generate_vocabulary_cards(
-                        st.session_state.vocabulary_data['vocabulary']
-                    )
-                    st.success(f"✅ {len(st.session_state.vocabulary_data['vocabulary'])}개의 핵심 단어를 추출했습니다!")
+            if cached_vocabulary:
+                st.session_state.vocabulary_data = cached_vocabulary
+            else:
+                with st.spinner("핵심 단어를 분석하고 있습니다..."):
+                    st.session_state.vocabulary_data = vocabulary_store.analyze(story)
+
+                if st.session_state.vocabulary_data.get('vocabulary'):
+                    if st.session_state.vocabulary_data['source'] == 'gemini':
+                        st.success(f"✅ {len(st.session_state.vocabulary_data['vocabulary'])}개의 핵심 단어를 추출했습니다!")
+                    else:
+                        st.info("💡 Gemini API 할당량 문제일 수 있습니다. 간단한 단어 추출 방식을 사용했습니다.")
+                        st.success(f"✅ {len(st.session_state.vocabulary_data['vocabulary'])}개의 단어를 추출했습니다!")
                 else:
                     st.error("❌ 단어 추출에 실패했습니다.")
-                    st.info("💡 Gemini API 할당량 문제일 수 있습니다. 간단한 단어 추출 방식을 사용합니다.")
 
-                    # 대체 방법: 간단한 단어 추출
-                    from gemini_helper import extract_vocabulary_simple
-                    st.session_state.vocabulary_data = extract_vocabulary_simple(story)
-
-                    if st.session_state.vocabulary_data and st.session_state.vocabulary_data.get('vocabulary'):
-                        st.session_state.vocabulary_cards = generate_vocabulary_cards(
-                            st.session_state.vocabulary_data['vocabulary']
-                        )
-                        st.success(f"✅ {len(st.session_state.vocabulary_data['vocabulary'])}개의 단어를 추출했습니다!")
+            if st.session_state.vocabulary_data.get('cards'):
+                # 백그라운드 준비 작업에서 미리 만든 카드 사용
+                st.session_state.vocabulary_cards = st.session_state.vocabulary_data['cards']
+            elif st.session_state.vocabulary_data.get('vocabulary'):
+                st.session_state.vocabulary_cards = generate_vocabulary_cards(
+                    st.session_state.vocabulary_data['vocabulary']
+                )
 
         # 핵심 단어와 문법 설명 표시
         if st.session_state.vocabulary_data and st.session_state.vocabulary_data['explanation']:
@@ -1566,3 +1599,46 @@ else:
                     st.markdown(f"**{i+1}. {vocab['en']}** - {vocab['ko']}")
         else:
             st.info("눌러서 핵심 단어를 분석해주세요.", icon="💡")
+            if st.button("🔍 핵심 단어 다시 분석하기", use_container_width=True):
+                st.session_state.vocabulary_data = None
+                st.rerun()
+
+        # 도전 퀴즈 (미리 만들어 둔 퀴즈 풀에서 바로 출제)
+        st.markdown("---")
+        st.markdown("### 🎲 도전 퀴즈")
+        if st.session_state.quiz_total > 0:
+            st.caption(f"점수: {st.session_state.quiz_score} / {st.session_state.quiz_total}")
+
+        if st.button("🎲 새 문제 만들기", use_container_width=True, key="new_pool_quiz"):
+            import quiz_pool
+            with st.spinner("문제를 준비하고 있습니다..."):
+                st.session_state.quiz_question = quiz_pool.next_question(story)
+            st.session_state.quiz_answered = None
+            if st.session_state.quiz_question is None:
+                st.warning("문제를 만들 수 없습니다. 동화책에 단어가 충분한지 확인해주세요.")
+
+        quiz = st.session_state.quiz_question
+        if quiz:
+            st.markdown(f'<div class="english-text">{quiz["question"]}</div>', unsafe_allow_html=True)
+
+            if st.button("🔊 단어 듣기", key="pool_quiz_speech"):
+                audio_fp = text_to_speech(quiz["question"], lang='en')
+                if audio_fp:
+                    play_audio(audio_fp)
+
+            answered = st.session_state.get('quiz_answered')
+            for i, option in enumerate(quiz['options']):
+                if st.button(f"{chr(65+i)}. {option['ko']}", key=f"pool_quiz_option_{i}",
+                             use_container_width=True, disabled=answered is not None):
+                    is_correct = (option['ko'] == quiz['correct'])
+                    update_quiz_stats(is_correct)
+                    st.session_state.quiz_total += 1
+                    if is_correct:
+                        st.session_state.quiz_score += 1
+                    st.session_state.quiz_answered = is_correct
+                    st.rerun()
+
+            if answered is True:
+                st.markdown('<div class="success-message">🎉 정답입니다!</div>', unsafe_allow_html=True)
+            elif answered is False:
+                st.markdown(f'<div class="try-again-message">💡 정답은 "{quiz["correct"]}" 이에요!</div>', unsafe_allow_html=True)
@@ -0,0 +1,219 @@
+"""
+동화책 음성 굽기(bake) 모듈
+저장된 동화책의 모든 페이지를 모든 재생 속도로 미리 만들어 tts_cache에 넣고,
+기본 속도 음성을 텍스트와 맞춰 단어별 시작/끝 시각을 페이지에 함께 저장합니다.
+구워 둔 동화책은 네트워크 없이 바로 재생되고, 단어 시각으로 따라 읽기 표시를 할 수 있습니다.
+
+단어 시각 추정: 음성의 크기(에너지)로 말하는 구간과 쉬는 구간을 찾고,
+단어의 음절 수 비율로 나눈 경계를 가까운 쉬는 구간에 맞춥니다.
+"""
+
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import story_store
+
+AUDIO_BAKE_WORKERS = int(os.getenv('AUDIO_BAKE_WORKERS', '3'))
+AUDIO_BAKE_SPEEDS = [float(s) for s in os.getenv('AUDIO_BAKE_SPEEDS', '1.0,0.7,0.5').split(',') if s.strip()]
+
+FRAME_MS = 10           # 에너지 계산 구간
+MIN_PAUSE_MS = 40       # 이보다 긴 조용한 구간을 단어 사이 쉼으로 봄
+SNAP_MS = 200           # 경계를 쉬는 구간에 맞출 최대 거리
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9']+")
+
+
+def _text_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()[:16]
+
+
+def _syllables(word):
+    """영어 단어의 음절 수를 대략 셉니다. (모음 묶음 수)"""
+    groups = re.findall(r'[aeiouy]+', word.lower())
+    count = len(groups)
+    if word.lower().endswith('e') and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def _decode(mp3_bytes):
+    """MP3를 모노 float 샘플로 디코딩합니다."""
+    import numpy as np
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(BytesIO(mp3_bytes), format='mp3').set_channels(1)
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    return samples, audio.frame_rate
+
+
+def align_words(samples, sample_rate, text):
+    """
+    음성과 텍스트를 맞춰 단어별 시작/끝 시각을 추정합니다.
+
+    Args:
+        samples (array-like): 모노 오디오 샘플
+        sample_rate (int): 샘플링 레이트
+        text (str): 읽은 텍스트
+
+    Returns:
+        list of dict: [{'word': str, 'start': 초, 'end': 초}]
+    """
+    import numpy as np
+
+    words = _WORD_PATTERN.findall(text or '')
+    samples = np.asarray(samples, dtype=np.float32)
+    frame = max(1, int(sample_rate * FRAME_MS / 1000))
+    frame_count = len(samples) // frame
+    if not words or frame_count == 0:
+        return []
+
+    # 구간별 크기(RMS)와 말하는 구간 판정
+    energy = np.sqrt(np.mean(samples[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+    threshold = max(np.percentile(energy, 10) * 3, energy.max() * 0.05)
+    voiced = energy > threshold
+    voiced_frames = np.flatnonzero(voiced)
+    if len(voiced_frames) == 0:
+        return []
+    speech_start, speech_end = int(voiced_frames[0]), int(voiced_frames[-1]) + 1
+
+    # 말하는 구간 안의 쉬는 구간 (시작, 끝 프레임)
+    pauses = []
+    min_pause = max(1, MIN_PAUSE_MS // FRAME_MS)
+    silent = ~voiced[speech_start:speech_end]
+    edges = np.diff(np.concatenate([[0], silent.astype(np.int8), [0]]))
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        if end - start >= min_pause:
+            pauses.append((speech_start + int(start), speech_start + int(end)))
+
+    # 음절 수 비율로 나눈 경계를 가까운 쉬는 구간에 맞춤
+    weights = np.array([_syllables(word) for word in words], dtype=np.float64)
+    nominal = speech_start + np.cumsum(weights)[:-1] / weights.sum() * (speech_end - speech_start)
+    snap = SNAP_MS // FRAME_MS
+    starts = [speech_start]
+    ends = []
+    used = set()
+    for boundary in nominal:
+        best = None
+        for i, (pause_start, pause_end) in enumerate(pauses):
+            center = (pause_start + pause_end) / 2
+            if i in used or abs(center - boundary) > snap or pause_start < starts[-1]:
+                continue
+            if best is None or abs(center - boundary) < abs(sum(pauses[best]) / 2 - boundary):
+                best = i
+        if best is not None:
+            used.add(best)
+            ends.append(pauses[best][0])
+            starts.append(pauses[best][1])
+        else:
+            position = max(int(round(boundary)), starts[-1] + 1)
+            ends.append(position)
+            starts.append(position)
+    ends.append(speech_end)
+
+    seconds_per_frame = frame / sample_rate
+    return [
+        {'word': word, 'start': round(start * seconds_per_frame, 3), 'end': round(max(end, start) * seconds_per_frame, 3)}
+        for word, start, end in zip(words, starts, ends)
+    ]
+
+
+def word_timings(page, speed=1.0):
+    """
+    페이지에 저장된 단어 시각을 재생 속도에 맞춰 반환합니다.
+    (속도 변형은 기본 음성을 고르게 늘인 것이므로 시각을 1/speed배 합니다)
+
+    Returns:
+        list of dict: [{'word', 'start', 'end'}] 또는 빈 목록 (없거나 본문이 바뀐 경우)
+    """
+    stored = page.get('word_timings')
+    if not stored or stored.get('text_hash') != _text_hash(page.get('en', '')):
+        return []
+    return [
+        {'word': item['word'], 'start': round(item['start'] / speed, 3), 'end': round(item['end'] / speed, 3)}
+        for item in stored.get('words', [])
+    ]
+
+
+def _bake_page(text, speeds):
+    """페이지 하나의 모든 속도 음성을 만들고 단어 시각을 계산합니다."""
+    import tts_engines
+    import tts_helper
+
+    # 브라우저로 보낼 형식까지 미리 변환해 둠
+    for speed in speeds:
+        tts_helper.get_audio(text, 'en', speed)
+    base, engine = tts_helper._get_speech(text, 'en', 1.0)
+    if engine != tts_engines.TTS_ENGINE:
+        # 대체 엔진 음성은 저장되지 않으므로 그 시각도 저장하지 않음 (다음 굽기에서 다시 계산)
+        return None
+
+    try:
+        samples, sample_rate = _decode(base)
+    except ImportError:
+        # numpy/pydub가 없으면 음성만 굽고 단어 시각은 건너뜀
+        return None
+    return {
+        'text_hash': _text_hash(text),
+        'duration': round(len(samples) / sample_rate, 3),
+        'words': align_words(samples, sample_rate, text),
+    }
+
+
+def bake(story_id, json_file=story_store.STORIES_FILE, speeds=None, max_workers=AUDIO_BAKE_WORKERS, progress=None):
+    """
+    동화책의 모든 페이지 음성을 굽고 단어 시각을 저장합니다.
+
+    Args:
+        story_id (str): 동화책 ID
+        speeds (list of float): 구울 재생 속도 (기본 AUDIO_BAKE_SPEEDS)
+        max_workers (int): 동시에 처리할 페이지 수
+        progress (callable): progress(끝난 페이지 수, 전체 페이지 수) 호출
+
+    Returns:
+        int: 단어 시각을 저장한 페이지 수
+    """
+    story = story_store.get_story(story_id, json_file)
+    if story is None:
+        raise ValueError("동화책을 찾을 수 없습니다.")
+
+    speeds = speeds or AUDIO_BAKE_SPEEDS
+    targets = [(index, page['en']) for index, page in enumerate(story.get('pages', []))
+               if page.get('en', '').strip() and not word_timings(page)]
+    if not targets:
+        return 0
+
+    timings = {}
+    done = 0
+
+    def _run(target):
+        index, text = target
+        try:
+            return index, text, _bake_page(text, speeds)
+        except Exception as e:
+            print(f"음성 굽기 오류 (페이지 {index + 1}): {str(e)}")
+            return index, text, None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='audio-bake') as executor:
+        for index, text, result in executor.map(_run, targets):
+            done += 1
+            if result is not None:
+                timings[index] = (text, result)
+            if progress:
+                progress(done, len(targets))
+
+    def _apply(saved_story):
+        pages = saved_story.get('pages', [])
+        changed = False
+        for index, (text, result) in timings.items():
+            # 굽는 동안 본문이 바뀐 페이지는 저장하지 않음
+            if index < len(pages) and pages[index].get('en') == text:
+                pages[index]['word_timings'] = result
+                changed = True
+        return changed
+
+    if timings:
+        story_store.update_story(story_id, _apply, json_file)
+    return len(timings)
@@ -0,0 +1,81 @@
+"""
+오디오 전송 형식 모듈
+브라우저로 보내는 음성을 작은 형식으로 한 번만 변환합니다.
+기본은 말소리에 맞춘 낮은 비트레이트의 모노 Opus(OGG)로, gTTS MP3(32kbps)나
+속도 조절 후 pydub 기본 비트레이트로 다시 만든 MP3보다 훨씬 작습니다.
+변환 결과는 tts_cache에 따로 저장되어 재생할 때마다 다시 변환하지 않습니다.
+
+설정 (.env):
+    TTS_OUTPUT_FORMAT=opus      # opus(OGG) 또는 mp3(변환 없이 그대로 전송)
+    TTS_OUTPUT_BITRATE=24k      # Opus 비트레이트
+    TTS_OUTPUT_CHANNELS=1       # 1 = 모노
+"""
+
+import os
+from io import BytesIO
+
+TTS_OUTPUT_FORMAT = os.getenv('TTS_OUTPUT_FORMAT', 'opus').lower()
+TTS_OUTPUT_BITRATE = os.getenv('TTS_OUTPUT_BITRATE', '24k')
+TTS_OUTPUT_CHANNELS = int(os.getenv('TTS_OUTPUT_CHANNELS', '1'))
+
+# 형식 이름 -> 파일 확장자, MIME 형식, pydub export 인자
+FORMATS = {
+    'mp3': {
+        'extension': 'mp3',
+        'mime': 'audio/mpeg',
+        'export': {'format': 'mp3'},
+    },
+    'opus': {
+        'extension': 'ogg',
+        'mime': 'audio/ogg',
+        # voip: 말소리에 맞춘 Opus 인코더 설정
+        'export': {'format': 'ogg', 'codec': 'libopus', 'parameters': ['-application', 'voip']},
+    },
+}
+
+
+def is_passthrough(output_format=TTS_OUTPUT_FORMAT):
+    """변환 없이 MP3를 그대로 보내는 설정인지 확인합니다."""
+    return output_format not in FORMATS or output_format == 'mp3'
+
+
+def variant(output_format=TTS_OUTPUT_FORMAT, bitrate=TTS_OUTPUT_BITRATE, channels=TTS_OUTPUT_CHANNELS):
+    """캐시 키에 넣을 변환 설정 문자열을 만듭니다. (설정이 바뀌면 다시 변환)"""
+    return f"{output_format}-{bitrate}-{channels}ch"
+
+
+def extension(output_format=TTS_OUTPUT_FORMAT):
+    """캐시 파일 확장자를 반환합니다."""
+    return FORMATS.get(output_format, FORMATS['mp3'])['extension']
+
+
+def mime_type(data):
+    """
+    오디오 데이터의 MIME 형식을 앞부분으로 판별합니다.
+
+    Returns:
+        str: 'audio/ogg' 또는 'audio/mpeg'
+    """
+    return 'audio/ogg' if data[:4] == b'OggS' else 'audio/mpeg'
+
+
+def transcode(mp3_bytes, output_format=TTS_OUTPUT_FORMAT, bitrate=TTS_OUTPUT_BITRATE, channels=TTS_OUTPUT_CHANNELS):
+    """
+    MP3 음성을 전송 형식으로 변환합니다.
+
+    Args:
+        mp3_bytes (bytes): MP3 데이터
+        output_format (str): 'opus' 또는 'mp3'
+        bitrate (str): 비트레이트 (예: '24k')
+        channels (int): 채널 수
+
+    Returns:
+        bytes: 변환된 오디오 데이터
+    """
+    from pydub import AudioSegment
+
+    settings = FORMATS[output_format]
+    audio = AudioSegment.from_file(BytesIO(mp3_bytes), format='mp3').set_channels(channels)
+    output = BytesIO()
+    audio.export(output, bitrate=bitrate, **settings['export'])
+    return output.getvalue()
@@ -0,0 +1,137 @@
+"""
+앱 시작 시 import 시간 벤치마크
+app.py가 시작할 때 가져오는 모듈을 `python -X importtime`으로 측정하고,
+무거운 모듈이 시작 시점에 다시 불러와지거나 시간이 기준을 넘으면 실패(종료 코드 1)합니다.
+
+사용법:
+    python bench_import_time.py                    # 기본 기준 (150ms)
+    python bench_import_time.py --threshold-ms 100 --runs 7
+    python bench_import_time.py --include-streamlit
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# 기능을 처음 쓸 때만 불러와야 하는 무거운 모듈
+HEAVY_MODULES = [
+    'google.generativeai',
+    'gtts',
+    'speech_recognition',
+    'fitz',
+    'PIL',
+    'bs4',
+    'deep_translator',
+    'requests',
+    'pydub',
+]
+
+
+def startup_imports(include_streamlit=False):
+    """app.py 최상위에서 가져오는 모듈 이름 목록을 반환합니다."""
+    with open(APP_FILE, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=APP_FILE)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+
+    if not include_streamlit:
+        modules = [m for m in modules if m.split('.')[0] != 'streamlit']
+    return list(dict.fromkeys(modules))
+
+
+def measure(modules):
+    """
+    새 인터프리터에서 모듈을 가져오며 -X importtime 결과를 수집합니다.
+
+    Returns:
+        tuple: (최상위 모듈별 누적 시간(us) dict, 불러와진 전체 모듈 이름 set)
+    """
+    code = '; '.join(f"import {m}" for m in modules) or 'pass'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(APP_FILE),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import 실패:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        # 형식: "import time:  self [us] | cumulative | 모듈 이름(들여쓰기 = 깊이)"
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        package = name.strip()
+        loaded.add(package)
+        # 들여쓰기가 한 칸인 줄이 최상위 import
+        if len(name) - len(name.lstrip()) == 1:
+            cumulative[package] = int(cumulative_us.strip())
+    return cumulative, loaded
+
+
+def run_benchmark(runs, include_streamlit):
+    """여러 번 측정해 모듈별 중앙값(ms)과 시작 시 불러온 무거운 모듈을 반환합니다."""
+    modules = startup_imports(include_streamlit)
+    samples = {}
+    heavy_loaded = set()
+
+    for _ in range(runs):
+        cumulative, loaded = measure(modules)
+        # 인터프리터 시작 시 불러오는 모듈(site, encodings 등)은 제외
+        for name in modules:
+            if name in cumulative:
+                samples.setdefault(name, []).append(cumulative[name] / 1000.0)
+        for heavy in HEAVY_MODULES:
+            if heavy in loaded:
+                heavy_loaded.add(heavy)
+
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    return modules, medians, sorted(heavy_loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py 시작 import 시간 벤치마크")
+    parser.add_argument('--threshold-ms', type=float, default=float(os.getenv('IMPORT_TIME_THRESHOLD_MS', '150')),
+                        help="시작 import 전체 시간 기준 (ms)")
+    parser.add_argument('--runs', type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument('--include-streamlit', action='store_true', help="streamlit 자체 import 시간도 포함")
+    args = parser.parse_args()
+
+    modules, medians, heavy_loaded = run_benchmark(args.runs, args.include_streamlit)
+
+    print(f"측정 대상 ({len(modules)}개): {', '.join(modules)}")
+    print(f"\n{'모듈':<30} {'누적 ms (중앙값)':>18}")
+    print('-' * 50)
+    for name, ms in sorted(medians.items(), key=lambda item: -item[1])[:15]:
+        print(f"{name:<30} {ms:>18.1f}")
+
+    total_ms = sum(medians.values())
+    print('-' * 50)
+    print(f"{'합계':<30} {total_ms:>18.1f}  (기준 {args.threshold_ms:.0f}ms)")
+
+    failed = False
+    if heavy_loaded:
+        print(f"\n❌ 시작 시점에 무거운 모듈이 불러와졌습니다: {', '.join(heavy_loaded)}")
+        failed = True
+    if total_ms > args.threshold_ms:
+        print(f"\n❌ 시작 import 시간이 기준을 넘었습니다: {total_ms:.1f}ms > {args.threshold_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("\n✅ 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
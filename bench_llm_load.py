@@ -0,0 +1,153 @@
+"""
+LLM 경로 부하 벤치마크
+가짜 LLM 백엔드(llm_backends.FakeBackend)로 gemini_helper 함수를 동시에 여러 번 호출해
+지연 시간 분포와 대체(fallback) 경로로 빠진 비율을 측정합니다. API 할당량을 쓰지 않습니다.
+
+사용법:
+    python bench_llm_load.py                                  # 모든 작업, 기본 조건
+    python bench_llm_load.py --operation translate --requests 200 --concurrency 16
+    python bench_llm_load.py --latency-ms 800 --error-rate 0.1 --quota 50
+    python bench_llm_load.py --hang-rate 0.2 --hang-ms 30000   # 시간 제한 확인
+
+참고: 번역 대체 경로(deep_translator)는 실제 네트워크를 사용합니다.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 벤치마크 결과가 번역 기록 DB에 섞이지 않도록 기본으로 끔
+os.environ.setdefault('TRANSLATION_METRICS_ENABLED', '0')
+
+import llm_backends  # noqa: E402
+import gemini_helper  # noqa: E402
+import pronunciation_scorer  # noqa: E402
+
+SAMPLE_STORY = {
+    'id': 'bench-story',
+    'title': 'The Little Cat',
+    'pages': [
+        {'en': "Once upon a time, there lived a little cat."},
+        {'en': "Every morning the cat sat by the window and looked at the sun."},
+        {'en': "\"Hello, friend!\" said the dog."},
+        {'en': "Together they went on an adventure into the forest."},
+        {'en': "When night came, the stars were shining in the sky."},
+    ],
+}
+
+OPERATIONS = ['translate', 'quiz', 'quiz_batch', 'vocabulary', 'pronunciation']
+
+
+def _run_operation(operation, index, story):
+    """작업 하나를 호출하고 LLM 응답을 사용했는지(대체 경로가 아닌지) 반환합니다."""
+    pages = story['pages']
+    if operation == 'translate':
+        text = pages[index % len(pages)]['en']
+        return gemini_helper.translate_to_korean(text) != text
+    if operation == 'quiz':
+        return gemini_helper.generate_vocabulary_quiz(story) is not None
+    if operation == 'quiz_batch':
+        return bool(gemini_helper.generate_vocabulary_quiz_batch(story, 8))
+    if operation == 'vocabulary':
+        return bool(gemini_helper.extract_key_vocabulary(story).get('vocabulary'))
+    if operation == 'pronunciation':
+        text = pages[index % len(pages)]['en']
+        feedback = gemini_helper.evaluate_pronunciation(text, text, use_llm=True)['feedback']
+        templates = [t for group in pronunciation_scorer.FEEDBACK_TEMPLATES.values() for t in group]
+        return not feedback.startswith(tuple(templates))
+    raise ValueError(f"알 수 없는 작업: {operation}")
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+def run_load(operation, backend, story, requests_count, concurrency):
+    """
+    작업 하나를 동시에 requests_count번 호출합니다.
+
+    Returns:
+        dict: {'operation', 'requests', 'ok', 'backend_calls', 'backend_errors',
+               'p50_ms', 'p95_ms', 'max_ms', 'throughput'}
+    """
+    calls_before, errors_before = backend.calls, backend.errors
+
+    def _timed(index):
+        started = time.perf_counter()
+        try:
+            ok = _run_operation(operation, index, story)
+        except Exception as e:
+            print(f"{operation} 호출 오류: {str(e)}")
+            ok = False
+        return (time.perf_counter() - started) * 1000, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_timed, range(requests_count)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'operation': operation,
+        'requests': requests_count,
+        'ok': sum(1 for _, ok in results if ok),
+        'backend_calls': backend.calls - calls_before,
+        'backend_errors': backend.errors - errors_before,
+        'p50_ms': _percentile(latencies, 50),
+        'p95_ms': _percentile(latencies, 95),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'throughput': requests_count / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 LLM 백엔드로 gemini_helper 부하 측정")
+    parser.add_argument('--operation', choices=OPERATIONS + ['all'], default='all')
+    parser.add_argument('--requests', type=int, default=50, help="작업별 호출 횟수")
+    parser.add_argument('--concurrency', type=int, default=8, help="동시에 호출할 수")
+    parser.add_argument('--latency-ms', type=float, default=llm_backends.FAKE_LLM_LATENCY_MS)
+    parser.add_argument('--jitter-ms', type=float, default=llm_backends.FAKE_LLM_JITTER_MS)
+    parser.add_argument('--error-rate', type=float, default=llm_backends.FAKE_LLM_ERROR_RATE)
+    parser.add_argument('--quota', type=int, default=llm_backends.FAKE_LLM_QUOTA,
+                        help="이 횟수 이후 할당량 초과 (0이면 무제한)")
+    parser.add_argument('--hang-rate', type=float, default=llm_backends.FAKE_LLM_HANG_RATE,
+                        help="요청 시간 제한도 무시하고 멈추는 호출 비율 (감시 시간 확인용)")
+    parser.add_argument('--hang-ms', type=float, default=llm_backends.FAKE_LLM_HANG_MS)
+    parser.add_argument('--fixtures', default=llm_backends.FAKE_LLM_FIXTURES)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    backend = llm_backends.FakeBackend(
+        fixtures_file=args.fixtures,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        quota=args.quota,
+        hang_rate=args.hang_rate,
+        hang_ms=args.hang_ms,
+        seed=args.seed,
+    )
+    llm_backends.set_backend(backend)
+
+    operations = OPERATIONS if args.operation == 'all' else [args.operation]
+    print(f"가짜 백엔드: 지연 {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+          f"오류율 {args.error_rate:.0%}, 멈춤 {args.hang_rate:.0%}, 할당량 {args.quota or '무제한'}")
+    print(f"작업별 {args.requests}회, 동시 {args.concurrency}개\n")
+    print(f"{'작업':<15} {'성공':>6} {'LLM 호출':>9} {'LLM 오류':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'회/초':>8}")
+    print('-' * 80)
+    for operation in operations:
+        result = run_load(operation, backend, SAMPLE_STORY, args.requests, args.concurrency)
+        print(f"{result['operation']:<15} {result['ok']:>6} {result['backend_calls']:>9} "
+              f"{result['backend_errors']:>9} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+              f"{result['max_ms']:>9.1f} {result['throughput']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
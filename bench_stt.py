@@ -0,0 +1,138 @@
+"""
+음성 인식(STT) 엔진 벤치마크
+녹음 목록(fixtures/stt/manifest.json)의 아이들 녹음을 엔진마다 인식시켜
+p50/p95 지연 시간과 단어 오류율(WER)을 비교합니다.
+모델을 불러오는 시간은 첫 녹음 전에 따로 재고 지연 시간에서 뺍니다.
+
+녹음 목록 형식:
+    {"utterances": [{"file": "fox_01.wav", "text": "The little fox ran to the river."}, ...]}
+    (file은 목록 파일이 있는 폴더 기준 경로, 16비트 모노 WAV)
+
+사용법:
+    python bench_stt.py
+    python bench_stt.py --engine vosk --engine whisper
+    python bench_stt.py --manifest my_recordings/manifest.json --max-wer 0.3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+
+import pronunciation_scorer
+import stt_engines
+
+DEFAULT_MANIFEST = os.path.join('fixtures', 'stt', 'manifest.json')
+
+
+def load_utterances(manifest_file):
+    """녹음 목록을 읽어 [(PCM bytes, 샘플링 레이트, 샘플 크기, 정답 문장)]을 반환합니다."""
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(manifest_file)
+    utterances = []
+    for item in manifest.get('utterances', []):
+        with wave.open(os.path.join(base_dir, item['file']), 'rb') as wav:
+            if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                print(f"건너뜀 (16비트 모노 WAV가 아님): {item['file']}")
+                continue
+            utterances.append((wav.readframes(wav.getnframes()), wav.getframerate(), wav.getsampwidth(), item['text']))
+    return utterances
+
+
+def word_errors(reference, hypothesis):
+    """
+    단어 단위 편집 거리(대치+삭제+삽입)를 계산합니다.
+
+    Returns:
+        tuple: (오류 수, 정답 단어 수)
+    """
+    ref = pronunciation_scorer.tokenize(reference)
+    hyp = pronunciation_scorer.tokenize(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def run_engine(engine, utterances):
+    """엔진으로 모든 녹음을 인식해 결과를 반환합니다."""
+    # 모델 불러오기(처음 한 번)를 첫 녹음 지연 시간에서 분리
+    pcm, sample_rate, sample_width, _text = utterances[0]
+    started = time.perf_counter()
+    try:
+        engine.recognize(pcm, sample_rate, sample_width)
+    except Exception:
+        pass
+    warmup = time.perf_counter() - started
+
+    timings = []
+    errors = 0
+    words = 0
+    failures = 0
+    for pcm, sample_rate, sample_width, text in utterances:
+        started = time.perf_counter()
+        try:
+            heard = engine.recognize(pcm, sample_rate, sample_width)
+        except Exception:
+            heard = ''
+            failures += 1
+        timings.append(time.perf_counter() - started)
+        utterance_errors, utterance_words = word_errors(text, heard)
+        errors += utterance_errors
+        words += utterance_words
+
+    timings.sort()
+    return {
+        'warmup_ms': warmup * 1000,
+        'p50_ms': statistics.median(timings) * 1000,
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        'wer': errors / words if words else 0.0,
+        'failures': failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음성 인식 엔진 지연 시간/WER 벤치마크")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="녹음 목록 파일")
+    parser.add_argument('--engine', action='append', choices=sorted(stt_engines.ENGINES),
+                        help="측정할 엔진 (여러 번 지정 가능, 기본: 사용 가능한 모든 엔진)")
+    parser.add_argument('--max-wer', type=float, default=None, help="WER 상한 (넘으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.manifest)
+    if not utterances:
+        print(f"❌ 녹음이 없습니다. {args.manifest}에 녹음 파일과 정답 문장을 추가하세요.")
+        return 1
+    print(f"녹음 {len(utterances)}개 ({args.manifest})\n")
+    print(f"{'엔진':>8} {'준비 ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'WER':>8} {'실패':>6}")
+    print('-' * 58)
+
+    failed = False
+    for name in args.engine or list(stt_engines.ENGINES):
+        engine = stt_engines.get_engine(name)
+        if not engine.is_available():
+            print(f"{name:>8}   (사용할 수 없음)")
+            continue
+        result = run_engine(engine, utterances)
+        print(f"{name:>8} {result['warmup_ms']:>10.0f} {result['p50_ms']:>10.0f} {result['p95_ms']:>10.0f} "
+              f"{result['wer']:>8.1%} {result['failures']:>6}")
+        if args.max_wer is not None and result['wer'] > args.max_wer:
+            failed = True
+
+    if failed:
+        print(f"\n❌ WER이 기준({args.max_wer:.0%})을 넘었습니다.")
+    else:
+        print("\n✅ 완료")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+재생 속도 조절(WSOLA) 벤치마크
+말소리와 비슷한 합성 신호(배음 + 음절 리듬)로 속도별 처리 시간을 재고,
+처리 시간이 오디오 길이의 몇 배인지(실시간 배율)와 음높이가 유지되는지 확인합니다.
+frame_rate를 바꾸는 이전 방식의 음높이도 함께 보여줍니다.
+
+사용법:
+    python bench_time_stretch.py
+    python bench_time_stretch.py --seconds 20 --sample-rate 24000 --runs 5
+    python bench_time_stretch.py --max-realtime-factor 0.1   # 넘으면 실패(종료 코드 1)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import time_stretch
+
+SPEEDS = [0.5, 0.7, 1.25]
+FUNDAMENTAL_HZ = 220.0
+
+
+def make_signal(seconds, sample_rate):
+    """기본음 220Hz와 배음, 초당 4음절 정도의 크기 변화를 가진 신호를 만듭니다."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    voice = sum(np.sin(2 * np.pi * FUNDAMENTAL_HZ * n * t) / n for n in range(1, 5))
+    syllables = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 2 * t))
+    return (voice * syllables * 8000).astype(np.float32)
+
+
+def dominant_hz(samples, sample_rate):
+    """가장 강한 주파수를 구합니다."""
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return float(np.argmax(spectrum)) * sample_rate / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WSOLA 재생 속도 조절 벤치마크")
+    parser.add_argument('--seconds', type=float, default=10.0, help="테스트 신호 길이 (초)")
+    parser.add_argument('--sample-rate', type=int, default=24000, help="gTTS 출력과 같은 24kHz가 기본")
+    parser.add_argument('--runs', type=int, default=3, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument('--max-realtime-factor', type=float, default=0.25,
+                        help="처리 시간 / 출력 오디오 길이 상한")
+    args = parser.parse_args()
+
+    signal = make_signal(args.seconds, args.sample_rate)
+    print(f"테스트 신호: {args.seconds:.0f}초, {args.sample_rate}Hz, 기본음 {FUNDAMENTAL_HZ:.0f}Hz\n")
+    print(f"{'속도':>6} {'처리 ms':>10} {'실시간 배율':>12} {'길이 비율':>10} {'WSOLA Hz':>10} {'frame_rate 방식 Hz':>18}")
+    print('-' * 72)
+
+    failed = False
+    for speed in SPEEDS:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            stretched = time_stretch.wsola(signal, speed, args.sample_rate)
+            timings.append(time.perf_counter() - started)
+        elapsed = statistics.median(timings)
+        output_seconds = len(stretched) / args.sample_rate
+        realtime_factor = elapsed / output_seconds
+        # 이전 방식: 같은 샘플을 다른 frame_rate로 재생하면 음높이가 speed배가 됨
+        resampled_hz = dominant_hz(signal, args.sample_rate) * speed
+
+        print(f"{speed:>6.2f} {elapsed * 1000:>10.1f} {realtime_factor:>12.4f} "
+              f"{len(stretched) / len(signal):>10.3f} {dominant_hz(stretched, args.sample_rate):>10.1f} "
+              f"{resampled_hz:>18.1f}")
+        if realtime_factor > args.max_realtime_factor:
+            failed = True
+
+    if failed:
+        print(f"\n❌ 실시간 배율이 기준({args.max_realtime_factor})을 넘었습니다.")
+    else:
+        print(f"\n✅ 통과 (기준 실시간 배율 {args.max_realtime_factor})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+TTS 엔진 지연 시간 벤치마크
+사용할 수 있는 엔진마다 동화책 한 페이지 분량의 문장을 여러 번 읽혀
+p50/p95/최대 지연 시간을 잽니다. (캐시를 거치지 않고 엔진을 직접 호출)
+
+사용법:
+    python bench_tts_engines.py
+    python bench_tts_engines.py --engine espeak --runs 20
+    python bench_tts_engines.py --engine espeak --max-p95-ms 200   # 넘으면 실패(종료 코드 1)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import tts_engines
+
+SAMPLE_TEXTS = [
+    "Once upon a time, a little fox lived in the green forest.",
+    "Every morning she ran to the river to say hello to her friend the duck.",
+    "One day the duck was not there, so the fox went to look for him.",
+]
+
+
+def measure(engine, runs):
+    """엔진으로 문장을 runs번 읽혀 지연 시간(ms) 목록을 반환합니다."""
+    timings = []
+    for i in range(runs):
+        text = SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]
+        started = time.perf_counter()
+        engine.synthesize(text, 'en')
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS 엔진 지연 시간 벤치마크")
+    parser.add_argument('--engine', choices=sorted(tts_engines.ENGINES), help="한 엔진만 측정 (기본: 사용 가능한 모든 엔진)")
+    parser.add_argument('--runs', type=int, default=10, help="엔진마다 읽힐 횟수")
+    parser.add_argument('--max-p95-ms', type=float, default=None, help="p95 지연 시간 상한")
+    args = parser.parse_args()
+
+    names = [args.engine] if args.engine else list(tts_engines.ENGINES)
+    print(f"{'엔진':>8} {'p50 ms':>10} {'p95 ms':>10} {'최대 ms':>10}")
+    print('-' * 42)
+
+    failed = False
+    for name in names:
+        engine = tts_engines.get_engine(name)
+        if not engine.is_available():
+            print(f"{name:>8}   (사용할 수 없음)")
+            failed = failed or bool(args.engine)
+            continue
+        try:
+            timings = sorted(measure(engine, args.runs))
+        except Exception as e:
+            print(f"{name:>8}   오류: {type(e).__name__}: {e}")
+            failed = True
+            continue
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:>8} {statistics.median(timings):>10.1f} {p95:>10.1f} {timings[-1]:>10.1f}")
+        if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+            failed = True
+
+    if failed:
+        print("\n❌ 실패")
+    else:
+        print("\n✅ 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
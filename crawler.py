@@ -6,9 +6,10 @@ StoryWeaver(storyweaver.org.in) API를 사용하여 동화책 데이터를 가
 import requests
 import json
 import uuid
-from deep_translator import GoogleTranslator
 import time
 import re
+import story_store
+from http_client import get_session, get_translator
 
 
 class StoryWeaverCrawler:
@@ -16,7 +17,8 @@ class StoryWeaverCrawler:
 
     def __init__(self, json_file='stories.json'):
         self.json_file = json_file
-        self.translator = GoogleTranslator(source='en', target='ko')
+        self.translator = get_translator()
+        self.session = get_session()
         self.api_base = 'https://storyweaver.org.in/api/v1'
 
     def extract_story_id(self, url):
@@ -30,12 +32,13 @@ class StoryWeaverCrawler:
             return match.group(1)
         return None
 
-    def crawl_story(self, url):
+    def crawl_story(self, url, lazy_translation=False):
         """
         StoryWeaver URL에서 동화책 데이터를 크롤링합니다.
 
         Args:
             url (str): StoryWeaver 동화책 URL
+            lazy_translation (bool): True면 번역하지 않고 저장 (읽을 때 번역)
 
         Returns:
             dict: 크롤링된 동화책 데이터 또는 None (실패 시)
@@ -60,13 +63,13 @@ class StoryWeaverCrawler:
             }
 
             print(f"API 호출: {api_url}")
-            response = requests.get(api_url, headers=headers, timeout=30)
+            response = self.session.get(api_url, headers=headers, timeout=30)
 
             # 403이면 다른 방법 시도
             if response.status_code == 403:
                 print("API 접근 거부됨. 대체 방법 시도...")
                 # 직접 웹페이지에서 데이터 추출 시도
-                return self._crawl_from_webpage(url, story_id)
+                return self._crawl_from_webpage(url, story_id, lazy_translation)
 
             response.raise_for_status()
 
@@ -103,8 +106,8 @@ class StoryWeaverCrawler:
                 if not en_text:
                     continue
 
-                # 한국어 번역
-                ko_text = self._translate_to_korean(en_text) if en_text else ""
+                # 한국어 번역 (지연 번역 모드면 읽을 때 번역)
+                ko_text = '' if lazy_translation else self._translate_to_korean(en_text)
 
                 page_data = {
                     'image_url': image_url,
@@ -115,7 +118,7 @@ class StoryWeaverCrawler:
                 pages.append(page_data)
 
                 # API 호출 제한을 위한 딜레이
-                if en_text:
+                if not lazy_translation:
                     time.sleep(0.5)
 
             if not pages:
@@ -142,7 +145,7 @@ class StoryWeaverCrawler:
             traceback.print_exc()
             return None
 
-    def _crawl_from_webpage(self, url, story_id):
+    def _crawl_from_webpage(self, url, story_id, lazy_translation=False):
         """
         웹페이지에서 직접 동화책 데이터를 추출합니다 (fallback 방법).
         """
@@ -160,7 +163,7 @@ class StoryWeaverCrawler:
                 'Accept-Language': 'en-US,en;q=0.9',
             }
 
-            response = requests.get(read_url, headers=headers, timeout=30)
+            response = self.session.get(read_url, headers=headers, timeout=30)
 
             if response.status_code != 200:
                 print(f"웹페이지 접근 실패: {response.status_code}")
@@ -205,14 +208,15 @@ class StoryWeaverCrawler:
                     if page.get('illustration_crop'):
                         image_url = page['illustration_crop'].get('image_urls', {}).get('size7', '')
 
-                    ko_text = self._translate_to_korean(en_text)
+                    ko_text = '' if lazy_translation else self._translate_to_korean(en_text)
 
                     pages.append({
                         'image_url': image_url,
                         'en': en_text,
                         'ko': ko_text
                     })
-                    time.sleep(0.5)
+                    if not lazy_translation:
+                        time.sleep(0.5)
 
                 if pages:
                     return {
@@ -231,6 +235,7 @@ class StoryWeaverCrawler:
 
     def _translate_to_korean(self, text):
         """영어 텍스트를 한국어로 번역합니다."""
+        started = time.perf_counter()
         try:
             # 텍스트가 너무 길면 나눠서 번역
             if len(text) > 500:
@@ -242,30 +247,26 @@ class StoryWeaverCrawler:
                         result = self.translator.translate(sentence)
                         translated.append(result)
                         time.sleep(0.3)
-                return '. '.join(translated)
+                result = '. '.join(translated)
             else:
                 result = self.translator.translate(text)
-                return result
+            self._record_translation('deep_translator', started, text, result)
+            return result
         except Exception as e:
             print(f"번역 오류: {str(e)}")
+            self._record_translation('source', started, text, text, f"deep_translator_error: {type(e).__name__}")
             return text
 
+    def _record_translation(self, backend, started, text, result, fallback_reason=None):
+        """번역 결과를 기록합니다."""
+        import translation_metrics
+        latency_ms = (time.perf_counter() - started) * 1000
+        translation_metrics.record(backend, latency_ms, len(text), len(result or ''), fallback_reason=fallback_reason)
+
     def save_story(self, story_data):
         """크롤링된 동화책을 JSON 파일에 저장합니다."""
         try:
-            # 기존 데이터 로드
-            try:
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    stories = json.load(f)
-            except FileNotFoundError:
-                stories = []
-
-            # 새 동화책 추가
-            stories.append(story_data)
-
-            # 파일에 저장
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(stories, f, ensure_ascii=False, indent=2)
+            story_store.add_story(story_data, self.json_file)
 
             print(f"'{story_data['title']}' 저장 완료!")
             return True
@@ -276,14 +277,7 @@ class StoryWeaverCrawler:
 
     def get_all_stories(self):
         """저장된 모든 동화책을 반환합니다."""
-        try:
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return []
-        except Exception as e:
-            print(f"파일 읽기 오류: {str(e)}")
-            return []
+        return story_store.load_stories(self.json_file)
 
 
 # 테스트용 코드
@@ -0,0 +1,123 @@
+"""
+동화책 준비(enrichment) 작업 모듈
+동화책이 저장되면 백그라운드에서 핵심 단어, 단어 카드, 빠진 번역, 페이지 음성을 미리 만들어 둡니다.
+학습자가 퀴즈 모드를 처음 열 때 분석을 기다리지 않아도 됩니다.
+"""
+
+import os
+import queue
+import threading
+from datetime import datetime
+
+import story_store
+
+# 1이면 동화책을 저장할 때 모든 페이지 음성과 단어 시각도 미리 만듦 (audio_bake)
+AUDIO_BAKE_ON_INGEST = os.getenv('AUDIO_BAKE_ON_INGEST', '1') == '1'
+
+# 작업 상태 표시용 이름
+STATUS_LABELS = {
+    'queued': '⏳ 대기 중',
+    'running': '🔄 준비 중',
+    'done': '✅ 준비 완료',
+    'failed': '❌ 실패',
+}
+
+_queue = queue.Queue()
+_jobs = {}  # story_id -> 작업 상태 dict
+_lock = threading.Lock()
+_worker = None
+
+
+def _set_status(story_id, **fields):
+    with _lock:
+        job = _jobs.setdefault(story_id, {})
+        job.update(fields)
+        job['updated_at'] = datetime.now().strftime('%H:%M:%S')
+
+
+def _ensure_worker():
+    """작업 스레드를 처음 필요할 때 하나만 시작합니다."""
+    global _worker
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='story-enrichment', daemon=True)
+            _worker.start()
+
+
+def enqueue(story_id, title='', json_file=story_store.STORIES_FILE):
+    """
+    동화책 준비 작업을 큐에 넣습니다. 이미 대기/진행 중이면 다시 넣지 않습니다.
+
+    Args:
+        story_id (str): 동화책 ID
+        title (str): 상태 표시에 쓸 제목
+    """
+    with _lock:
+        job = _jobs.get(story_id)
+        if job and job.get('status') in ('queued', 'running'):
+            return
+    _set_status(story_id, title=title, status='queued', step='', error='')
+    _queue.put((story_id, json_file))
+    _ensure_worker()
+
+
+def get_jobs():
+    """모든 작업 상태를 최근 순으로 반환합니다."""
+    with _lock:
+        jobs = [dict(job, story_id=story_id) for story_id, job in _jobs.items()]
+    return sorted(jobs, key=lambda job: job.get('updated_at', ''), reverse=True)
+
+
+def get_status(story_id):
+    """동화책 하나의 작업 상태를 반환합니다. 작업이 없으면 None."""
+    with _lock:
+        job = _jobs.get(story_id)
+        return dict(job) if job else None
+
+
+def _run():
+    while True:
+        story_id, json_file = _queue.get()
+        try:
+            _enrich(story_id, json_file)
+            _set_status(story_id, status='done', step='')
+        except Exception as e:
+            print(f"동화책 준비 작업 오류 ({story_id}): {str(e)}")
+            _set_status(story_id, status='failed', error=str(e))
+        finally:
+            _queue.task_done()
+
+
+def _enrich(story_id, json_file):
+    """핵심 단어 → 단어 카드 → 퀴즈 풀 → 빠진 번역 → 페이지 음성 순서로 준비합니다."""
+    import lazy_translation
+    import quiz_pool
+    import vocabulary_store
+
+    story = story_store.get_story(story_id, json_file)
+    if story is None:
+        raise ValueError("동화책을 찾을 수 없습니다.")
+
+    _set_status(story_id, status='running', step='핵심 단어 분석')
+    vocabulary_data = vocabulary_store.get_or_analyze(story, json_file)
+
+    if vocabulary_data.get('vocabulary') and not vocabulary_data.get('cards'):
+        _set_status(story_id, step='단어 카드 만들기')
+        vocabulary_store.save_cards(story, json_file)
+
+    _set_status(story_id, step='퀴즈 문제 만들기')
+    quiz_pool.prefill(story_id, json_file)
+
+    missing = [i for i, page in enumerate(story['pages']) if lazy_translation.needs_translation(page)]
+    for done, page_index in enumerate(missing):
+        _set_status(story_id, step=f"번역 {done + 1}/{len(missing)}")
+        future = lazy_translation.schedule(story, page_index, json_file)
+        if future is not None:
+            future.result()
+
+    if AUDIO_BAKE_ON_INGEST:
+        import audio_bake
+
+        _set_status(story_id, step='음성 준비')
+        audio_bake.bake(story_id, json_file,
+                        progress=lambda done, total: _set_status(story_id, step=f"음성 {done}/{total}"))
@@ -3,26 +3,233 @@ Gemini API 헬퍼 모듈
 번역, 발음 평가, 퀴즈 생성 등을 Gemini API로 처리합니다.
 """
 
+import copy
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+import llm_backends
+import tracing
 
 # .env 파일 로드
 load_dotenv()
 
-# Gemini API 설정
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+# Gemini API 설정 (실제 호출은 llm_backends에서 처리, LLM_BACKEND=fake면 기록된 응답 재생)
+GEMINI_API_KEY = llm_backends.GEMINI_API_KEY
+GEMINI_MODEL_NAME = llm_backends.GEMINI_MODEL_NAME
+
+# 발음 평가 피드백을 Gemini로 다듬을지 여부 (점수는 항상 로컬에서 계산)
+PRONUNCIATION_LLM_FEEDBACK = os.getenv('PRONUNCIATION_LLM_FEEDBACK', '0') == '1'
+
+
+def _get_model():
+    """
+    설정된 모델 백엔드를 반환합니다.
+    google.generativeai는 가져오는 데 오래 걸리므로 처음 호출할 때 불러옵니다.
+
+    Returns:
+        ModelBackend: 모델 백엔드 또는 None (API 키가 없는 경우)
+    """
+    return llm_backends.get_backend()
+
+
+# 함수별 응답 시간 제한 (초). 넘으면 호출을 포기하고 각 함수의 대체 경로를 사용합니다.
+LLM_TIMEOUTS = {
+    'translate': float(os.getenv('LLM_TIMEOUT_TRANSLATE', '4')),
+    'pronunciation_feedback': float(os.getenv('LLM_TIMEOUT_PRONUNCIATION', '4')),
+    'quiz': float(os.getenv('LLM_TIMEOUT_QUIZ', '6')),
+    'quiz_batch': float(os.getenv('LLM_TIMEOUT_QUIZ_BATCH', '20')),
+    'vocabulary': float(os.getenv('LLM_TIMEOUT_VOCABULARY', '15')),
+}
+
+
+class _Call:
+    """
+    데몬 스레드 하나에서 실행하는 모델 호출
+    호출마다 스레드를 따로 쓰므로 멈춘 호출이 다른 호출의 자리를 막지 않고,
+    시간 제한은 큐에서 기다리는 시간 없이 호출이 시작될 때부터 잽니다.
+    """
+
+    def __init__(self, func, *args):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(func, args), name='llm-call', daemon=True)
+        self._thread.start()
+
+    def _run(self, func, args):
+        try:
+            self.result = func(*args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+
+def _generate(model, prompt, operation, schema=None, timeout=None):
+    """
+    응답을 요청합니다. (schema를 주면 JSON 응답)
+    요청 자체에 시간 제한을 걸어(Gemini request_options) 전송 단계에서 호출이 끝나게 하고,
+    연결이 멈춰 그마저 지켜지지 않을 때를 위해 별도 데몬 스레드에서 실행하며
+    시간이 지나면 기다리지 않고 DeadlineExceeded를 던집니다.
+
+    Args:
+        timeout (float): 시간 제한 (초, None이면 LLM_TIMEOUTS[operation])
+    """
+    if timeout is None:
+        timeout = LLM_TIMEOUTS.get(operation)
+    with tracing.span('llm.call', operation=operation, backend=model.name, prompt_chars=len(prompt),
+                      timeout=timeout) as span:
+        if not timeout:
+            result = model.generate(prompt, schema=schema, operation=operation)
+        else:
+            started = time.perf_counter()
+            call = _Call(model.generate, prompt, schema, operation, timeout)
+            if not call.done.wait(timeout):
+                # 멈춘 호출은 데몬 스레드에 남겨 두고 결과를 버림 (다른 호출에는 영향 없음)
+                _record_timeout(model, operation, started, prompt)
+                raise llm_backends.DeadlineExceeded(f"{operation}: {timeout:g}초 안에 응답이 없습니다.")
+            if isinstance(call.error, llm_backends.DeadlineExceeded):
+                _record_timeout(model, operation, started, prompt)
+            if call.error is not None:
+                raise call.error
+            result = call.result
+        span.set(response_chars=len(result))
+    return result
+
+
+def _record_timeout(model, operation, started, prompt):
+    """시간 초과를 기록합니다. (번역은 대체 번역 결과와 함께 translate_to_korean에서 기록)"""
+    if operation == 'translate':
+        return
+    import translation_metrics
+    translation_metrics.record(model.name, (time.perf_counter() - started) * 1000, len(prompt), 0,
+                               fallback_reason='timeout', operation=operation)
+
+
+class _Flight:
+    """진행 중인 호출 하나. 같은 인자로 들어온 다른 호출은 이 결과를 기다립니다."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.5-flash-lite')
-else:
-    model = None
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _single_flight(key, func):
+    """
+    같은 키의 호출이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받습니다.
+    여러 아이가 같은 동화책을 동시에 열어도 Gemini 호출은 한 번만 나갑니다.
+
+    Args:
+        key (tuple): 정규화한 호출 인자
+        func (callable): 실제 호출 (인자 없음)
+
+    Returns:
+        func의 반환값 (기다린 호출에는 복사본을 줌)
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _Flight()
+            _flights[key] = flight
+
+    if not is_leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result)
+
+    try:
+        flight.result = func()
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _normalize_text(text):
+    """공백 차이만 있는 입력을 같은 호출로 보도록 정리합니다."""
+    return ' '.join((text or '').split())
+
+
+def _story_text_key(story):
+    """동화책 본문으로 호출 키를 만듭니다."""
+    texts = [_normalize_text(page.get('en', '')) for page in story.get('pages', [])]
+    return hashlib.sha256('\n'.join(texts).encode('utf-8')).hexdigest()
+
+
+# 핵심 단어 프롬프트/스키마를 바꾸면 버전을 올려주세요. (저장된 분석 결과가 다시 계산됩니다)
+VOCABULARY_PROMPT_VERSION = 'mapreduce-v1'
+
+# 구조화된 JSON 응답 스키마 (Gemini response_schema 형식)
+QUIZ_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'word': {'type': 'STRING'},
+        'correct': {'type': 'STRING'},
+        'wrong': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+    },
+    'required': ['word', 'correct', 'wrong'],
+}
+
+QUIZ_BATCH_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'questions': {'type': 'ARRAY', 'items': QUIZ_SCHEMA},
+    },
+    'required': ['questions'],
+}
+
+VOCABULARY_CHUNK_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'grammar_points': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'words': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'en': {'type': 'STRING'},
+                    'ko': {'type': 'STRING'},
+                    'difficulty': {'type': 'INTEGER'},
+                },
+                'required': ['en', 'ko', 'difficulty'],
+            },
+        },
+    },
+    'required': ['grammar_points', 'words'],
+}
+
+# 긴 동화책은 페이지를 토큰 예산 단위로 나눠 병렬로 분석합니다.
+VOCABULARY_CHUNK_TOKENS = int(os.getenv('VOCABULARY_CHUNK_TOKENS', '1500'))
+VOCABULARY_MAX_WORKERS = int(os.getenv('VOCABULARY_MAX_WORKERS', '4'))
+QUIZ_CHUNK_TOKENS = int(os.getenv('QUIZ_CHUNK_TOKENS', '600'))
+QUIZ_BATCH_TOKENS = int(os.getenv('QUIZ_BATCH_TOKENS', '3000'))
+MAX_VOCABULARY_WORDS = 30
+
+
+def _generate_json(model, prompt, schema, operation, timeout=None):
+    """스키마를 지정해 JSON 응답을 요청하고 응답 문자열을 반환합니다."""
+    return _generate(model, prompt, operation, schema, timeout)
 
 
 def translate_to_korean(text):
     """
     영어 텍스트를 한국어로 번역합니다.
+    호출마다 사용한 백엔드와 걸린 시간을 translation_metrics에 기록합니다.
+    같은 문장을 동시에 번역하면 Gemini 호출 하나를 함께 기다립니다.
 
     Args:
         text (str): 영어 텍스트
@@ -30,22 +237,17 @@ def translate_to_korean(text):
     Returns:
         str: 한국어 번역
     """
-    print(f"[DEBUG] translate_to_korean 함수 호출됨")
-    print(f"[DEBUG] 입력 텍스트: {text[:50]}..." if len(text) > 50 else f"[DEBUG] 입력 텍스트: {text}")
-    print(f"[DEBUG] model 객체 존재 여부: {model is not None}")
+    # 같은 문장을 동시에 번역하려는 호출은 하나로 합침
+    return _single_flight(('translate', _normalize_text(text)), lambda: _translate_to_korean(text))
+
+
+def _translate_to_korean(text):
+    started = time.perf_counter()
+    model = _get_model()
 
     if not model:
         # Gemini API가 설정되지 않은 경우 대체 번역기 사용
-        print(f"[DEBUG] Gemini model이 없음. deep_translator 사용")
-        try:
-            from deep_translator import GoogleTranslator
-            translator = GoogleTranslator(source='en', target='ko')
-            result = translator.translate(text)
-            print(f"[DEBUG] deep_translator 번역 결과: {result[:50]}..." if len(result) > 50 else f"[DEBUG] deep_translator 번역 결과: {result}")
-            return result
-        except Exception as e:
-            print(f"[DEBUG] deep_translator 오류: {str(e)}")
-            return text
+        return _translate_with_deep_translator(text, started, 'no_api_key')
 
     try:
         prompt = f"""다음 영어 문장을 9살 어린이가 이해하기 쉬운 자연스러운 한국어로 번역해주세요.
@@ -55,116 +257,87 @@ def translate_to_korean(text):
 
 한국어 번역만 출력하고, 다른 설명은 하지 마세요."""
 
-        print(f"[DEBUG] Gemini API 호출 시작...")
-        response = model.generate_content(prompt)
-        result = response.text.strip()
-        print(f"[DEBUG] Gemini 번역 성공!")
-        print(f"[DEBUG] 번역 결과: {result[:50]}..." if len(result) > 50 else f"[DEBUG] 번역 결과: {result}")
+        result = _generate(model, prompt, 'translate')
+        _record_translation(model.name, started, text, result)
         return result
     except Exception as e:
-        error_msg = str(e)
-        print(f"Gemini 번역 오류: {error_msg}")
-        print(f"[DEBUG] 오류 타입: {type(e).__name__}")
+        print(f"Gemini 번역 오류: {str(e)}")
+        # Gemini API 할당량 초과, 시간 초과 또는 오류 시 deep_translator로 fallback
+        reason = 'timeout' if isinstance(e, llm_backends.DeadlineExceeded) else f"gemini_error: {type(e).__name__}"
+        return _translate_with_deep_translator(text, started, reason)
 
-        # Gemini API 할당량 초과 또는 오류 시 deep_translator로 fallback
-        print(f"[DEBUG] Gemini API 실패. deep_translator로 전환합니다...")
-        try:
-            from deep_translator import GoogleTranslator
-            translator = GoogleTranslator(source='en', target='ko')
-            result = translator.translate(text)
-            print(f"[DEBUG] deep_translator 번역 성공: {result[:50]}..." if len(result) > 50 else f"[DEBUG] deep_translator 번역 성공: {result}")
-            return result
-        except Exception as fallback_error:
-            print(f"[DEBUG] deep_translator도 실패: {str(fallback_error)}")
-            # 최후의 수단: 원문 반환
-            return text
+
+def _translate_with_deep_translator(text, started, fallback_reason):
+    """deep_translator로 번역하고, 그마저 실패하면 원문을 반환합니다."""
+    tracing.event('translate.fallback', level=tracing.DEBUG, reason=fallback_reason, chars=len(text))
+    try:
+        from http_client import get_translator
+        result = get_translator().translate(text)
+        _record_translation('deep_translator', started, text, result, fallback_reason)
+        return result
+    except Exception as fallback_error:
+        print(f"deep_translator 번역 오류: {str(fallback_error)}")
+        # 최후의 수단: 원문 반환
+        _record_translation('source', started, text, text,
+                            f"{fallback_reason}; deep_translator_error: {type(fallback_error).__name__}")
+        return text
 
 
-def evaluate_pronunciation(original_text, spoken_text):
+def _record_translation(backend, started, text, result, fallback_reason=None):
+    """번역 결과를 기록합니다."""
+    import translation_metrics
+    latency_ms = (time.perf_counter() - started) * 1000
+    translation_metrics.record(backend, latency_ms, len(text), len(result or ''), fallback_reason=fallback_reason)
+
+
+def evaluate_pronunciation(original_text, spoken_text, use_llm=PRONUNCIATION_LLM_FEEDBACK):
     """
     발음을 평가하고 상세한 피드백을 제공합니다.
+    점수와 단어별 결과는 로컬 정렬 방식(pronunciation_scorer)으로 바로 계산하고,
+    use_llm이 켜져 있으면 Gemini로 피드백 문장만 더 자연스럽게 다듬습니다.
 
     Args:
         original_text (str): 원본 영어 문장
         spoken_text (str): 사용자가 말한 텍스트 (STT 결과)
+        use_llm (bool): Gemini로 피드백 문장을 다듬을지 여부
 
     Returns:
         dict: {
             'score': float (0-1),
             'feedback': str,
-            'is_good': bool
+            'is_good': bool,
+            'words': list of dict  # 단어별 맞음/빠짐/바뀜 표시
         }
     """
-    if not model:
-        # Gemini API가 없으면 간단한 유사도로 평가
-        from difflib import SequenceMatcher
-        similarity = SequenceMatcher(None, original_text.lower(), spoken_text.lower()).ratio()
+    from pronunciation_scorer import score_pronunciation
 
-        is_good = similarity >= 0.7
-        feedback = "참 잘했어요! 완벽해요!" if similarity >= 0.7 else \
-                   "좋아요! 조금만 더 연습해봐요!" if similarity >= 0.5 else \
-                   "다시 한 번 해볼까요? 천천히 따라해봐요!"
+    result = score_pronunciation(original_text, spoken_text)
+    if not use_llm:
+        return result
 
-        return {
-            'score': similarity,
-            'feedback': feedback,
-            'is_good': is_good
-        }
+    model = _get_model()
+    if not model:
+        return result
 
     try:
+        practice = [mark['word'] for mark in result['words']
+                    if mark['status'] in ('missed', 'substituted') and mark['word']]
         prompt = f"""당신은 9살 어린이를 위한 영어 발음 선생님입니다.
 
 원본 문장: {original_text}
 아이가 말한 문장: {spoken_text}
+점수: {round(result['score'] * 100)}점
+다시 연습할 단어: {', '.join(practice) if practice else '없음'}
 
-아이의 발음을 평가하고, 격려하는 피드백을 한국어로 작성해주세요.
-
-다음 형식으로 답변해주세요:
-점수: [0-100 사이의 숫자]
-피드백: [격려하는 한마디]
-
-- 점수가 70점 이상이면 칭찬을 많이 해주세요
-- 점수가 50-70점이면 격려하며 조금 더 연습하도록 유도해주세요
-- 점수가 50점 미만이면 다시 도전하도록 친절하게 독려해주세요
-- 피드백은 한 문장으로 짧고 친근하게 작성해주세요"""
-
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        # 결과 파싱
-        lines = result_text.split('\n')
-        score = 0.5
-        feedback = "잘했어요! 계속 연습해봐요!"
-
-        for line in lines:
-            if '점수:' in line or 'Score:' in line or '점수 :' in line:
-                try:
-                    score_str = line.split(':')[1].strip()
-                    # 숫자만 추출
-                    import re
-                    numbers = re.findall(r'\d+', score_str)
-                    if numbers:
-                        score = int(numbers[0]) / 100.0
-                except:
-                    pass
-            elif '피드백:' in line or 'Feedback:' in line or '피드백 :' in line:
-                feedback = line.split(':', 1)[1].strip()
-
-        is_good = score >= 0.7
+위 결과를 보고 아이를 격려하는 피드백을 한국어 한 문장으로 짧고 친근하게 작성해주세요.
+피드백 문장만 답변해주세요."""
 
-        return {
-            'score': score,
-            'feedback': feedback,
-            'is_good': is_good
-        }
+        feedback = _generate(model, prompt, 'pronunciation_feedback').split('\n')[0].strip()
+        if feedback:
+            result['feedback'] = feedback
     except Exception as e:
-        print(f"Gemini 발음 평가 오류: {str(e)}")
-        # 오류 시 기본 평가
-        return {
-            'score': 0.5,
-            'feedback': "좋아요! 계속 연습해봐요!",
-            'is_good': False
-        }
+        print(f"Gemini 발음 피드백 오류: {str(e)}")
+    return result
 
 
 def generate_vocabulary_quiz(story):
@@ -181,104 +354,144 @@ def generate_vocabulary_quiz(story):
             'correct': str
         }
     """
+    model = _get_model()
     if not model:
-        # Gemini API가 없으면 기존 방식 사용
+        # Gemini API가 없으면 오프라인 단어장에서 단어 뜻을 찾아 퀴즈 생성
         import random
-        all_words = []
-        for page in story['pages']:
-            if page['en'] and page['ko']:
-                words = page['en'].split()
-                valid_words = [w.strip('.,!?;:').lower() for w in words if len(w.strip('.,!?;:')) >= 3]
-                for word in valid_words:
-                    all_words.append({
-                        'en': word,
-                        'ko': page['ko']
-                    })
-
+        all_words = _offline_quiz_words(story)
         if len(all_words) < 3:
             return None
+        return _make_offline_quiz(all_words, random.choice(all_words))
 
-        correct = random.choice(all_words)
-        wrong_answers = [w for w in all_words if w['en'] != correct['en']]
-
-        if len(wrong_answers) < 2:
+    try:
+        # 동화책 전체에서 토큰 예산에 맞는 구간 하나를 골라 사용
+        import random
+        chunks = _chunk_pages(story, QUIZ_CHUNK_TOKENS)
+        if not chunks:
             return None
+        story_content = random.choice(chunks)
 
-        options = random.sample(wrong_answers, min(2, len(wrong_answers)))
-        options.append(correct)
-        random.shuffle(options)
+        prompt = f"""다음은 어린이 동화책의 내용입니다:
 
-        return {
-            'question': correct['en'],
-            'options': options,
-            'correct': correct['ko']
-        }
+{story_content}
 
-    try:
-        # 동화책의 모든 텍스트 수집
-        all_texts = []
-        for page in story['pages']:
-            if page['en']:
-                all_texts.append(page['en'])
+이 동화책 내용을 기반으로 9살 어린이를 위한 영어 단어 퀴즈를 하나 만들어주세요.
+
+JSON으로 답변해주세요:
+- word: 동화책에 나온 주요 영어 단어 하나
+- correct: 그 단어의 한국어 뜻
+- wrong: 그럴듯하지만 틀린 한국어 뜻 2개
+
+- 정답과 오답은 명확하게 구분되어야 합니다
+- 오답도 그럴듯하게 만들어주세요"""
+
+        result_text = _generate_json(model, prompt, QUIZ_SCHEMA, 'quiz')
+        return _parse_quiz(result_text)
+
+    except Exception as e:
+        print(f"Gemini 퀴즈 생성 오류: {str(e)}")
+        return None
+
+
+def generate_vocabulary_quiz_batch(story, count=20):
+    """
+    단어 퀴즈를 한 번에 여러 개 생성합니다. (퀴즈 풀 채우기용)
+
+    Args:
+        story (dict): 동화책 데이터
+        count (int): 만들 문제 수
+
+    Returns:
+        list of dict: generate_vocabulary_quiz와 같은 형식의 퀴즈 목록
+    """
+    import random
+
+    model = _get_model()
+    if not model:
+        # Gemini API가 없으면 오프라인 단어장으로 단어마다 한 문제씩 생성
+        all_words = _offline_quiz_words(story)
+        if len(all_words) < 3:
+            return []
+        random.shuffle(all_words)
+        quizzes = [_make_offline_quiz(all_words, word) for word in all_words[:count]]
+        return [quiz for quiz in quizzes if quiz]
 
-        story_content = " ".join(all_texts[:5])  # 처음 5페이지만 사용
+    try:
+        # 동화책의 한 구간을 골라 사용 (다음 보충 때는 다른 구간이 뽑힐 수 있음)
+        chunks = _chunk_pages(story, QUIZ_BATCH_TOKENS)
+        if not chunks:
+            return []
+        story_content = random.choice(chunks)
 
         prompt = f"""다음은 어린이 동화책의 내용입니다:
 
 {story_content}
 
-이 동화책 내용을 기반으로 9살 어린이를 위한 영어 단어 퀴즈를 하나 만들어주세요.
+이 동화책 내용을 기반으로 9살 어린이를 위한 영어 단어 퀴즈를 {count}개 만들어주세요.
 
-다음 형식으로 답변해주세요:
-단어: [영어 단어]
-정답: [한국어 뜻]
-오답1: [다른 한국어 뜻]
-오답2: [또 다른 한국어 뜻]
+JSON으로 답변해주세요:
+- questions: 퀴즈 목록, 각 항목은
+  - word: 동화책에 나온 영어 단어 하나 (문제마다 다른 단어)
+  - correct: 그 단어의 한국어 뜻
+  - wrong: 그럴듯하지만 틀린 한국어 뜻 2개
 
-- 동화책에 나온 주요 단어 중 하나를 선택하세요
 - 정답과 오답은 명확하게 구분되어야 합니다
 - 오답도 그럴듯하게 만들어주세요"""
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
-
-        # 결과 파싱
-        lines = result_text.split('\n')
-        question = ""
-        correct = ""
-        options = []
-
-        for line in lines:
-            line = line.strip()
-            if '단어:' in line or 'Word:' in line:
-                question = line.split(':', 1)[1].strip()
-            elif '정답:' in line or 'Correct:' in line:
-                correct = line.split(':', 1)[1].strip()
-                options.append({'en': question, 'ko': correct})
-            elif '오답' in line or 'Wrong' in line:
-                wrong = line.split(':', 1)[1].strip()
-                options.append({'en': question + '_wrong', 'ko': wrong})
-
-        if len(options) >= 3 and question and correct:
-            import random
-            random.shuffle(options)
-            return {
-                'question': question,
-                'options': options,
-                'correct': correct
-            }
-        else:
-            # 파싱 실패 시 None 반환
-            return None
+        result_text = _generate_json(model, prompt, QUIZ_BATCH_SCHEMA, 'quiz_batch')
+        return _parse_quiz_batch(result_text)
 
     except Exception as e:
-        print(f"Gemini 퀴즈 생성 오류: {str(e)}")
+        print(f"Gemini 퀴즈 묶음 생성 오류: {str(e)}")
+        return []
+
+
+def _offline_quiz_words(story):
+    """동화책에 나온 단어 중 단어장에 뜻이 있는 단어 목록을 만듭니다."""
+    from lexicon import lookup
+
+    all_words = []
+    seen = set()
+    for page in story['pages']:
+        if page['en']:
+            words = page['en'].split()
+            valid_words = [w.strip('.,!?;:').lower() for w in words if len(w.strip('.,!?;:')) >= 3]
+            for word in valid_words:
+                meaning = lookup(word)
+                if meaning and word not in seen:
+                    seen.add(word)
+                    all_words.append({
+                        'en': word,
+                        'ko': meaning
+                    })
+    return all_words
+
+
+def _make_offline_quiz(all_words, correct):
+    """정답 단어 하나와 다른 단어 뜻 2개로 3지선다 퀴즈를 만듭니다."""
+    import random
+
+    wrong_answers = [w for w in all_words if w['en'] != correct['en'] and w['ko'] != correct['ko']]
+    if len(wrong_answers) < 2:
         return None
 
+    options = random.sample(wrong_answers, 2)
+    options.append(correct)
+    random.shuffle(options)
+
+    return {
+        'question': correct['en'],
+        'options': options,
+        'correct': correct['ko']
+    }
+
 
 def extract_key_vocabulary(story):
     """
     동화책 내용에서 핵심 단어를 추출하고 설명을 생성합니다.
+    페이지를 토큰 예산 단위로 나눠 구간별로 동시에 후보 단어를 뽑은 뒤(map),
+    합쳐서 등장 빈도와 난이도로 순위를 매겨 최대 30개를 고릅니다(reduce).
+    같은 본문을 동시에 분석하면 진행 중인 분석 하나를 함께 기다립니다.
 
     Args:
         story (dict): 동화책 데이터
@@ -289,86 +502,309 @@ def extract_key_vocabulary(story):
             'vocabulary': list of dict  # 단어 목록
         }
     """
+    model = _get_model()
     if not model:
         # Gemini API가 없으면 빈 결과 반환
         return {'explanation': '', 'vocabulary': []}
 
-    try:
-        # 동화책 전체 텍스트 수집
-        all_texts = []
-        for page in story['pages']:
-            if page['en']:
-                all_texts.append(page['en'])
+    # 같은 동화책을 동시에 분석하려는 호출은 하나로 합침
+    key = ('vocabulary', VOCABULARY_PROMPT_VERSION, _story_text_key(story))
+    return _single_flight(key, lambda: _extract_key_vocabulary(model, story))
 
-        story_content = " ".join(all_texts)
 
-        prompt = f"""다음은 어린이 동화책의 내용입니다:
+def _extract_key_vocabulary(model, story):
+    chunks = _chunk_pages(story, VOCABULARY_CHUNK_TOKENS)
+    if not chunks:
+        return {'explanation': '', 'vocabulary': []}
 
-{story_content}
+    from concurrent.futures import ThreadPoolExecutor
+
+    # 전체 분석의 시간 제한: 늦게 시작한 구간은 남은 시간만 기다리고, 끝난 구간만 합침
+    deadline = time.monotonic() + LLM_TIMEOUTS['vocabulary']
+
+    def _extract(chunk):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        try:
+            return _extract_chunk_vocabulary(model, chunk, remaining)
+        except Exception as e:
+            print(f"Gemini 단어 추출 오류: {str(e)}")
+            return None
+
+    # map: 구간별 후보 단어 추출 (가장 느린 구간만큼만 기다림)
+    with ThreadPoolExecutor(max_workers=max(1, min(VOCABULARY_MAX_WORKERS, len(chunks)))) as executor:
+        chunk_results = [result for result in executor.map(_extract, chunks) if result]
 
-이 동화책의 내용을 기반으로 핵심 단어와 문법을 설명해주세요. 또한, 핵심 단어 30개 이하를 추출하고, 각 단어에 대해 영어 단어와 한국어 뜻을 제공해주세요.
+    # reduce: 합치고 순위 매기기
+    full_text = " ".join(chunks)
+    return _merge_chunk_vocabulary(chunk_results, full_text)
 
-다음 형식으로 답변해주세요:
 
-[핵심 단어와 문법 설명]
-- 핵심 단어들에 대한 설명과 문법 설명
-- 어린이가 이해하기 쉬운 언어로
+def _estimate_tokens(text):
+    """영어 기준 대략 4글자를 1토큰으로 계산합니다."""
+    return len(text) // 4 + 1
 
-[단어 목록]
-- 단어: [영어 단어] | 뜻: [한국어 뜻]
-- 각 줄마다 하나의 단어를 표시
 
-- 핵심 단어는 최대 30개까지 추출해주세요
+def _chunk_pages(story, max_tokens):
+    """
+    페이지 텍스트를 순서대로 묶어 max_tokens를 넘지 않는 구간 목록을 만듭니다.
+    한 페이지가 예산보다 길면 문장 단위로 나눕니다.
+    """
+    import re
+
+    pieces = []
+    for page in story['pages']:
+        text = (page.get('en') or '').strip()
+        if not text:
+            continue
+        if _estimate_tokens(text) <= max_tokens:
+            pieces.append(text)
+        else:
+            pieces.extend(s for s in re.split(r'(?<=[.!?])\s+', text) if s)
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = _estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _extract_chunk_vocabulary(model, chunk, timeout=None):
+    """구간 하나에서 후보 단어와 문법 포인트를 추출합니다."""
+    prompt = f"""다음은 어린이 동화책의 일부입니다:
+
+{chunk}
+
+이 부분에서 9살 어린이가 배우기 좋은 핵심 영어 단어를 최대 15개 고르고, 눈에 띄는 문법을 짧게 설명해주세요.
+
+JSON으로 답변해주세요:
+- grammar_points: 어린이가 이해하기 쉬운 한국어 문법 설명 (1~3개, 각각 한 문장)
+- words: 단어 목록, 각 항목은 en(본문에 나온 영어 단어의 기본형), ko(한국어 뜻), difficulty(1=아주 쉬움, 2=보통, 3=어려움)
+
 - 동화책에서 자주 등장하거나 중요한 단어 위주로 선택하세요
-- 어린이가 학습하기 좋은 기초 단어를 선정하세요"""
+- the, and 같은 기능어는 제외하세요"""
 
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+    result_text = _generate_json(model, prompt, VOCABULARY_CHUNK_SCHEMA, 'vocabulary_chunk', timeout)
+    return _parse_chunk_vocabulary(result_text)
 
-        # 결과 파싱
-        lines = result_text.split('\n')
-        
-        explanation = ""
-        vocabulary = []
-        in_vocabulary_section = False
-
-        for line in lines:
-            line = line.strip()
-            if '[단어 목록]' in line:
-                in_vocabulary_section = True
-                continue
-            
-            if in_vocabulary_section:
-                # 단어 형식: - 단어: [영어] | 뜻: [한국어]
-                import re
-                match = re.search(r'-\s*단어:\s*([^\|]+)\s*\|\s*뜻:\s*(.+)', line)
-                if match:
-                    english_word = match.group(1).strip()
-                    korean_meaning = match.group(2).strip()
-                    
-                    # 불필요한 문장 제거 (예: "영어", "한국어" 등)
-                    if english_word.lower() not in ['영어', '한국어'] and korean_meaning.lower() not in ['영어', '한국어']:
-                        vocabulary.append({
-                            'en': english_word,
-                            'ko': korean_meaning
-                        })
-            else:
-                if not '[핵심 단어와 문법 설명]' in line:
-                    explanation += line + "\n"
 
-        return {
-            'explanation': explanation.strip(),
-            'vocabulary': vocabulary[:30]  # 최대 30개로 제한
-        }
+def _parse_chunk_vocabulary(result_text):
+    """
+    구간별 JSON 응답을 검증합니다.
+    JSON이 깨졌으면 고쳐서 읽고, 그래도 안 되면 완전한 단어 항목만 사용합니다.
 
-    except Exception as e:
-        print(f"Gemini 단어 추출 오류: {str(e)}")
+    Returns:
+        dict: {'grammar_points': list of str, 'words': list of dict} 또는 None
+    """
+    import llm_json
+
+    data = llm_json.parse_json(result_text)
+    if isinstance(data, dict):
+        grammar_points = data.get('grammar_points') or []
+        items = data.get('words') or []
+    elif isinstance(data, list):
+        grammar_points = []
+        items = data
+    else:
+        # 일부만 읽을 수 있는 경우: 완전한 단어 항목만 사용
+        grammar_points = []
+        items = llm_json.extract_objects(result_text, ('en', 'ko'))
+
+    if isinstance(grammar_points, str):
+        grammar_points = [grammar_points]
+
+    words = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        english_word = _clean_text(item.get('en'))
+        korean_meaning = _clean_text(item.get('ko'))
+        if not english_word or not korean_meaning:
+            continue
+        # 불필요한 항목 제거 (예: "영어", "한국어" 등 자리표시자)
+        if english_word in ['영어', '한국어'] or korean_meaning in ['영어', '한국어']:
+            continue
+        try:
+            difficulty = min(3, max(1, int(item.get('difficulty', 2))))
+        except (TypeError, ValueError):
+            difficulty = 2
+        words.append({'en': english_word, 'ko': korean_meaning, 'difficulty': difficulty})
+
+    if not words:
+        print(f"Gemini 단어 응답을 사용할 수 없습니다: {result_text[:100]}")
+        return None
+
+    return {
+        'grammar_points': [_clean_text(point) for point in grammar_points if _clean_text(point)],
+        'words': words
+    }
+
+
+def _merge_chunk_vocabulary(chunk_results, full_text):
+    """
+    구간별 결과를 합쳐 최종 단어 목록과 설명을 만듭니다.
+    여러 구간에서 뽑히고 본문에 자주 나온 단어일수록, 같은 점수면 쉬운 단어일수록 앞에 둡니다.
+    """
+    import re
+    from collections import Counter
+
+    if not chunk_results:
         return {'explanation': '', 'vocabulary': []}
 
+    word_counts = Counter(re.findall(r"[a-z']+", full_text.lower()))
+
+    candidates = {}
+    for result in chunk_results:
+        # 한 구간이 같은 단어를 여러 번 돌려줘도 한 표로 셈
+        voted = set()
+        for word in result['words']:
+            key = word['en'].lower()
+            candidate = candidates.setdefault(key, {
+                'en': word['en'], 'ko': word['ko'], 'difficulty': word['difficulty'], 'votes': 0
+            })
+            if key not in voted:
+                voted.add(key)
+                candidate['votes'] += 1
+
+    def _frequency(key):
+        # 여러 단어로 된 표현은 첫 단어 빈도로 근사하고, 흔한 변화형도 함께 셈
+        first = key.split()[0] if key.split() else key
+        forms = {first, first + 's', first + 'es', first + 'd', first + 'ed', first + 'ing'}
+        return sum(word_counts[form] for form in forms)
+
+    ranked = sorted(
+        candidates.items(),
+        key=lambda item: (-(item[1]['votes'] * 2 + _frequency(item[0])), item[1]['difficulty'], item[0])
+    )
+    vocabulary = [{'en': c['en'], 'ko': c['ko']} for _, c in ranked[:MAX_VOCABULARY_WORDS]]
+
+    grammar_points = []
+    for result in chunk_results:
+        for point in result['grammar_points']:
+            if point not in grammar_points:
+                grammar_points.append(point)
+
+    explanation_lines = []
+    if vocabulary:
+        top_words = ", ".join(v['en'] for v in vocabulary[:10])
+        explanation_lines.append(f"**이 동화책의 핵심 단어:** {top_words}")
+    if grammar_points:
+        explanation_lines.append("")
+        explanation_lines.append("**문법 포인트**")
+        explanation_lines.extend(f"- {point}" for point in grammar_points[:6])
+
+    return {
+        'explanation': "\n".join(explanation_lines),
+        'vocabulary': vocabulary
+    }
+
+
+def _clean_text(value):
+    """응답 값을 한 줄 문자열로 정리합니다."""
+    return ' '.join(str(value).split()) if value is not None else ''
+
+
+def _parse_quiz(result_text):
+    """
+    퀴즈 JSON 응답을 검증합니다.
+
+    Returns:
+        dict: 퀴즈 또는 None (쓸 수 있는 내용이 없는 경우)
+    """
+    import llm_json
+
+    data = llm_json.parse_json(result_text)
+    if not isinstance(data, dict):
+        data = {
+            'word': llm_json.extract_string_field(result_text, 'word'),
+            'correct': llm_json.extract_string_field(result_text, 'correct'),
+            'wrong': [],
+        }
+
+    quiz = _quiz_from_dict(data)
+    if quiz is None:
+        print(f"Gemini 퀴즈 응답을 사용할 수 없습니다: {result_text[:100]}")
+    return quiz
+
+
+def _parse_quiz_batch(result_text):
+    """
+    퀴즈 묶음 JSON 응답을 검증합니다. 형식이 맞는 문제만 골라 사용합니다.
+
+    Returns:
+        list of dict: 퀴즈 목록 (단어가 겹치는 문제는 제외)
+    """
+    import llm_json
+
+    data = llm_json.parse_json(result_text)
+    if isinstance(data, dict):
+        items = data.get('questions') or []
+    elif isinstance(data, list):
+        items = data
+    else:
+        items = []
+
+    quizzes = []
+    seen = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        quiz = _quiz_from_dict(item)
+        if quiz and quiz['question'].lower() not in seen:
+            seen.add(quiz['question'].lower())
+            quizzes.append(quiz)
+
+    if not quizzes:
+        print(f"Gemini 퀴즈 묶음 응답을 사용할 수 없습니다: {result_text[:100]}")
+    return quizzes
+
+
+def _quiz_from_dict(data):
+    """
+    {'word', 'correct', 'wrong'} 항목을 퀴즈로 바꿉니다.
+    오답이 1개뿐이어도 정답과 합쳐 보기가 2개 이상이면 사용합니다.
+    """
+    import random
+
+    question = _clean_text(data.get('word'))
+    correct = _clean_text(data.get('correct'))
+    wrong = data.get('wrong') or []
+    if isinstance(wrong, str):
+        wrong = [wrong]
+
+    wrong_answers = []
+    for item in wrong:
+        item = _clean_text(item)
+        if item and item != correct and item not in wrong_answers:
+            wrong_answers.append(item)
+
+    if not question or not correct or not wrong_answers:
+        return None
+
+    options = [{'en': question, 'ko': correct}]
+    options.extend({'en': question + '_wrong', 'ko': item} for item in wrong_answers[:2])
+    random.shuffle(options)
+    return {
+        'question': question,
+        'options': options,
+        'correct': correct
+    }
+
 
 def extract_vocabulary_simple(story):
     """
     Gemini API 없이 간단하게 단어를 추출합니다. (대체 방법)
+    단어 뜻은 오프라인 단어장에서 먼저 찾고, 없는 단어만 번역기로 번역합니다.
 
     Args:
         story (dict): 동화책 데이터
@@ -380,12 +816,10 @@ def extract_vocabulary_simple(story):
         }
     """
     try:
-        from deep_translator import GoogleTranslator
+        from lexicon import translate_word
         import re
         from collections import Counter
 
-        translator = GoogleTranslator(source='en', target='ko')
-
         # 모든 텍스트 수집
         all_text = []
         for page in story['pages']:
@@ -417,15 +851,12 @@ def extract_vocabulary_simple(story):
         # 번역
         vocabulary = []
         for word in top_words:
-            try:
-                ko_translation = translator.translate(word)
+            ko_translation = translate_word(word)
+            if ko_translation:
                 vocabulary.append({
                     'en': word,
                     'ko': ko_translation
                 })
-            except Exception as e:
-                print(f"번역 실패: {word} - {str(e)}")
-                continue
 
         explanation = f"이 동화책에서 자주 등장하는 {len(vocabulary)}개의 핵심 단어입니다."
 
@@ -497,8 +928,8 @@ def generate_vocabulary_cards(vocabulary_list):
 if __name__ == "__main__":
     print("Gemini API 헬퍼 모듈")
 
-    if GEMINI_API_KEY:
-        print("✓ Gemini API 키가 설정되었습니다.")
+    if _get_model():
+        print(f"✓ 모델 백엔드: {_get_model().name}")
 
         # 번역 테스트
         test_text = "This is a cat."
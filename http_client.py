@@ -0,0 +1,151 @@
+"""
+공용 HTTP 클라이언트 모듈
+크롤러, deep_translator, gTTS가 하나의 keep-alive 연결 풀을 함께 사용하도록 합니다.
+매 호출마다 DNS/TCP/TLS 연결을 새로 맺지 않아 반복 호출이 빨라집니다.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 연결 풀 설정 (.env로 조절 가능)
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))  # 호스트별 풀 개수
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))  # 풀당 최대 연결 수
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+
+_session = None
+_session_lock = threading.Lock()
+_installed = False
+_translators = threading.local()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """timeout을 지정하지 않은 요청에 기본 timeout을 적용하는 어댑터"""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def get_session():
+    """프로세스 전체에서 공유하는 requests.Session을 반환합니다."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # 재시도를 다 써도 예외(RetryError) 대신 마지막 5xx 응답을 돌려줌
+                # (크롤러 등 기존 호출부가 status_code로 직접 처리)
+                retry = Retry(
+                    total=MAX_RETRIES,
+                    backoff_factor=0.3,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'POST']),
+                    raise_on_status=False,
+                )
+                adapter = TimeoutHTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=retry,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+class _SharedSessionContext:
+    """`with requests.Session() as s:` 구문에서 공용 세션을 닫지 않고 빌려주는 객체"""
+
+    def __enter__(self):
+        return get_session()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _PooledRequests:
+    """
+    requests 모듈 대신 라이브러리에 주입하는 대체 객체.
+    get/post/Session만 공용 세션으로 보내고 나머지는 requests 모듈 그대로 사용합니다.
+    """
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def get(self, url, **kwargs):
+        return get_session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return get_session().post(url, **kwargs)
+
+    def Session(self):
+        return _SharedSessionContext()
+
+
+def _patch_requests(module, pooled):
+    """
+    라이브러리 모듈의 전역 `requests` 참조를 공용 세션 객체로 바꿉니다.
+    이 참조는 라이브러리 내부 구현(공개 API 아님)이므로, 업데이트로 사라지면
+    조용히 연결 풀 없이 동작하지 않도록 바로 오류를 냅니다.
+    """
+    if not hasattr(module, 'requests'):
+        raise RuntimeError(
+            f"{module.__name__}에 'requests' 참조가 없습니다. "
+            "라이브러리 내부 구현이 바뀌었으니 http_client.install()을 확인하세요."
+        )
+    module.requests = pooled
+
+
+def install():
+    """
+    deep_translator와 gTTS가 공용 세션을 사용하도록 설정합니다.
+    두 라이브러리 모두 세션을 외부에서 받지 않으므로 내부 모듈
+    (deep_translator.google, gtts.tts)의 전역 requests 참조를 교체합니다. (비공개 내부 구현에 의존)
+    여러 번 호출해도 한 번만 적용됩니다.
+    """
+    global _installed
+    if _installed:
+        return
+    with _session_lock:
+        if _installed:
+            return
+        pooled = _PooledRequests()
+        try:
+            import deep_translator.google
+        except ImportError:
+            pass
+        else:
+            _patch_requests(deep_translator.google, pooled)
+        try:
+            import gtts.tts
+        except ImportError:
+            pass
+        else:
+            _patch_requests(gtts.tts, pooled)
+        _installed = True
+
+
+def get_translator():
+    """
+    공용 세션을 사용하는 GoogleTranslator(en -> ko)를 반환합니다.
+    GoogleTranslator는 호출 중 내부 상태를 바꾸므로 스레드마다 하나씩 만들어 재사용합니다.
+    """
+    translator = getattr(_translators, 'en_ko', None)
+    if translator is None:
+        install()
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source='en', target='ko')
+        _translators.en_ko = translator
+    return translator
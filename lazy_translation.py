@@ -0,0 +1,104 @@
+"""
+지연 번역 모듈
+번역 없이 저장된 페이지를 처음 볼 때 번역하고,
+아이가 현재 페이지를 읽는 동안 다음 페이지들을 미리 번역해 둡니다.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import story_store
+
+# 현재 페이지 뒤로 미리 번역할 페이지 수
+PREFETCH_PAGES = int(os.getenv('TRANSLATION_PREFETCH_PAGES', '3'))
+PREFETCH_WORKERS = int(os.getenv('TRANSLATION_PREFETCH_WORKERS', '2'))
+
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='translation-prefetch')
+_inflight = {}  # (story_id, page_index) -> Future
+_lock = threading.Lock()
+
+
+def needs_translation(page):
+    """영어 텍스트는 있지만 아직 번역되지 않은 페이지인지 확인합니다."""
+    return bool(page.get('en')) and not page.get('ko')
+
+
+def _translate_page(story_id, page_index, en_text, json_file):
+    """페이지 하나를 번역하고 저장소에 기록합니다."""
+    from gemini_helper import translate_to_korean
+
+    ko_text = translate_to_korean(en_text)
+
+    def _apply(story):
+        pages = story.get('pages', [])
+        if page_index >= len(pages):
+            return False
+        page = pages[page_index]
+        # 번역하는 동안 영어 텍스트가 수정되었거나 이미 번역되었다면 덮어쓰지 않음
+        if page.get('en') != en_text or page.get('ko'):
+            return False
+        page['ko'] = ko_text
+
+    story_store.update_story(story_id, _apply, json_file)
+    return ko_text
+
+
+def schedule(story, page_index, json_file=story_store.STORIES_FILE):
+    """
+    페이지 번역 작업을 백그라운드에 등록합니다.
+
+    Returns:
+        Future: 번역 작업 또는 None (번역이 필요 없는 경우)
+    """
+    pages = story.get('pages', [])
+    if page_index < 0 or page_index >= len(pages):
+        return None
+    page = pages[page_index]
+    if not needs_translation(page):
+        return None
+
+    key = (story['id'], page_index)
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _executor.submit(_translate_page, story['id'], page_index, page['en'], json_file)
+            _inflight[key] = future
+            future.add_done_callback(lambda f, key=key: _forget(key))
+    return future
+
+
+def _forget(key):
+    with _lock:
+        _inflight.pop(key, None)
+
+
+def prefetch(story, page_index, lookahead=PREFETCH_PAGES, json_file=story_store.STORIES_FILE):
+    """현재 페이지와 다음 lookahead개 페이지를 미리 번역합니다."""
+    for index in range(page_index, page_index + lookahead + 1):
+        schedule(story, index, json_file)
+
+
+def get_translation(story, page_index, timeout=None, json_file=story_store.STORIES_FILE):
+    """
+    페이지의 한국어 번역을 반환합니다. 아직 없으면 번역이 끝날 때까지 기다립니다.
+
+    Args:
+        story (dict): 동화책 데이터
+        page_index (int): 페이지 번호 (0부터 시작)
+        timeout (float): 최대 대기 시간(초), None이면 끝까지 기다림
+
+    Returns:
+        str: 한국어 번역 (번역 실패 시 영어 원문)
+    """
+    page = story['pages'][page_index]
+    if not needs_translation(page):
+        return page.get('ko', '')
+
+    future = schedule(story, page_index, json_file)
+    if future is None:
+        return page.get('ko', '')
+
+    ko_text = future.result(timeout=timeout)
+    page['ko'] = ko_text
+    return ko_text
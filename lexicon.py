@@ -0,0 +1,199 @@
+"""
+오프라인 단어장 모듈
+data/kids_lexicon.tsv의 어린이 기초 단어를 메모리에 올려두고
+단어 뜻을 네트워크 없이 찾습니다. 단어장에 없는 단어만 번역기로 보냅니다.
+"""
+
+import os
+import threading
+import time
+
+LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'kids_lexicon.tsv')
+
+# 규칙으로 기본형을 만들 수 없는 불규칙 변화형
+IRREGULAR_FORMS = {
+    'ate': 'eat', 'became': 'become', 'began': 'begin', 'bit': 'bite', 'bought': 'buy',
+    'broke': 'break', 'brought': 'bring', 'built': 'build', 'came': 'come', 'caught': 'catch',
+    'children': 'child', 'chose': 'choose', 'did': 'do', 'drank': 'drink', 'drew': 'draw',
+    'drove': 'drive', 'dug': 'dig', 'fell': 'fall', 'felt': 'feel', 'feet': 'foot',
+    'flew': 'fly', 'forgot': 'forget', 'found': 'find', 'gave': 'give', 'geese': 'goose',
+    'got': 'get', 'grew': 'grow', 'had': 'have', 'heard': 'hear', 'held': 'hold',
+    'hid': 'hide', 'kept': 'keep', 'knew': 'know', 'leaves': 'leaf', 'lives': 'life',
+    'made': 'make', 'men': 'man', 'met': 'meet', 'mice': 'mouse', 'ran': 'run',
+    'rode': 'ride', 'sang': 'sing', 'sat': 'sit', 'saw': 'see', 'sent': 'send',
+    'shook': 'shake', 'shone': 'shine', 'slept': 'sleep', 'sold': 'sell', 'spoke': 'speak',
+    'stood': 'stand', 'swam': 'swim', 'taught': 'teach', 'teeth': 'tooth', 'thought': 'think',
+    'threw': 'throw', 'told': 'tell', 'took': 'take', 'understood': 'understand', 'went': 'go',
+    'wives': 'wife', 'wolves': 'wolf', 'women': 'woman', 'woke': 'wake', 'won': 'win',
+    'wore': 'wear', 'wrote': 'write',
+}
+
+# -s/-er로 끝나지만 변화형이 아닌 단어 (기본형으로 바꾸면 뜻이 달라짐)
+NOT_INFLECTED = {
+    'always', 'news', 'perhaps', 'series', 'species',
+    'corner', 'dinner', 'ever', 'never', 'over', 'sister', 'singer', 'summer', 'tower', 'under', 'water',
+}
+
+_lexicon = None
+_load_lock = threading.Lock()
+_network_cache = {}
+
+
+def _load():
+    """단어장을 한 번만 읽어 dict로 보관합니다."""
+    global _lexicon
+    if _lexicon is None:
+        with _load_lock:
+            if _lexicon is None:
+                lexicon = {}
+                try:
+                    with open(LEXICON_FILE, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            if not line.strip() or line.startswith('#'):
+                                continue
+                            word, _, meaning = line.rstrip('\n').partition('\t')
+                            if word and meaning:
+                                lexicon[word.strip().lower()] = meaning.strip()
+                except FileNotFoundError:
+                    print(f"단어장 파일을 찾을 수 없습니다: {LEXICON_FILE}")
+                _lexicon = lexicon
+    return _lexicon
+
+
+def _ends_cvc(stem):
+    """자음-모음-자음으로 끝나는지 확인합니다. (hop, car처럼 -e가 빠졌을 수 있는 어간, w/x/y 끝 제외)"""
+    vowels = 'aeiou'
+    return (len(stem) >= 3 and stem[-1] not in vowels + 'wxy'
+            and stem[-2] in vowels and stem[-3] not in vowels)
+
+
+def _base_forms(word):
+    """
+    단어의 기본형 후보를 가능성이 높은 순서로 돌려줍니다.
+
+    Returns:
+        generator of tuple: (기본형 후보, 규칙) - 규칙은 None(그대로/불규칙), 's', 'verb', 'comparative', 'ly'
+    """
+    if word in IRREGULAR_FORMS:
+        yield IRREGULAR_FORMS[word], None
+
+    if word.endswith('ies') and len(word) > 4:
+        yield word[:-3] + 'y', 's'         # puppies -> puppy
+    if word.endswith('es') and len(word) > 3:
+        yield word[:-2], 's'               # boxes -> box
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 3:
+        yield word[:-1], 's'               # cats -> cat
+
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            stem = word[:-len(suffix)]
+            if _ends_cvc(stem):
+                yield stem + 'e', 'verb'   # hoped -> hope (hop보다 먼저)
+                yield stem, 'verb'         # opened -> open
+            else:
+                yield stem, 'verb'         # jumped -> jump
+                yield stem + 'e', 'verb'   # baked -> bake
+            if len(stem) > 2 and stem[-1] == stem[-2]:
+                yield stem[:-1], 'verb'    # hopped -> hop
+            if suffix == 'ed' and stem.endswith('i'):
+                yield stem[:-1] + 'y', 'verb'  # cried -> cry
+
+    for suffix in ('er', 'est'):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            stem = word[:-len(suffix)]
+            yield stem, 'comparative'      # taller -> tall
+            yield stem + 'e', 'comparative'  # nicer -> nice
+            if len(stem) > 2 and stem[-1] == stem[-2]:
+                yield stem[:-1], 'comparative'  # bigger -> big
+            if stem.endswith('i'):
+                yield stem[:-1] + 'y', 'comparative'  # happier -> happy
+
+    if word.endswith('ly') and len(word) > 4:
+        yield word[:-2], 'ly'              # quickly -> quick
+
+
+def _is_adjective_meaning(meaning):
+    """
+    뜻이 형용사(관형형)인지 확인합니다. 단어장의 형용사 뜻은 '큰', '행복한'처럼 받침 ㄴ으로 끝납니다.
+    """
+    last = meaning.split(',')[0].strip()[-1:]
+    if not ('가' <= last <= '힣'):
+        return False
+    return (ord(last) - ord('가')) % 28 == 4  # 받침 ㄴ
+
+
+def _accepts(rule, meaning):
+    """규칙으로 만든 기본형의 뜻이 그 변화에 맞는지 확인합니다."""
+    if rule == 's':
+        # 형용사에는 -s가 붙지 않음 (news -> new 방지)
+        return not _is_adjective_meaning(meaning)
+    if rule == 'verb':
+        # -ed/-ing는 동사 뜻('~다')일 때만 받음 (cared -> car, stared -> star 방지)
+        return meaning.split(',')[0].strip().endswith('다')
+    if rule == 'comparative':
+        # -er/-est는 형용사 비교급으로만 봄 (singer -> sing, boxer -> box 방지)
+        return _is_adjective_meaning(meaning)
+    return True
+
+
+def lookup(word):
+    """
+    단어장에서 단어 뜻을 찾습니다.
+    단어 자체가 단어장에 있으면 그 뜻을 쓰고, 없을 때만 기본형으로 찾습니다.
+
+    Args:
+        word (str): 영어 단어 (변화형도 가능)
+
+    Returns:
+        str: 한국어 뜻 또는 None (단어장에 없는 경우)
+    """
+    lexicon = _load()
+    word = word.strip().strip('.,!?;:"\'').lower()
+    if word in lexicon:
+        return lexicon[word]
+    if word in NOT_INFLECTED:
+        return None
+    for candidate, rule in _base_forms(word):
+        meaning = lexicon.get(candidate)
+        if meaning and _accepts(rule, meaning):
+            return meaning
+    return None
+
+
+def translate_word(word):
+    """
+    단어 뜻을 단어장에서 먼저 찾고, 없을 때만 번역기를 사용합니다.
+
+    Returns:
+        str: 한국어 뜻 또는 None (번역 실패 시)
+    """
+    started = time.perf_counter()
+    meaning = lookup(word)
+    if meaning:
+        _record('lexicon', started, word, meaning, cache_hit=True)
+        return meaning
+
+    key = word.strip().lower()
+    if key in _network_cache:
+        _record('deep_translator', started, word, _network_cache[key], cache_hit=True)
+        return _network_cache[key]
+
+    try:
+        from http_client import get_translator
+        meaning = get_translator().translate(key)
+    except Exception as e:
+        print(f"번역 실패: {word} - {str(e)}")
+        _record('source', started, word, '', fallback_reason=f"deep_translator_error: {type(e).__name__}")
+        return None
+
+    _network_cache[key] = meaning
+    _record('deep_translator', started, word, meaning, fallback_reason='lexicon_miss')
+    return meaning
+
+
+def _record(backend, started, word, meaning, cache_hit=False, fallback_reason=None):
+    """단어 번역 결과를 기록합니다."""
+    import translation_metrics
+    latency_ms = (time.perf_counter() - started) * 1000
+    translation_metrics.record(backend, latency_ms, len(word), len(meaning or ''),
+                               cache_hit=cache_hit, fallback_reason=fallback_reason, operation='word')
@@ -0,0 +1,247 @@
+"""
+LLM 백엔드 모듈
+gemini_helper가 사용하는 모델 호출을 백엔드 하나로 감쌉니다.
+실제 Gemini 대신 기록해 둔 응답을 재생하는 가짜 백엔드를 쓰면
+API 할당량을 쓰지 않고도 번역/퀴즈/핵심 단어 경로와 대체(fallback) 동작을 측정할 수 있습니다.
+
+설정 (.env):
+    LLM_BACKEND=gemini          # gemini 또는 fake
+    FAKE_LLM_FIXTURES=fixtures/llm_responses.json
+    FAKE_LLM_LATENCY_MS=300     # 호출마다 기다릴 시간
+    FAKE_LLM_JITTER_MS=100      # 지연 시간의 무작위 변동 폭
+    FAKE_LLM_ERROR_RATE=0.0     # 오류를 낼 확률 (0-1)
+    FAKE_LLM_QUOTA=0            # 이 횟수만큼 호출하면 할당량 초과 (0이면 무제한)
+    FAKE_LLM_HANG_RATE=0.0      # 요청 시간 제한도 무시하고 멈출 확률 (0-1, 감시 시간 확인용)
+    FAKE_LLM_HANG_MS=30000      # 멈춘 호출이 기다리는 시간
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_MODEL_NAME = 'gemini-2.5-flash-lite'
+
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini').lower()
+FAKE_LLM_FIXTURES = os.getenv('FAKE_LLM_FIXTURES', os.path.join('fixtures', 'llm_responses.json'))
+FAKE_LLM_LATENCY_MS = float(os.getenv('FAKE_LLM_LATENCY_MS', '300'))
+FAKE_LLM_JITTER_MS = float(os.getenv('FAKE_LLM_JITTER_MS', '100'))
+FAKE_LLM_ERROR_RATE = float(os.getenv('FAKE_LLM_ERROR_RATE', '0'))
+FAKE_LLM_QUOTA = int(os.getenv('FAKE_LLM_QUOTA', '0'))
+FAKE_LLM_HANG_RATE = float(os.getenv('FAKE_LLM_HANG_RATE', '0'))
+FAKE_LLM_HANG_MS = float(os.getenv('FAKE_LLM_HANG_MS', '30000'))
+# 1이면 실제 Gemini 응답을 FAKE_LLM_FIXTURES 파일에 추가로 기록
+LLM_RECORD_FIXTURES = os.getenv('LLM_RECORD_FIXTURES', '0') == '1'
+
+
+class BackendError(Exception):
+    """백엔드 호출 실패"""
+
+
+class QuotaExhaustedError(BackendError):
+    """할당량 초과 (Gemini의 429 ResourceExhausted에 해당)"""
+
+
+class DeadlineExceeded(BackendError):
+    """시간 제한 안에 응답을 받지 못함"""
+
+
+class ModelBackend:
+    """
+    모델 백엔드 인터페이스
+    generate()는 응답 문자열을 반환하고, 실패하면 예외를 던집니다.
+    """
+
+    name = 'base'
+
+    def generate(self, prompt, schema=None, operation='generic', timeout=None):
+        """
+        프롬프트를 보내고 응답 문자열을 받습니다.
+
+        Args:
+            prompt (str): 프롬프트
+            schema (dict): JSON 응답 스키마 (None이면 일반 텍스트)
+            operation (str): 호출 종류 ('translate', 'quiz', 'vocabulary_chunk' 등)
+            timeout (float): 요청 시간 제한 (초, None이면 제한 없음)
+
+        Returns:
+            str: 응답 문자열
+        """
+        raise NotImplementedError
+
+
+class GeminiBackend(ModelBackend):
+    """google.generativeai를 사용하는 실제 Gemini 백엔드"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key=GEMINI_API_KEY, model_name=GEMINI_MODEL_NAME):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        # google.generativeai는 가져오는 데 오래 걸리므로 처음 호출할 때 불러옴
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def generate(self, prompt, schema=None, operation='generic', timeout=None):
+        generation_config = None
+        if schema is not None:
+            generation_config = {
+                'response_mime_type': 'application/json',
+                'response_schema': schema,
+            }
+        # 전송 단계에서 시간 제한을 걸어 멈춘 요청도 이 시간이 지나면 스레드가 풀려남
+        request_options = {'timeout': timeout} if timeout else None
+        from google.api_core import exceptions as google_exceptions
+        try:
+            response = self._get_model().generate_content(
+                prompt,
+                generation_config=generation_config,
+                request_options=request_options,
+            )
+        except google_exceptions.DeadlineExceeded as e:
+            raise DeadlineExceeded(str(e)) from e
+        text = response.text.strip()
+        if LLM_RECORD_FIXTURES:
+            record_fixture(operation, text)
+        return text
+
+
+class FakeBackend(ModelBackend):
+    """
+    기록해 둔 응답을 재생하는 가짜 백엔드
+    호출 종류(operation)별 응답을 순서대로 돌려주며, 지연 시간/오류율/할당량 초과를 흉내냅니다.
+    """
+
+    name = 'fake'
+
+    def __init__(self, fixtures_file=FAKE_LLM_FIXTURES, latency_ms=FAKE_LLM_LATENCY_MS,
+                 jitter_ms=FAKE_LLM_JITTER_MS, error_rate=FAKE_LLM_ERROR_RATE,
+                 quota=FAKE_LLM_QUOTA, hang_rate=FAKE_LLM_HANG_RATE,
+                 hang_ms=FAKE_LLM_HANG_MS, seed=None):
+        self.fixtures = _load_fixtures(fixtures_file)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota = quota
+        self.hang_rate = hang_rate
+        self.hang_ms = hang_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._positions = {}
+        self.calls = 0
+        self.errors = 0
+
+    def _next_response(self, operation):
+        responses = self.fixtures.get(operation) or self.fixtures.get('default')
+        if not responses:
+            raise BackendError(f"'{operation}'에 해당하는 기록된 응답이 없습니다.")
+        with self._lock:
+            position = self._positions.get(operation, 0)
+            self._positions[operation] = position + 1
+        response = responses[position % len(responses)]
+        # 기록 파일에는 JSON 응답을 객체로 적어도 됨
+        return response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+
+    def generate(self, prompt, schema=None, operation='generic', timeout=None):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+            delay_ms = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+            hung = self._random.random() < self.hang_rate
+            fail = self._random.random() < self.error_rate
+
+        if self.quota and call_number > self.quota:
+            with self._lock:
+                self.errors += 1
+            raise QuotaExhaustedError("429 Resource has been exhausted (fake quota)")
+
+        if hung:
+            # 연결이 멈춘 경우: 요청 시간 제한도 지키지 않음 (gemini_helper의 감시 시간으로만 끊김)
+            time.sleep(self.hang_ms / 1000)
+            with self._lock:
+                self.errors += 1
+            raise DeadlineExceeded("connection stalled (fake)")
+
+        # 실제 요청처럼 시간 제한이 있으면 그 시간까지만 기다림
+        if timeout and delay_ms / 1000 > timeout:
+            time.sleep(timeout)
+            with self._lock:
+                self.errors += 1
+            raise DeadlineExceeded("504 Deadline Exceeded (fake)")
+        time.sleep(delay_ms / 1000)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise BackendError("500 Internal error (fake)")
+        return self._next_response(operation)
+
+
+def _load_fixtures(fixtures_file):
+    """기록 파일을 읽습니다. 형식: {operation: [응답, ...]}"""
+    try:
+        with open(fixtures_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"가짜 LLM 응답 파일이 없습니다: {fixtures_file}")
+        return {}
+
+
+_record_lock = threading.Lock()
+
+
+def record_fixture(operation, text, fixtures_file=FAKE_LLM_FIXTURES):
+    """실제 응답을 기록 파일에 추가합니다. (같은 응답은 한 번만)"""
+    with _record_lock:
+        fixtures = _load_fixtures(fixtures_file)
+        responses = fixtures.setdefault(operation, [])
+        if text in responses:
+            return
+        responses.append(text)
+        os.makedirs(os.path.dirname(fixtures_file) or '.', exist_ok=True)
+        temp_path = f"{fixtures_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(fixtures, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, fixtures_file)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    설정된 백엔드를 반환합니다.
+
+    Returns:
+        ModelBackend: 백엔드 또는 None (Gemini를 쓰는데 API 키가 없는 경우)
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if LLM_BACKEND == 'fake':
+                    _backend = FakeBackend()
+                elif GEMINI_API_KEY:
+                    _backend = GeminiBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """사용할 백엔드를 직접 지정합니다. (벤치마크용, None이면 설정값으로 다시 만듦)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
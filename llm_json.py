@@ -0,0 +1,155 @@
+"""
+LLM JSON 응답 파서 모듈
+Gemini가 돌려준 JSON 문자열을 읽고, 형식이 조금 깨졌으면 고쳐서 읽습니다.
+끝까지 읽을 수 없으면 완전한 항목만이라도 건져냅니다.
+"""
+
+import json
+import re
+
+_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$', re.IGNORECASE)
+# 문자열은 그대로 두고 문자열 밖의 닫는 괄호 앞 쉼표만 찾음
+_TRAILING_COMMA_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")|,\s*([\]}])')
+
+
+def _strip_fences(text):
+    """```json ... ``` 코드 블록 표시를 제거합니다."""
+    return _FENCE_PATTERN.sub('', text.strip()).strip()
+
+
+def _remove_trailing_commas(text):
+    """닫는 괄호 바로 앞의 쉼표를 지웁니다. (문자열 안의 쉼표는 그대로 둠)"""
+    return _TRAILING_COMMA_PATTERN.sub(lambda m: m.group(1) or m.group(2), text)
+
+
+def _scan(text):
+    """열린 괄호 스택, 문자열 안에서 끝났는지 여부, 마지막 안전한 자르기 위치를 구합니다."""
+    stack = []
+    in_string = False
+    escaped = False
+    last_safe = 0
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            last_safe = i + 1
+        elif ch == ',':
+            last_safe = i
+    return stack, in_string, last_safe
+
+
+def _close_truncated(text):
+    """
+    응답이 중간에 잘린 경우 열린 문자열과 괄호를 닫아 줍니다.
+    그대로 닫아서 읽을 수 없으면 마지막 완전한 값 뒤에서 자르고 닫습니다.
+
+    Returns:
+        list of str: 시도해 볼 후보 문자열
+    """
+    stack, in_string, last_safe = _scan(text)
+    if not stack and not in_string:
+        return [text]
+
+    candidates = []
+    if not in_string:
+        candidates.append(text.rstrip().rstrip(',') + ''.join(reversed(stack)))
+
+    trimmed = text[:last_safe].rstrip().rstrip(',')
+    stack, _, _ = _scan(trimmed)
+    candidates.append(trimmed + ''.join(reversed(stack)))
+    return candidates
+
+
+def parse_json(text):
+    """
+    JSON 응답을 읽습니다. 실패하면 흔한 형식 오류를 고쳐 다시 시도합니다.
+
+    Args:
+        text (str): 모델 응답 문자열
+
+    Returns:
+        dict | list: 읽은 값 또는 None (고칠 수 없는 경우)
+    """
+    if not text:
+        return None
+
+    candidate = _strip_fences(text)
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        pass
+
+    # 앞뒤 설명 문장 제거: 첫 { 또는 [ 부터 사용
+    starts = [i for i in (candidate.find('{'), candidate.find('[')) if i >= 0]
+    if not starts:
+        return None
+    candidate = candidate[min(starts):]
+
+    repairs = [candidate, _remove_trailing_commas(candidate)]
+    repairs.extend(_remove_trailing_commas(t) for t in _close_truncated(candidate))
+    for repaired in repairs:
+        try:
+            return json.loads(repaired)
+        except ValueError:
+            continue
+
+    # 첫 번째 완전한 값만 사용 (뒤에 다른 값이나 설명이 붙은 경우)
+    try:
+        return json.JSONDecoder().raw_decode(_remove_trailing_commas(candidate))[0]
+    except ValueError:
+        pass
+
+    # 마지막 } 또는 ] 뒤의 군더더기 제거
+    end = max(candidate.rfind('}'), candidate.rfind(']'))
+    if end > 0:
+        try:
+            return json.loads(_remove_trailing_commas(candidate[:end + 1]))
+        except ValueError:
+            pass
+    return None
+
+
+def extract_objects(text, required_keys):
+    """
+    JSON 전체를 읽을 수 없을 때, 필요한 키를 모두 가진 평평한 객체만 골라냅니다.
+
+    Args:
+        text (str): 모델 응답 문자열
+        required_keys (iterable): 객체에 반드시 있어야 하는 키
+
+    Returns:
+        list of dict: 읽을 수 있었던 객체 목록
+    """
+    objects = []
+    for match in re.finditer(r'\{[^{}\[\]]*\}', text or ''):
+        try:
+            obj = json.loads(_remove_trailing_commas(match.group(0)))
+        except ValueError:
+            continue
+        if isinstance(obj, dict) and all(key in obj for key in required_keys):
+            objects.append(obj)
+    return objects
+
+
+def extract_string_field(text, key):
+    """JSON 전체를 읽을 수 없을 때 문자열 필드 하나를 찾아냅니다."""
+    match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(key), text or '')
+    if not match:
+        return ''
+    try:
+        return json.loads(f'"{match.group(1)}"')
+    except ValueError:
+        return match.group(1)
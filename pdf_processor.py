@@ -8,12 +8,13 @@ import base64
 from io import BytesIO
 from PIL import Image
 import uuid
-import json
+import story_store
+import tracing
 try:
     from gemini_helper import translate_to_korean as gemini_translate
     USE_GEMINI = True
 except:
-    from deep_translator import GoogleTranslator
+    from http_client import get_translator
     USE_GEMINI = False
 
 
@@ -23,17 +24,18 @@ class PDFProcessor:
     def __init__(self, json_file='stories.json'):
         self.json_file = json_file
         if not USE_GEMINI:
-            self.translator = GoogleTranslator(source='en', target='ko')
+            self.translator = get_translator()
         else:
             self.translator = None
 
-    def process_pdf(self, pdf_file, title=None):
+    def process_pdf(self, pdf_file, title=None, lazy_translation=False):
         """
         PDF 파일에서 동화책 데이터를 추출합니다.
 
         Args:
             pdf_file: 업로드된 PDF 파일 객체
             title: 동화책 제목 (없으면 자동 생성)
+            lazy_translation: True면 번역하지 않고 저장 (읽을 때 번역)
 
         Returns:
             dict: 동화책 데이터 또는 {'error': 에러메시지} (실패 시)
@@ -54,8 +56,6 @@ class PDFProcessor:
 
             # 각 페이지 처리
             for page_num in range(len(pdf_document)):
-                print(f"\n페이지 {page_num + 1}/{len(pdf_document)} 처리 중...")
-
                 page = pdf_document[page_num]
 
                 # 텍스트 추출 (여러 방법 시도)
@@ -76,7 +76,7 @@ class PDFProcessor:
 
                 # 빈 페이지 건너뛰기
                 if not text or len(text) < 3:
-                    print(f"  - 빈 페이지, 건너뜀")
+                    tracing.event('ingest.page.skipped', level=tracing.DEBUG, page=page_num + 1, reason='empty')
                     continue
 
                 # 텍스트 정리 (불필요한 줄바꿈 제거)
@@ -91,24 +91,24 @@ class PDFProcessor:
 
                 # 빈 텍스트가 되면 건너뛰기
                 if not text or len(text) < 3:
-                    print(f"  - 페이지 번호만 있음, 건너뜀")
+                    tracing.event('ingest.page.skipped', level=tracing.DEBUG, page=page_num + 1, reason='page_number_only')
                     continue
 
                 # 너무 긴 텍스트는 자르기 (동화책이므로 한 페이지당 적당한 길이)
                 if len(text) > 500:
                     text = text[:500] + '...'
 
-                try:
-                    print(f"  - 텍스트: {text[:50]}...")
-                except UnicodeEncodeError:
-                    print(f"  - 텍스트 추출됨 (인코딩 문제로 표시 불가)")
-
                 # 이미지 추출
-                image_data_url = self._extract_page_image(page, page_num)
+                with tracing.span('ingest.page.render', page=page_num + 1) as span:
+                    image_data_url = self._extract_page_image(page, page_num)
+                    span.set(image_chars=len(image_data_url))
 
-                # 한국어 번역
-                print(f"  - 번역 중...")
-                ko_text = self._translate_to_korean(text)
+                # 한국어 번역 (지연 번역 모드면 읽을 때 번역)
+                if lazy_translation:
+                    ko_text = ''
+                else:
+                    with tracing.span('ingest.page.translate', page=page_num + 1, chars=len(text)):
+                        ko_text = self._translate_to_korean(text)
 
                 page_data = {
                     'image_url': image_data_url,
@@ -180,54 +180,46 @@ class PDFProcessor:
             img_base64 = base64.b64encode(buffered.getvalue()).decode()
 
             # data URL 생성
-            data_url = f"data:image/png;base64,{img_base64}"
-
-            print(f"  - 이미지 추출 완료 (크기: {len(img_base64)} bytes)")
-            return data_url
+            return f"data:image/png;base64,{img_base64}"
 
         except Exception as e:
-            print(f"  - 이미지 추출 오류: {str(e)}")
+            print(f"이미지 추출 오류 (페이지 {page_num + 1}): {str(e)}")
             return ""
 
     def _translate_to_korean(self, text):
         """영어 텍스트를 한국어로 번역합니다."""
+        if USE_GEMINI:
+            # Gemini API 사용 (기록은 gemini_helper에서 처리)
+            return gemini_translate(text)
+
+        import time
+        import translation_metrics
+        started = time.perf_counter()
         try:
-            if USE_GEMINI:
-                # Gemini API 사용
-                return gemini_translate(text)
+            # Deep Translator 사용
+            if len(text) > 500:
+                sentences = text.split('. ')
+                translated = []
+                for sentence in sentences:
+                    if sentence.strip():
+                        result = self.translator.translate(sentence)
+                        translated.append(result)
+                result = '. '.join(translated)
             else:
-                # Deep Translator 사용
-                if len(text) > 500:
-                    sentences = text.split('. ')
-                    translated = []
-                    for sentence in sentences:
-                        if sentence.strip():
-                            result = self.translator.translate(sentence)
-                            translated.append(result)
-                    return '. '.join(translated)
-                else:
-                    result = self.translator.translate(text)
-                    return result
+                result = self.translator.translate(text)
+            translation_metrics.record('deep_translator', (time.perf_counter() - started) * 1000,
+                                       len(text), len(result or ''), fallback_reason='gemini_unavailable')
+            return result
         except Exception as e:
-            print(f"  - 번역 오류: {str(e)}")
+            print(f"번역 오류: {str(e)}")
+            translation_metrics.record('source', (time.perf_counter() - started) * 1000, len(text), len(text),
+                                       fallback_reason=f"deep_translator_error: {type(e).__name__}")
             return text
 
     def save_story(self, story_data):
         """동화책을 JSON 파일에 저장합니다."""
         try:
-            # 기존 데이터 로드
-            try:
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    stories = json.load(f)
-            except FileNotFoundError:
-                stories = []
-
-            # 새 동화책 추가
-            stories.append(story_data)
-
-            # 파일에 저장
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(stories, f, ensure_ascii=False, indent=2)
+            story_store.add_story(story_data, self.json_file)
 
             print(f"'{story_data['title']}' 저장 완료!")
             return True
@@ -0,0 +1,286 @@
+"""
+로컬 발음 평가 모듈
+목표 문장과 음성 인식 결과를 단어 단위로 정렬(편집 거리)하고,
+철자가 달라도 소리가 같은 단어(Metaphone 코드와 첫 모음 글자가 같은 단어)는 맞은 것으로 봅니다.
+Metaphone은 모음을 버리므로 cat/cut처럼 모음만 다른 단어는 비슷하게 말한 것('바뀜')으로 봅니다.
+단어마다 맞음/빠짐/바뀜을 표시하고 점수와 피드백을 몇 밀리초 안에 돌려줍니다.
+"""
+
+import random
+import re
+from difflib import SequenceMatcher
+
+# 단어별 점수
+CREDIT_EXACT = 1.0
+CREDIT_PHONETIC = 0.9   # 소리는 같은데 철자가 다른 경우 (there/their, meet/meat)
+CREDIT_CLOSE = 0.5      # 비슷하게 말한 경우 (최대값, 글자 유사도를 곱함)
+EXTRA_WORD_PENALTY = 0.05
+
+CLOSE_SIMILARITY = 0.6  # 이 이상 비슷하면 '바뀜'으로 정렬, 아니면 빠짐+추가로 처리
+
+FEEDBACK_TEMPLATES = {
+    'great': [
+        "참 잘했어요! 완벽해요!",
+        "와, 원어민 같아요! 최고예요!",
+        "정확하게 읽었어요! 정말 멋져요!",
+    ],
+    'good': [
+        "좋아요! 조금만 더 연습해봐요!",
+        "거의 다 맞았어요! 한 번 더 해볼까요?",
+        "잘하고 있어요! 조금만 더 또박또박 말해봐요!",
+    ],
+    'retry': [
+        "다시 한 번 해볼까요? 천천히 따라해봐요!",
+        "괜찮아요! 먼저 듣고 천천히 따라 말해봐요!",
+        "한 단어씩 천천히 말해보면 더 잘할 수 있어요!",
+    ],
+}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    """소문자 단어 목록으로 나눕니다. (문장 부호 제거)"""
+    return [w.strip("'") for w in _WORD_PATTERN.findall((text or '').lower()) if w.strip("'")]
+
+
+def metaphone(word):
+    """
+    영어 단어의 Metaphone 발음 코드를 계산합니다. (원래 Metaphone 규칙을 간단히 구현)
+
+    Args:
+        word (str): 영어 단어
+
+    Returns:
+        str: 발음 코드 (예: 'knight' -> 'NT', 'night' -> 'NT', 'phone' -> 'FN')
+    """
+    word = re.sub(r'[^a-z]', '', word.lower())
+    if not word:
+        return ''
+
+    # 첫 글자 예외
+    if word[:2] in ('kn', 'gn', 'pn', 'ae', 'wr'):
+        word = word[1:]
+    elif word[0] == 'x':
+        word = 's' + word[1:]
+    elif word[:2] == 'wh':
+        word = 'w' + word[2:]
+
+    vowels = 'aeiou'
+    code = []
+    length = len(word)
+
+    def at(i):
+        return word[i] if 0 <= i < length else ''
+
+    i = 0
+    while i < length:
+        ch = word[i]
+        # 같은 글자가 이어지면 한 번만 (c는 예외)
+        if ch == at(i - 1) and ch != 'c':
+            i += 1
+            continue
+
+        if ch in vowels:
+            if i == 0:
+                code.append(ch.upper())
+        elif ch == 'b':
+            if not (i == length - 1 and at(i - 1) == 'm'):
+                code.append('B')
+        elif ch == 'c':
+            if at(i + 1) == 'i' and at(i + 2) == 'a':
+                code.append('X')
+            elif at(i + 1) == 'h':
+                code.append('K' if at(i - 1) == 's' else 'X')
+                i += 1
+            elif at(i + 1) in ('i', 'e', 'y'):
+                if at(i - 1) != 's':
+                    code.append('S')
+            else:
+                code.append('K')
+        elif ch == 'd':
+            if at(i + 1) == 'g' and at(i + 2) in ('e', 'i', 'y'):
+                code.append('J')
+                i += 1
+            else:
+                code.append('T')
+        elif ch == 'g':
+            if at(i + 1) == 'h' and i + 2 < length and at(i + 2) not in vowels:
+                pass  # night, light
+            elif at(i + 1) == 'h' and i + 2 >= length:
+                pass  # high
+            elif at(i + 1) == 'n' and (i + 2 == length or word[i + 2:] == 'ed'):
+                pass  # sign, signed
+            elif at(i + 1) in ('i', 'e', 'y') and at(i - 1) != 'g':
+                code.append('J')
+            else:
+                code.append('K')
+        elif ch == 'h':
+            if at(i + 1) in vowels and at(i - 1) not in 'csptg':
+                code.append('H')
+        elif ch == 'k':
+            if at(i - 1) != 'c':
+                code.append('K')
+        elif ch == 'p':
+            if at(i + 1) == 'h':
+                code.append('F')
+                i += 1
+            else:
+                code.append('P')
+        elif ch == 'q':
+            code.append('K')
+        elif ch == 's':
+            if at(i + 1) == 'h':
+                code.append('X')
+                i += 1
+            elif at(i + 1) == 'i' and at(i + 2) in ('o', 'a'):
+                code.append('X')
+            else:
+                code.append('S')
+        elif ch == 't':
+            if at(i + 1) == 'i' and at(i + 2) in ('o', 'a'):
+                code.append('X')
+            elif at(i + 1) == 'h':
+                code.append('0')  # th
+                i += 1
+            elif not (at(i + 1) == 'c' and at(i + 2) == 'h'):
+                code.append('T')
+        elif ch == 'v':
+            code.append('F')
+        elif ch in ('w', 'y'):
+            if at(i + 1) in vowels:
+                code.append(ch.upper())
+        elif ch == 'x':
+            code.append('KS')
+        elif ch == 'z':
+            code.append('S')
+        else:
+            code.append(ch.upper())  # f, j, l, m, n, r
+        i += 1
+
+    return ''.join(code)
+
+
+def _first_vowel(word):
+    """첫 모음 글자를 반환합니다. (단어 첫 글자가 아닌 y는 모음으로 봄, 없으면 '')"""
+    for i, char in enumerate(word):
+        if char in 'aeiou' or (char == 'y' and i > 0):
+            return char
+    return ''
+
+
+def _compare(target, heard):
+    """
+    단어 두 개를 비교해 (정렬 비용, 점수, 상태)를 반환합니다.
+    상태: 'correct' (맞음) 또는 'substituted' (바뀜)
+    전혀 다른 단어는 비용을 크게 두어 빠짐+추가로 정렬되도록 합니다.
+    """
+    if target == heard:
+        return 0.0, CREDIT_EXACT, 'correct'
+    if metaphone(target) and metaphone(target) == metaphone(heard) and _first_vowel(target) == _first_vowel(heard):
+        return 0.1, CREDIT_PHONETIC, 'correct'
+    similarity = SequenceMatcher(None, target, heard).ratio()
+    if similarity >= CLOSE_SIMILARITY:
+        return 1.0 - similarity * 0.5, CREDIT_CLOSE * similarity, 'substituted'
+    return 1.5, 0.0, 'substituted'
+
+
+def align(target_words, heard_words):
+    """
+    목표 단어와 들린 단어를 편집 거리로 정렬합니다.
+
+    Returns:
+        list of dict: [{'word': 목표 단어 또는 None, 'heard': 들린 단어 또는 None,
+                        'status': 'correct'|'substituted'|'missed'|'extra', 'credit': float}]
+    """
+    n, m = len(target_words), len(heard_words)
+    compare_cache = {}
+
+    def compare(i, j):
+        key = (i, j)
+        if key not in compare_cache:
+            compare_cache[key] = _compare(target_words[i], heard_words[j])
+        return compare_cache[key]
+
+    # cost[i][j]: 목표 i개와 들린 단어 j개를 정렬하는 최소 비용
+    cost = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        cost[i][0] = float(i)
+    for j in range(1, m + 1):
+        cost[0][j] = float(j)
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost[i][j] = min(
+                cost[i - 1][j] + 1.0,                              # 빠짐
+                cost[i][j - 1] + 1.0,                              # 추가로 말함
+                cost[i - 1][j - 1] + compare(i - 1, j - 1)[0],     # 맞음/바뀜
+            )
+
+    # 역추적
+    marks = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and cost[i][j] == cost[i - 1][j - 1] + compare(i - 1, j - 1)[0]:
+            _, credit, status = compare(i - 1, j - 1)
+            marks.append({'word': target_words[i - 1], 'heard': heard_words[j - 1], 'status': status, 'credit': credit})
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + 1.0:
+            marks.append({'word': target_words[i - 1], 'heard': None, 'status': 'missed', 'credit': 0.0})
+            i -= 1
+        else:
+            marks.append({'word': None, 'heard': heard_words[j - 1], 'status': 'extra', 'credit': 0.0})
+            j -= 1
+    marks.reverse()
+    return marks
+
+
+def _feedback(score, marks):
+    """점수 구간별 템플릿에서 피드백을 고르고, 다시 연습할 단어를 덧붙입니다."""
+    if score >= 0.7:
+        band = 'great'
+    elif score >= 0.5:
+        band = 'good'
+    else:
+        band = 'retry'
+    feedback = random.choice(FEEDBACK_TEMPLATES[band])
+
+    practice = [mark['word'] for mark in marks if mark['status'] in ('missed', 'substituted') and mark['word']]
+    if practice and band != 'great':
+        words = ", ".join(f"'{word}'" for word in practice[:3])
+        feedback += f" {words} 단어를 한 번 더 연습해봐요!"
+    return feedback
+
+
+def score_pronunciation(original_text, spoken_text):
+    """
+    목표 문장과 말한 문장을 비교해 발음을 평가합니다.
+
+    Args:
+        original_text (str): 원본 영어 문장
+        spoken_text (str): 사용자가 말한 텍스트 (STT 결과)
+
+    Returns:
+        dict: {
+            'score': float (0-1),
+            'feedback': str,
+            'is_good': bool,
+            'words': list of dict  # 단어별 정렬 결과 (align 참고)
+        }
+    """
+    target_words = tokenize(original_text)
+    heard_words = tokenize(spoken_text)
+
+    if not target_words:
+        return {'score': 0.0, 'feedback': FEEDBACK_TEMPLATES['retry'][0], 'is_good': False, 'words': []}
+
+    marks = align(target_words, heard_words)
+    credit = sum(mark['credit'] for mark in marks if mark['word'])
+    extras = sum(1 for mark in marks if mark['status'] == 'extra')
+    score = max(0.0, min(1.0, credit / len(target_words) - EXTRA_WORD_PENALTY * extras))
+
+    return {
+        'score': score,
+        'feedback': _feedback(score, marks),
+        'is_good': score >= 0.7,
+        'words': marks
+    }
@@ -0,0 +1,178 @@
+"""
+퀴즈 풀 모듈
+동화책별로 미리 만들어 둔 단어 퀴즈를 큐에서 하나씩 꺼내 줍니다.
+남은 문제가 기준(low-water mark) 아래로 내려가면 백그라운드에서 한 번에 여러 문제를 보충하므로
+다음 문제는 바로 나오고, Gemini 호출 비용은 수십 문제에 나눠집니다.
+"""
+
+import json
+import os
+import threading
+
+import story_store
+
+QUIZ_POOL_FILE = os.getenv('QUIZ_POOL_FILE', 'quiz_pool.json')
+QUIZ_POOL_BATCH_SIZE = int(os.getenv('QUIZ_POOL_BATCH_SIZE', '20'))
+QUIZ_POOL_LOW_WATER = int(os.getenv('QUIZ_POOL_LOW_WATER', '5'))
+
+_pools = None  # story_id -> {'key': str, 'questions': list}
+_lock = threading.RLock()
+_refilling = {}  # 보충 중인 story_id -> 끝나면 set되는 threading.Event
+
+
+def _pool_key(story):
+    """본문이 바뀌면 기존 문제를 버리도록 본문 해시를 키로 사용합니다."""
+    import vocabulary_store
+    return vocabulary_store.content_hash(story)
+
+
+def _load():
+    global _pools
+    if _pools is None:
+        try:
+            with open(QUIZ_POOL_FILE, 'r', encoding='utf-8') as f:
+                _pools = json.load(f)
+        except FileNotFoundError:
+            _pools = {}
+        except Exception as e:
+            print(f"퀴즈 풀 읽기 오류: {str(e)}")
+            _pools = {}
+    return _pools
+
+
+def _save():
+    temp_path = f"{QUIZ_POOL_FILE}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(_pools, f, ensure_ascii=False)
+    os.replace(temp_path, QUIZ_POOL_FILE)
+
+
+def _get_pool(story):
+    """동화책의 퀴즈 풀을 반환합니다. 본문이 바뀌었으면 비웁니다. (_lock 안에서 호출)"""
+    pools = _load()
+    key = _pool_key(story)
+    pool = pools.get(story['id'])
+    if pool is None or pool.get('key') != key:
+        pool = {'key': key, 'questions': []}
+        pools[story['id']] = pool
+    return pool
+
+
+def size(story):
+    """남은 문제 수를 반환합니다."""
+    with _lock:
+        return len(_get_pool(story)['questions'])
+
+
+def refill(story, count=QUIZ_POOL_BATCH_SIZE):
+    """
+    퀴즈를 한 번에 count개 만들어 풀에 추가하고 파일에 저장합니다.
+    만드는 동안 본문이 바뀌었으면(풀의 키가 다르면) 버립니다.
+
+    Returns:
+        int: 추가된 문제 수
+    """
+    from gemini_helper import generate_vocabulary_quiz_batch
+
+    key = _pool_key(story)
+    quizzes = generate_vocabulary_quiz_batch(story, count)
+    if not quizzes:
+        return 0
+
+    with _lock:
+        pools = _load()
+        pool = pools.get(story['id'])
+        if pool is None:
+            pool = pools[story['id']] = {'key': key, 'questions': []}
+        elif pool.get('key') != key:
+            return 0
+        pool['questions'].extend(quizzes)
+        # 꺼낸 문제도 여기서 함께 저장됨 (문제를 꺼낼 때마다 파일을 다시 쓰지 않음)
+        _save()
+    return len(quizzes)
+
+
+def _claim_refill(story_id):
+    """
+    보충 작업을 맡습니다. (_lock 안에서 호출)
+
+    Returns:
+        tuple: (Event, 새로 맡았는지 여부) - 이미 보충 중이면 그 작업의 Event와 False
+    """
+    done = _refilling.get(story_id)
+    if done is not None:
+        return done, False
+    done = _refilling[story_id] = threading.Event()
+    return done, True
+
+
+def _run_refill(story, done):
+    """보충을 실행하고 기다리는 쪽에 끝났음을 알립니다."""
+    try:
+        return refill(story)
+    finally:
+        with _lock:
+            _refilling.pop(story['id'], None)
+        done.set()
+
+
+def refill_async(story):
+    """백그라운드에서 풀을 보충합니다. 이미 보충 중이면 아무것도 하지 않습니다."""
+    with _lock:
+        done, claimed = _claim_refill(story['id'])
+    if not claimed:
+        return
+
+    def _run():
+        try:
+            _run_refill(story, done)
+        except Exception as e:
+            print(f"퀴즈 풀 보충 오류: {str(e)}")
+
+    threading.Thread(target=_run, name='quiz-pool-refill', daemon=True).start()
+
+
+def _pop(story):
+    """풀에서 문제 하나를 꺼냅니다. (_lock 안에서 호출)"""
+    questions = _get_pool(story)['questions']
+    return (questions.pop(0) if questions else None), len(questions)
+
+
+def next_question(story):
+    """
+    풀에서 다음 문제를 꺼냅니다.
+    풀이 비어 있으면 한 묶음을 만들어(이미 보충 중이면 그 작업을 기다려) 꺼내고,
+    기준 아래로 내려가면 백그라운드에서 보충합니다.
+
+    Returns:
+        dict: 퀴즈 ({'question', 'options', 'correct'}) 또는 None (만들 수 없는 경우)
+    """
+    with _lock:
+        quiz, remaining = _pop(story)
+        if quiz is None:
+            done, claimed = _claim_refill(story['id'])
+
+    if quiz is None:
+        if claimed:
+            _run_refill(story, done)
+        else:
+            done.wait()
+        with _lock:
+            quiz, remaining = _pop(story)
+        if quiz is None:
+            return None
+
+    if remaining < QUIZ_POOL_LOW_WATER:
+        refill_async(story)
+    return quiz
+
+
+def prefill(story_id, json_file=story_store.STORIES_FILE):
+    """동화책 준비 작업에서 풀이 기준보다 적으면 미리 채웁니다."""
+    story = story_store.get_story(story_id, json_file)
+    if story is None or size(story) >= QUIZ_POOL_LOW_WATER:
+        return
+    with _lock:
+        done, claimed = _claim_refill(story['id'])
+    if claimed:
+        _run_refill(story, done)
@@ -0,0 +1,191 @@
+"""
+말하기 녹음/인식 모듈
+마이크 녹음과 음성 인식을 백그라운드 스레드에서 실행하고, 진행 상태는 콜백으로 알려 줍니다.
+(Streamlit 스크립트는 녹음 중에도 멈추지 않고 상태만 표시)
+
+녹음은 소리 크기(에너지) 기반 음성 구간 검출(VAD)로 합니다.
+- 주변 소음 크기는 세션마다 처음 한 번만 재고, 다음부터는 저장한 값을 씁니다.
+- 말이 시작되기 전 조용한 구간과 말이 끝난 뒤 조용한 구간은 앞뒤 여유만 남기고 버립니다.
+- 인식 서버로 보내기 전에 16kHz로 낮춰 올리는 크기를 줄입니다.
+인식은 stt_engines의 엔진(기본 google, 오프라인 vosk/whisper)으로 합니다.
+
+설정 (.env):
+    SPEECH_LISTEN_TIMEOUT=5     # 말이 시작되기를 기다리는 시간 (초)
+    SPEECH_PHRASE_LIMIT=10      # 최대 녹음 길이 (초)
+    VAD_NOISE_SECONDS=0.5       # 주변 소음 측정 시간 (초)
+    VAD_THRESHOLD_RATIO=3.0     # 소음 크기의 몇 배부터 말소리로 볼지
+    VAD_MIN_ENERGY=300          # 말소리로 볼 최소 크기 (조용한 방에서 잡음에 반응하지 않도록)
+    VAD_PADDING_MS=200          # 말 앞뒤로 남길 여유
+    VAD_HANGOVER_MS=600         # 이만큼 조용하면 말이 끝난 것으로 봄
+    STT_SAMPLE_RATE=16000       # 인식 서버로 보낼 샘플링 레이트
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import stt_engines
+import tracing
+
+SPEECH_LISTEN_TIMEOUT = float(os.getenv('SPEECH_LISTEN_TIMEOUT', '5'))
+SPEECH_PHRASE_LIMIT = float(os.getenv('SPEECH_PHRASE_LIMIT', '10'))
+VAD_NOISE_SECONDS = float(os.getenv('VAD_NOISE_SECONDS', '0.5'))
+VAD_THRESHOLD_RATIO = float(os.getenv('VAD_THRESHOLD_RATIO', '3.0'))
+VAD_MIN_ENERGY = float(os.getenv('VAD_MIN_ENERGY', '300'))
+VAD_PADDING_MS = int(os.getenv('VAD_PADDING_MS', '200'))
+VAD_HANGOVER_MS = int(os.getenv('VAD_HANGOVER_MS', '600'))
+STT_SAMPLE_RATE = int(os.getenv('STT_SAMPLE_RATE', '16000'))
+
+# 상태 -> 화면에 보여줄 문구
+STATUS_LABELS = {
+    'calibrating': "🔇 주변 소음을 확인하고 있습니다...",
+    'listening': "🎤 듣고 있습니다... 말씀해주세요!",
+    'recording': "🔴 녹음 중입니다...",
+    'recognizing': "🔄 음성을 분석하고 있습니다...",
+}
+
+# 마이크는 하나이므로 녹음은 한 번에 하나씩
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='speech-capture')
+    return _executor
+
+
+def frame_energy(frame, sample_width=2):
+    """
+    PCM 구간의 크기(RMS)를 계산합니다.
+
+    Args:
+        frame (bytes): PCM 데이터 (부호 있는 정수)
+        sample_width (int): 샘플 크기 (바이트, 2 또는 4)
+
+    Returns:
+        float: RMS 값
+    """
+    import numpy as np
+
+    samples = np.frombuffer(frame, dtype=np.int16 if sample_width == 2 else np.int32).astype(np.float64)
+    if len(samples) == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples ** 2)))
+
+
+def measure_noise_floor(source, seconds=VAD_NOISE_SECONDS):
+    """
+    마이크로 주변 소음 크기를 잽니다.
+
+    Args:
+        source: speech_recognition.Microphone (열린 상태)
+
+    Returns:
+        float: 소음 크기 (구간 RMS의 중앙값)
+    """
+    import numpy as np
+
+    chunk_count = max(1, int(seconds * source.SAMPLE_RATE / source.CHUNK))
+    energies = [frame_energy(source.stream.read(source.CHUNK), source.SAMPLE_WIDTH) for _ in range(chunk_count)]
+    return float(np.median(energies))
+
+
+def record_phrase(source, noise_floor, timeout=SPEECH_LISTEN_TIMEOUT, phrase_limit=SPEECH_PHRASE_LIMIT, status=None):
+    """
+    말이 시작될 때부터 끝날 때까지 녹음합니다. 앞뒤 조용한 구간은 여유만 남기고 버립니다.
+
+    Args:
+        source: speech_recognition.Microphone (열린 상태)
+        noise_floor (float): 주변 소음 크기
+        timeout (float): 말이 시작되기를 기다리는 시간 (초)
+        phrase_limit (float): 최대 녹음 길이 (초)
+        status (callable): status(상태) 호출
+
+    Returns:
+        tuple: (말소리 PCM bytes, 마이크에서 읽은 전체 바이트 수)
+    """
+    import speech_recognition as sr
+
+    threshold = max(noise_floor * VAD_THRESHOLD_RATIO, VAD_MIN_ENERGY)
+    chunk_seconds = source.CHUNK / source.SAMPLE_RATE
+    padding_chunks = max(1, int(VAD_PADDING_MS / 1000 / chunk_seconds))
+    hangover_chunks = max(1, int(VAD_HANGOVER_MS / 1000 / chunk_seconds))
+
+    # 말이 시작되기를 기다림 (직전 여유 구간만 보관)
+    padding = deque(maxlen=padding_chunks)
+    raw_bytes = 0
+    waited = 0.0
+    while True:
+        chunk = source.stream.read(source.CHUNK)
+        raw_bytes += len(chunk)
+        if frame_energy(chunk, source.SAMPLE_WIDTH) > threshold:
+            break
+        padding.append(chunk)
+        waited += chunk_seconds
+        if timeout and waited > timeout:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+    if status:
+        status('recording')
+    frames = list(padding) + [chunk]
+    recorded = chunk_seconds
+    trailing = 0
+    while recorded < phrase_limit and trailing < hangover_chunks:
+        chunk = source.stream.read(source.CHUNK)
+        raw_bytes += len(chunk)
+        frames.append(chunk)
+        recorded += chunk_seconds
+        trailing = 0 if frame_energy(chunk, source.SAMPLE_WIDTH) > threshold else trailing + 1
+
+    # 말이 끝난 뒤 조용한 구간은 여유만 남김
+    if trailing > padding_chunks:
+        frames = frames[:len(frames) - trailing + padding_chunks]
+    return b''.join(frames), raw_bytes
+
+
+def _listen_and_recognize(noise_floor, status, language):
+    import speech_recognition as sr
+    import pyaudio  # noqa: F401  (sr.Microphone에 필요, 없으면 ImportError)
+
+    def _notify(name, **fields):
+        if status:
+            status(name, **fields)
+
+    with sr.Microphone() as source:
+        if noise_floor is None:
+            _notify('calibrating')
+            noise_floor = measure_noise_floor(source)
+        _notify('listening', noise_floor=noise_floor)
+        pcm, raw_bytes = record_phrase(source, noise_floor, status=_notify)
+        audio = sr.AudioData(pcm, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    if audio.sample_rate > STT_SAMPLE_RATE:
+        audio = sr.AudioData(audio.get_raw_data(convert_rate=STT_SAMPLE_RATE), STT_SAMPLE_RATE, audio.sample_width)
+
+    _notify('recognizing')
+    with tracing.span('stt.recognize', raw_bytes=raw_bytes, upload_bytes=len(audio.frame_data),
+                      seconds=round(len(audio.frame_data) / (audio.sample_rate * audio.sample_width), 2)) as span:
+        text, engine = stt_engines.recognize(audio.frame_data, audio.sample_rate, audio.sample_width, language)
+        span.set(engine=engine)
+    return {'text': text, 'noise_floor': noise_floor}
+
+
+def start(noise_floor=None, status=None, language='en-US'):
+    """
+    백그라운드에서 녹음과 음성 인식을 시작합니다.
+
+    Args:
+        noise_floor (float): 이 세션에서 이미 잰 소음 크기 (None이면 먼저 잼)
+        status (callable): status(상태, **정보) 호출 (백그라운드 스레드에서 불림)
+            상태는 STATUS_LABELS의 키이고, 'listening'에는 noise_floor가 함께 전달됨
+        language (str): 인식 언어
+
+    Returns:
+        Future: 결과 {'text', 'noise_floor'} (인식 실패 시 speech_recognition 예외)
+    """
+    return _get_executor().submit(_listen_and_recognize, noise_floor, status, language)
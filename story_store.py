@@ -0,0 +1,83 @@
+"""
+동화책 저장소 모듈
+stories.json 읽기/쓰기를 한 곳에서 처리합니다.
+화면과 백그라운드 작업이 동시에 파일을 수정해도 내용이 섞이지 않도록 잠금을 사용합니다.
+"""
+
+import json
+import os
+import threading
+
+STORIES_FILE = 'stories.json'
+
+# 같은 프로세스 안의 모든 세션/작업 스레드가 공유하는 잠금
+_lock = threading.RLock()
+
+
+def load_stories(json_file=STORIES_FILE):
+    """저장된 동화책 목록을 불러옵니다."""
+    with _lock:
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"파일 읽기 오류: {str(e)}")
+            return []
+
+
+def save_stories(stories, json_file=STORIES_FILE):
+    """동화책 목록 전체를 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    with _lock:
+        temp_path = f"{json_file}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(stories, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, json_file)
+
+
+def add_story(story_data, json_file=STORIES_FILE):
+    """새 동화책을 목록 끝에 추가합니다."""
+    with _lock:
+        stories = load_stories(json_file)
+        stories.append(story_data)
+        save_stories(stories, json_file)
+
+
+def get_story(story_id, json_file=STORIES_FILE):
+    """ID로 동화책을 찾습니다. 없으면 None을 반환합니다."""
+    for story in load_stories(json_file):
+        if story.get('id') == story_id:
+            return story
+    return None
+
+
+def update_story(story_id, updater, json_file=STORIES_FILE):
+    """
+    동화책 하나를 읽어 updater로 수정한 뒤 저장합니다.
+
+    Args:
+        story_id (str): 동화책 ID
+        updater (callable): story dict를 받아 제자리에서 수정하는 함수.
+            False를 반환하면 저장하지 않습니다.
+
+    Returns:
+        dict: 수정된 동화책 또는 None (동화책이 없거나 저장하지 않은 경우)
+    """
+    with _lock:
+        stories = load_stories(json_file)
+        for story in stories:
+            if story.get('id') == story_id:
+                if updater(story) is False:
+                    return None
+                save_stories(stories, json_file)
+                return story
+        return None
+
+
+def delete_story(story_id, json_file=STORIES_FILE):
+    """동화책을 삭제합니다."""
+    with _lock:
+        stories = load_stories(json_file)
+        stories = [s for s in stories if s.get('id') != story_id]
+        save_stories(stories, json_file)
@@ -0,0 +1,211 @@
+"""
+음성 인식(STT) 엔진 모듈
+음성 인식 엔진을 같은 인터페이스로 감쌉니다. 모든 엔진은 16비트 모노 PCM을 받아 텍스트를 돌려줍니다.
+
+    google   Google Web Speech (네트워크 필요, FLAC 변환 도구 필요, 기본)
+    vosk     Vosk 작은 영어 모델 (오프라인)
+    whisper  whisper.cpp (pywhispercpp, 오프라인)
+
+오프라인 엔진의 모델은 프로세스마다 한 번만 불러와 모든 세션이 함께 씁니다.
+설정한 엔진을 쓸 수 없으면(라이브러리/모델 없음) google로 인식합니다.
+
+설정 (.env):
+    STT_ENGINE=google
+    VOSK_MODEL_PATH=models/vosk-model-small-en-us-0.15
+    WHISPER_MODEL=tiny.en       # 모델 이름 또는 ggml 모델 파일 경로
+    WHISPER_THREADS=4
+
+사용법:
+    python bench_stt.py         # 엔진별 지연 시간과 단어 오류율(WER) 비교
+"""
+
+import json
+import os
+import threading
+
+import tracing
+
+STT_ENGINE = os.getenv('STT_ENGINE', 'google').lower()
+VOSK_MODEL_PATH = os.getenv('VOSK_MODEL_PATH', os.path.join('models', 'vosk-model-small-en-us-0.15'))
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'tiny.en')
+WHISPER_THREADS = int(os.getenv('WHISPER_THREADS', '4'))
+
+
+def _unknown_value():
+    """인식 결과가 없을 때 던질 예외 (app.py가 처리하는 speech_recognition 예외와 같은 종류)"""
+    import speech_recognition as sr
+    return sr.UnknownValueError()
+
+
+class STTEngine:
+    """
+    음성 인식 엔진 인터페이스
+    recognize()는 인식한 텍스트를 반환하고, 알아들을 수 없으면 speech_recognition.UnknownValueError를 던집니다.
+    """
+
+    name = 'base'
+
+    def is_available(self):
+        """이 환경에서 사용할 수 있는지 확인합니다."""
+        return True
+
+    def recognize(self, pcm, sample_rate, sample_width=2, language='en-US'):
+        """
+        음성을 텍스트로 변환합니다.
+
+        Args:
+            pcm (bytes): 모노 PCM 데이터
+            sample_rate (int): 샘플링 레이트 (Hz)
+            sample_width (int): 샘플 크기 (바이트)
+            language (str): 인식 언어
+
+        Returns:
+            str: 인식한 텍스트
+        """
+        raise NotImplementedError
+
+
+class GoogleEngine(STTEngine):
+    """speech_recognition의 Google Web Speech 엔진"""
+
+    name = 'google'
+
+    def is_available(self):
+        try:
+            import speech_recognition  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def recognize(self, pcm, sample_rate, sample_width=2, language='en-US'):
+        import speech_recognition as sr
+
+        audio = sr.AudioData(pcm, sample_rate, sample_width)
+        return sr.Recognizer().recognize_google(audio, language=language)
+
+
+class VoskEngine(STTEngine):
+    """Vosk 오프라인 엔진 (모델은 처음 인식할 때 한 번 불러옴)"""
+
+    name = 'vosk'
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+        return os.path.isdir(self.model_path)
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import vosk
+                    vosk.SetLogLevel(-1)
+                    with tracing.span('stt.model.load', engine=self.name):
+                        self._model = vosk.Model(self.model_path)
+        return self._model
+
+    def recognize(self, pcm, sample_rate, sample_width=2, language='en-US'):
+        import vosk
+
+        # KaldiRecognizer는 상태가 있으므로 인식마다 새로 만듦 (모델은 공유)
+        recognizer = vosk.KaldiRecognizer(self._get_model(), sample_rate)
+        recognizer.AcceptWaveform(pcm)
+        text = json.loads(recognizer.FinalResult()).get('text', '').strip()
+        if not text:
+            raise _unknown_value()
+        return text
+
+
+class WhisperCppEngine(STTEngine):
+    """whisper.cpp 오프라인 엔진 (pywhispercpp, 모델은 처음 인식할 때 한 번 불러옴)"""
+
+    name = 'whisper'
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model=WHISPER_MODEL, threads=WHISPER_THREADS):
+        self.model = model
+        self.threads = threads
+        self._model = None
+        # whisper.cpp 컨텍스트는 동시에 하나의 인식만 처리
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        try:
+            import pywhispercpp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _get_model(self):
+        if self._model is None:
+            from pywhispercpp.model import Model
+            with tracing.span('stt.model.load', engine=self.name, model=self.model):
+                self._model = Model(self.model, n_threads=self.threads, print_progress=False, print_realtime=False)
+        return self._model
+
+    def recognize(self, pcm, sample_rate, sample_width=2, language='en-US'):
+        import numpy as np
+
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if sample_rate != self.SAMPLE_RATE:
+            # whisper는 16kHz만 받으므로 선형 보간으로 맞춤
+            positions = np.arange(0, len(samples), sample_rate / self.SAMPLE_RATE)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+        with self._lock:
+            segments = self._get_model().transcribe(samples, language=language.split('-')[0])
+        text = ' '.join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise _unknown_value()
+        return text
+
+
+ENGINES = {
+    'google': GoogleEngine,
+    'vosk': VoskEngine,
+    'whisper': WhisperCppEngine,
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(name=None):
+    """
+    이름에 해당하는 엔진을 반환합니다. (엔진마다 프로세스에서 한 번만 만듦)
+
+    Returns:
+        STTEngine: 엔진 또는 None (알 수 없는 이름)
+    """
+    name = (name or STT_ENGINE).lower()
+    if name not in ENGINES:
+        return None
+    with _engines_lock:
+        if name not in _engines:
+            _engines[name] = ENGINES[name]()
+        return _engines[name]
+
+
+def recognize(pcm, sample_rate, sample_width=2, language='en-US', engine=None):
+    """
+    설정된 엔진으로 음성을 인식합니다. 엔진을 쓸 수 없으면 google로 인식합니다.
+
+    Returns:
+        tuple: (인식한 텍스트, 사용한 엔진 이름)
+    """
+    selected = get_engine(engine)
+    if selected is None or not selected.is_available():
+        tracing.event('stt.fallback', tracing.WARNING, engine=engine or STT_ENGINE, fallback='google')
+        selected = get_engine('google')
+    return selected.recognize(pcm, sample_rate, sample_width, language), selected.name
+
+
+def available_engines():
+    """사용할 수 있는 엔진 이름 목록을 반환합니다."""
+    return [name for name in ENGINES if get_engine(name).is_available()]
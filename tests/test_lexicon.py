@@ -0,0 +1,47 @@
+import pytest
+
+import lexicon
+
+
+@pytest.mark.parametrize('word, expected', [
+    # 단어 자체
+    ('cat', '고양이'),
+    ('Cat.', '고양이'),
+    # 복수형 / 3인칭
+    ('cats', '고양이'),
+    ('puppies', '강아지'),
+    ('boxes', '상자'),
+    ('runs', '달리다'),
+    # 과거형 / 진행형
+    ('jumped', '뛰다'),
+    ('baked', '굽다'),
+    ('hopped', '깡충 뛰다'),
+    ('hopping', '깡충 뛰다'),
+    ('cried', '울다'),
+    ('running', '달리다'),
+    ('opened', '열다'),
+    ('cared', '돌보다'),
+    ('caring', '돌보다'),
+    ('hoped', '바라다'),
+    ('hoping', '바라다'),
+    # 불규칙
+    ('went', '가다'),
+    ('mice', '쥐'),
+    # 비교급 / 최상급
+    ('taller', '키가 큰'),
+    ('bigger', '큰'),
+    ('biggest', '큰'),
+    ('happier', '행복한'),
+    ('cleaner', '깨끗한'),
+])
+def test_inflected_forms(word, expected):
+    assert lexicon.lookup(word) == expected
+
+
+@pytest.mark.parametrize('word', [
+    # 기본형으로 바꾸면 다른 품사의 단어가 되는 경우
+    'news', 'singer', 'player', 'boxer',
+    'hated', 'stared', 'staring',
+])
+def test_no_wrong_base_form(word):
+    assert lexicon.lookup(word) is None
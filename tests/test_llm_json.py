@@ -0,0 +1,49 @@
+import pytest
+
+import llm_json
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": 1}', {'a': 1}),
+    ('```json\n{"a": 1}\n```', {'a': 1}),
+    ('```\n[1, 2]\n```', [1, 2]),
+    # 앞뒤 설명 문장
+    ('Here you go: {"a": [1, 2]} Hope it helps!', {'a': [1, 2]}),
+    # 닫는 괄호 앞 쉼표
+    ('{"a": [1, 2,],}', {'a': [1, 2]}),
+    # 문자열 안의 쉼표와 괄호는 그대로
+    ('{"a": "x, ]", "b": [1,]}', {'a': 'x, ]', 'b': [1]}),
+    ('{"a": "He said \\"hi\\"", "b": 1}', {'a': 'He said "hi"', 'b': 1}),
+    # 값 뒤에 다른 값이 붙은 경우 첫 값만
+    ('{"a": 1}{"b": 2}', {'a': 1}),
+])
+def test_parse_and_repair(text, expected):
+    assert llm_json.parse_json(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('[1, 2, 3', [1, 2, 3]),
+    ('{"items": [{"q": "a"}, {"q": "b"', {'items': [{'q': 'a'}, {'q': 'b'}]}),
+    # 문자열 중간에서 잘리면 마지막 완전한 값까지만
+    ('{"items": [{"q": "a"}, {"q": "b', {'items': [{'q': 'a'}]}),
+    ('{"word": "cat", "meaning": "고양', {'word': 'cat'}),
+    ('{"a": 1, "b":', {'a': 1}),
+])
+def test_truncated(text, expected):
+    assert llm_json.parse_json(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', None, 'no json here', '{{{'])
+def test_unreadable(text):
+    assert llm_json.parse_json(text) is None
+
+
+def test_extract_objects_keeps_complete_items():
+    text = '[{"q": "a", "ans": 1}, {"q": "b"}, {"q": "c", "ans": 2,} broken'
+    assert llm_json.extract_objects(text, ['q', 'ans']) == [{'q': 'a', 'ans': 1}, {'q': 'c', 'ans': 2}]
+
+
+def test_extract_string_field():
+    text = '{"translation": "안녕 \\"친구\\"", "notes": '
+    assert llm_json.extract_string_field(text, 'translation') == '안녕 "친구"'
+    assert llm_json.extract_string_field(text, 'missing') == ''
@@ -0,0 +1,62 @@
+import pytest
+
+import pronunciation_scorer
+
+
+@pytest.mark.parametrize('word, code', [
+    ('knight', 'NT'),
+    ('night', 'NT'),
+    ('phone', 'FN'),
+    ('thumb', '0M'),
+    ('cat', 'KT'),
+    ('', ''),
+])
+def test_metaphone(word, code):
+    assert pronunciation_scorer.metaphone(word) == code
+
+
+@pytest.mark.parametrize('target, heard', [
+    ('there', 'their'),
+    ('meet', 'meat'),
+    ('knight', 'night'),
+    ('write', 'right'),
+])
+def test_homophones_are_correct(target, heard):
+    result = pronunciation_scorer.score_pronunciation(target, heard)
+    assert result['words'][0]['status'] == 'correct'
+    assert result['score'] == pronunciation_scorer.CREDIT_PHONETIC
+
+
+@pytest.mark.parametrize('target, heard', [
+    ('cat', 'cut'),
+    ('ship', 'sheep'),
+    ('bit', 'bet'),
+])
+def test_vowel_near_miss_is_substituted(target, heard):
+    result = pronunciation_scorer.score_pronunciation(target, heard)
+    assert result['words'][0]['status'] == 'substituted'
+    assert 0 < result['score'] <= pronunciation_scorer.CREDIT_CLOSE
+
+
+def test_exact_sentence():
+    result = pronunciation_scorer.score_pronunciation('I like cats.', 'i like cats')
+    assert result['score'] == 1.0
+    assert result['is_good']
+
+
+def test_near_miss_scores_between_exact_and_wrong():
+    exact = pronunciation_scorer.score_pronunciation('I like cats', 'I like cats')['score']
+    near = pronunciation_scorer.score_pronunciation('I like cats', 'I like cuts')['score']
+    wrong = pronunciation_scorer.score_pronunciation('I like cats', 'I like dogs')['score']
+    assert exact > near > wrong
+
+
+def test_missed_and_extra_words():
+    marks = pronunciation_scorer.score_pronunciation('the big dog', 'the dog ran')['words']
+    assert [mark['status'] for mark in marks] == ['correct', 'missed', 'correct', 'extra']
+
+
+def test_empty_speech():
+    result = pronunciation_scorer.score_pronunciation('I like cats', '')
+    assert result['score'] == 0.0
+    assert all(mark['status'] == 'missed' for mark in result['words'])
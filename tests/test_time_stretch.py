@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import time_stretch  # noqa: E402
+
+SAMPLE_RATE = 24000
+FUNDAMENTAL_HZ = 220.0
+
+
+def make_signal(seconds=2.0):
+    """기본음 220Hz와 배음, 음절처럼 크기가 바뀌는 신호"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voice = sum(np.sin(2 * np.pi * FUNDAMENTAL_HZ * n * t) / n for n in range(1, 5))
+    syllables = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 2 * t))
+    return (voice * syllables * 8000).astype(np.float32)
+
+
+def dominant_hz(samples):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return float(np.argmax(spectrum)) * SAMPLE_RATE / len(samples)
+
+
+@pytest.mark.parametrize('speed', [0.5, 1.25])
+def test_length_follows_speed(speed):
+    signal = make_signal()
+    stretched = time_stretch.wsola(signal, speed, SAMPLE_RATE)
+    assert len(stretched) / len(signal) == pytest.approx(1 / speed, rel=0.01)
+
+
+@pytest.mark.parametrize('speed', [0.5, 1.25])
+def test_pitch_is_kept(speed):
+    stretched = time_stretch.wsola(make_signal(), speed, SAMPLE_RATE)
+    assert dominant_hz(stretched) == pytest.approx(FUNDAMENTAL_HZ, abs=5)
+
+
+def test_normal_speed_keeps_length():
+    signal = make_signal()
+    assert len(time_stretch.wsola(signal, 1.0, SAMPLE_RATE)) == len(signal)
+
+
+def test_short_input():
+    signal = make_signal(0.01)
+    stretched = time_stretch.wsola(signal, 0.5, SAMPLE_RATE)
+    assert len(stretched) == pytest.approx(len(signal) * 2, abs=1)
@@ -0,0 +1,56 @@
+import pytest
+
+import tts_engines
+
+
+def test_short_text_is_one_chunk():
+    assert tts_engines.split_chunks('Hello there. How are you?') == ['Hello there. How are you?']
+
+
+def test_splits_at_sentences():
+    assert tts_engines.split_chunks('Hello there. How are you? I am fine!', 15) == [
+        'Hello there.', 'How are you?', 'I am fine!',
+    ]
+
+
+def test_closing_quotes_stay_with_sentence():
+    assert tts_engines.split_chunks('He said "Hi." Then he left. (It was late.) The end.', 15) == [
+        'He said "Hi."', 'Then he left.', '(It was late.)', 'The end.',
+    ]
+
+
+def test_splits_long_sentence_at_clauses():
+    text = 'Once upon a time, in a land far away, there lived a tiny dragon.'
+    assert tts_engines.split_chunks(text, 30) == [
+        'Once upon a time,', 'in a land far away,', 'there lived a tiny dragon.',
+    ]
+
+
+def test_splits_long_clause_at_words():
+    text = 'one two three four five six seven eight nine ten eleven twelve'
+    chunks = tts_engines.split_chunks(text, 20)
+    assert chunks == ['one two three four', 'five six seven eight', 'nine ten eleven', 'twelve']
+    assert ' '.join(chunks) == text
+
+
+def test_merges_short_pieces_up_to_limit():
+    chunks = tts_engines.split_chunks('Hi. Yes. No. Go. Stop.', 9)
+    assert chunks == ['Hi. Yes.', 'No. Go.', 'Stop.']
+
+
+@pytest.mark.parametrize('max_chars', [20, 50, 100])
+def test_chunks_fit_limit_and_keep_words(max_chars):
+    text = ('The little fox ran into the forest, looking for berries; '
+            'it found a river - cold and fast - and stopped. "Wow!" it said. ') * 3
+    chunks = tts_engines.split_chunks(text, max_chars)
+    assert all(len(chunk) <= max_chars for chunk in chunks)
+    assert ' '.join(chunks).split() == text.split()
+
+
+def test_word_longer_than_limit_is_kept_whole():
+    assert tts_engines.split_chunks('a' * 30, 20) == ['a' * 30]
+
+
+@pytest.mark.parametrize('text', ['', '   ', None])
+def test_empty_text(text):
+    assert tts_engines.split_chunks(text) == []
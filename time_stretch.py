@@ -0,0 +1,122 @@
+"""
+음높이를 유지하는 재생 속도 조절 모듈 (WSOLA)
+기본 속도(1.0)로 한 번 만든 음성에서 0.5x/0.7x 같은 느린 버전을 만듭니다.
+frame_rate를 바꾸는 방식과 달리 목소리가 낮아지지 않고, 속도마다 gTTS를 다시 부를 필요가 없습니다.
+
+WSOLA(Waveform Similarity Overlap-Add): 짧은 구간(프레임)을 겹쳐 이어 붙이되,
+앞 프레임과 파형이 가장 잘 이어지는 위치를 조금씩 찾아 옮겨서 끊김 없이 길이만 바꿉니다.
+
+사용법:
+    python bench_time_stretch.py    # 처리 속도와 음높이 유지 확인
+"""
+
+from io import BytesIO
+
+import numpy as np
+
+FRAME_MS = 30       # 프레임 길이
+TOLERANCE_MS = 10   # 이어 붙일 위치를 찾는 범위 (앞뒤)
+
+
+def wsola(samples, speed, sample_rate, frame_ms=FRAME_MS, tolerance_ms=TOLERANCE_MS):
+    """
+    모노 샘플의 재생 속도를 바꿉니다. (음높이 유지)
+
+    Args:
+        samples (array-like): 모노 오디오 샘플
+        speed (float): 재생 속도 (0.5 = 두 배 길게, 2.0 = 절반 길이)
+        sample_rate (int): 샘플링 레이트 (Hz)
+
+    Returns:
+        numpy.ndarray: float32 샘플 (길이 ≈ len(samples) / speed)
+    """
+    x = np.asarray(samples, dtype=np.float32)
+    if speed == 1.0 or len(x) == 0:
+        return x.copy()
+
+    frame = max(16, int(sample_rate * frame_ms / 1000)) // 2 * 2
+    synthesis_hop = frame // 2
+    analysis_hop = synthesis_hop * speed
+    tolerance = max(1, int(sample_rate * tolerance_ms / 1000))
+
+    output_length = int(round(len(x) / speed))
+    frame_count = output_length // synthesis_hop + 1
+
+    # 프레임이 범위를 벗어나지 않도록 앞뒤를 0으로 채움
+    padded = np.concatenate([
+        np.zeros(tolerance, dtype=np.float32),
+        x,
+        np.zeros(frame + synthesis_hop + 2 * tolerance + int(analysis_hop) + 1, dtype=np.float32),
+    ])
+    max_position = len(padded) - frame
+
+    # 50% 겹침에서 합이 일정한 Hann 창
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame) / frame)).astype(np.float32)
+    output = np.zeros(frame_count * synthesis_hop + frame, dtype=np.float32)
+    window_sum = np.zeros_like(output)
+
+    previous = tolerance
+    for k in range(frame_count):
+        nominal = min(int(round(k * analysis_hop)) + tolerance, max_position - tolerance)
+        if k == 0:
+            position = nominal
+        else:
+            # 앞 프레임이 자연스럽게 이어질 파형과 가장 비슷한 위치를 찾음
+            natural = padded[previous + synthesis_hop:previous + synthesis_hop + frame]
+            region = padded[nominal - tolerance:nominal + tolerance + frame]
+            correlation = np.correlate(region, natural, mode='valid')
+            position = nominal - tolerance + int(np.argmax(correlation))
+
+        start = k * synthesis_hop
+        output[start:start + frame] += padded[position:position + frame] * window
+        window_sum[start:start + frame] += window
+        previous = position
+
+    output /= np.maximum(window_sum, 1e-3)
+    return output[:output_length]
+
+
+def stretch_segment(audio, speed):
+    """
+    pydub AudioSegment의 재생 속도를 바꿉니다. (채널별로 처리)
+
+    Returns:
+        AudioSegment: 같은 샘플링 레이트/채널 수의 새 오디오
+    """
+    if speed == 1.0:
+        return audio
+
+    channels = audio.channels
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+        stretched = np.stack(
+            [wsola(samples[:, c], speed, audio.frame_rate) for c in range(channels)], axis=1
+        ).reshape(-1)
+    else:
+        stretched = wsola(samples, speed, audio.frame_rate)
+
+    limit = float(2 ** (8 * audio.sample_width - 1) - 1)
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[audio.sample_width]
+    raw = np.clip(np.round(stretched), -limit - 1, limit).astype(dtype).tobytes()
+    return audio._spawn(raw)
+
+
+def stretch_mp3(mp3_bytes, speed, audio_format='mp3'):
+    """
+    MP3 음성의 재생 속도를 바꿔 다시 인코딩합니다.
+
+    Args:
+        mp3_bytes (bytes): 기본 속도 음성
+        speed (float): 재생 속도
+        audio_format (str): 출력 형식
+
+    Returns:
+        bytes: 속도를 바꾼 음성
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(BytesIO(mp3_bytes), format='mp3')
+    output = BytesIO()
+    stretch_segment(audio, speed).export(output, format=audio_format)
+    return output.getvalue()
@@ -0,0 +1,208 @@
+"""
+추적(tracing) 모듈
+자주 실행되는 경로(PDF 페이지 처리, 번역, TTS, LLM 호출)의 이름 붙은 구간(span)과
+이벤트를 수준별로 기록합니다. 기록 위치(sink)는 설정으로 바꿀 수 있고,
+꺼져 있으면(TRACE_SINK=null, 기본값) 수준 비교 한 번만 하고 바로 돌아옵니다.
+
+설정 (.env):
+    TRACE_SINK=null        # null, console, jsonl
+    TRACE_LEVEL=info       # debug, info, warning, error
+    TRACE_FILE=trace.jsonl # jsonl 기록 파일
+
+사용 예:
+    with tracing.span('ingest.page.render', page=3) as span:
+        ...
+        span.set(image_bytes=len(data))
+    tracing.event('ingest.page.skipped', level=tracing.DEBUG, page=3, reason='empty')
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', ERROR: 'error'}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+TRACE_SINK = os.getenv('TRACE_SINK', 'null').lower()
+TRACE_LEVEL = _LEVELS_BY_NAME.get(os.getenv('TRACE_LEVEL', 'info').lower(), INFO)
+TRACE_FILE = os.getenv('TRACE_FILE', 'trace.jsonl')
+
+
+class NullSink:
+    """아무것도 기록하지 않는 sink (추적 꺼짐)"""
+
+    def write(self, record):
+        pass
+
+
+class ConsoleSink:
+    """표준 에러로 한 줄씩 출력하는 sink"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        fields = ' '.join(f"{key}={value}" for key, value in record.get('fields', {}).items())
+        duration = f" {record['duration_ms']:.1f}ms" if 'duration_ms' in record else ''
+        status = f" [{record['error']}]" if record.get('status', 'ok') != 'ok' else ''
+        line = f"[{record['level']}] {record['name']}{duration}{status} {fields}".rstrip()
+        with self._lock:
+            try:
+                self.stream.write(line + '\n')
+            except UnicodeEncodeError:
+                # 콘솔 인코딩이 한글/특수문자를 못 쓰는 경우
+                encoding = getattr(self.stream, 'encoding', None) or 'ascii'
+                self.stream.write(line.encode(encoding, 'backslashreplace').decode(encoding) + '\n')
+
+
+class JsonlSink:
+    """한 줄에 하나씩 JSON으로 파일에 추가하는 sink"""
+
+    def __init__(self, path=TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+            self._file.write(line + '\n')
+
+
+def _make_sink(name):
+    if name == 'console':
+        return ConsoleSink()
+    if name == 'jsonl':
+        return JsonlSink()
+    return NullSink()
+
+
+_sink = _make_sink(TRACE_SINK)
+_base_level = TRACE_LEVEL
+# 실제로 비교하는 수준 (null sink면 어떤 수준도 기록하지 않도록 ERROR보다 높게 둠)
+_level = ERROR + 1 if isinstance(_sink, NullSink) else _base_level
+_local = threading.local()
+
+
+def configure(sink=None, level=None):
+    """
+    sink와 수준을 바꿉니다.
+
+    Args:
+        sink: 'null', 'console', 'jsonl' 또는 write(record) 메서드가 있는 객체
+        level (int | str): 기록할 최소 수준
+    """
+    global _sink, _base_level, _level
+    if sink is not None:
+        _sink = _make_sink(sink) if isinstance(sink, str) else sink
+    if level is not None:
+        _base_level = _LEVELS_BY_NAME.get(level, INFO) if isinstance(level, str) else level
+    _level = ERROR + 1 if isinstance(_sink, NullSink) else _base_level
+
+
+def enabled(level=INFO):
+    """이 수준이 기록되는지 반환합니다. (기록할 값을 만드는 비용이 클 때 먼저 확인)"""
+    return level >= _level
+
+
+def _emit(name, level, fields, **extra):
+    record = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'level': LEVEL_NAMES.get(level, str(level)),
+        'name': name,
+        'thread': threading.current_thread().name,
+    }
+    record.update(extra)
+    record['fields'] = fields
+    try:
+        _sink.write(record)
+    except Exception:
+        pass  # 추적 실패가 기능을 멈추게 하지 않음
+
+
+def event(name, level=INFO, **fields):
+    """시점 이벤트 하나를 기록합니다."""
+    if level >= _level:
+        _emit(name, level, fields)
+
+
+class _NullSpan:
+    """추적이 꺼져 있을 때 쓰는 빈 span (하나를 계속 재사용)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """이름 붙은 구간. 빠져나올 때 걸린 시간과 성공 여부를 기록합니다."""
+
+    def __init__(self, name, level, fields):
+        self.name = name
+        self.level = level
+        self.fields = fields
+        self.parent = None
+        self._started = None
+
+    def set(self, **fields):
+        """구간 안에서 알게 된 값을 추가합니다."""
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        _local.stack.pop()
+        extra = {'duration_ms': round(duration_ms, 3), 'status': 'ok' if exc_type is None else 'error'}
+        if exc_type is not None:
+            extra['error'] = f"{exc_type.__name__}: {exc}"
+        if self.parent:
+            extra['parent'] = self.parent
+        _emit(self.name, self.level, self.fields, **extra)
+        return False
+
+
+def span(name, level=INFO, **fields):
+    """
+    이름 붙은 구간을 엽니다. with 문으로 사용합니다.
+
+    Args:
+        name (str): 구간 이름 (예: 'llm.call', 'tts.generate')
+        level (int): 기록 수준
+        **fields: 함께 기록할 값
+
+    Returns:
+        Span: 기록되지 않는 수준이면 아무 일도 하지 않는 span
+    """
+    if level < _level:
+        return _NULL_SPAN
+    return Span(name, level, fields)
@@ -0,0 +1,219 @@
+"""
+번역 품질/비용 기록 모듈
+번역 호출마다 사용한 백엔드, 걸린 시간, 입출력 길이, 캐시 적중 여부, 대체(fallback) 사유를
+로컬 SQLite 파일에 기록하고 백엔드별/날짜별 지연 시간 분포를 요약합니다.
+기록은 큐에 넣기만 하고, 쓰기 스레드 하나가 모인 기록을 한 번에 저장(commit)합니다.
+
+사용법:
+    python translation_metrics.py            # 최근 7일 요약
+    python translation_metrics.py --days 30
+"""
+
+import atexit
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+METRICS_DB = os.getenv('TRANSLATION_METRICS_DB', 'translation_metrics.db')
+METRICS_ENABLED = os.getenv('TRANSLATION_METRICS_ENABLED', '1') != '0'
+
+# 쓰기 스레드가 한 번에 저장할 최대 기록 수
+WRITE_BATCH_SIZE = 500
+
+_conn = None
+_lock = threading.Lock()
+_pending = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translation_calls (
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    latency_ms REAL NOT NULL,
+    input_chars INTEGER NOT NULL,
+    output_chars INTEGER NOT NULL,
+    cache_hit INTEGER NOT NULL,
+    fallback_reason TEXT
+)
+"""
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(METRICS_DB, check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute(_SCHEMA)
+        _conn.execute('CREATE INDEX IF NOT EXISTS idx_translation_calls_day ON translation_calls (day)')
+        _conn.commit()
+    return _conn
+
+
+def record(backend, latency_ms, input_chars, output_chars, cache_hit=False,
+           fallback_reason=None, operation='translate'):
+    """
+    번역 호출 한 건을 기록합니다. 기록에 실패해도 번역 흐름은 방해하지 않습니다.
+
+    Args:
+        backend (str): 'gemini', 'deep_translator', 'lexicon', 'source'(원문 반환) 등
+        latency_ms (float): 걸린 시간 (밀리초)
+        input_chars (int): 입력 글자 수
+        output_chars (int): 출력 글자 수
+        cache_hit (bool): 캐시/단어장에서 바로 찾았는지 여부
+        fallback_reason (str): 기본 백엔드 대신 이 백엔드가 쓰인 이유 (없으면 None)
+        operation (str): 호출 종류 ('translate', 'word' 등)
+    """
+    if not METRICS_ENABLED:
+        return
+    now = time.time()
+    day = datetime.fromtimestamp(now).strftime('%Y-%m-%d')
+    _start_writer()
+    _pending.put((now, day, operation, backend, float(latency_ms), int(input_chars),
+                  int(output_chars), int(bool(cache_hit)), fallback_reason))
+
+
+def _start_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name='translation-metrics', daemon=True)
+                _writer.start()
+                atexit.register(flush)
+
+
+def _write_loop():
+    """큐에 쌓인 기록을 모아 한 번의 commit으로 저장합니다."""
+    while True:
+        rows = [_pending.get()]
+        while len(rows) < WRITE_BATCH_SIZE:
+            try:
+                rows.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with _lock:
+                conn = _connect()
+                conn.executemany('INSERT INTO translation_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                conn.commit()
+        except Exception as e:
+            print(f"번역 기록 저장 오류: {str(e)}")
+        finally:
+            for _ in rows:
+                _pending.task_done()
+
+
+def flush():
+    """아직 저장하지 않은 기록이 모두 저장될 때까지 기다립니다."""
+    if _writer is not None:
+        _pending.join()
+
+
+def _percentile(sorted_values, pct):
+    """정렬된 값에서 nearest-rank 방식으로 백분위수를 구합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(days=7):
+    """
+    최근 days일 동안의 기록을 날짜/작업/백엔드별로 요약합니다.
+
+    Returns:
+        list of dict: {
+            'day', 'operation', 'backend', 'calls',
+            'p50_ms', 'p95_ms', 'p99_ms',
+            'fallback_rate', 'cache_hit_rate', 'input_chars', 'output_chars'
+        }
+    """
+    flush()
+    since = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    with _lock:
+        rows = _connect().execute(
+            'SELECT day, operation, backend, latency_ms, input_chars, output_chars, cache_hit, fallback_reason '
+            'FROM translation_calls WHERE day >= ? ORDER BY day, operation, backend',
+            (since,)
+        ).fetchall()
+
+    groups = {}
+    for day, operation, backend, latency_ms, input_chars, output_chars, cache_hit, fallback_reason in rows:
+        group = groups.setdefault((day, operation, backend), {
+            'latencies': [], 'fallbacks': 0, 'cache_hits': 0, 'input_chars': 0, 'output_chars': 0
+        })
+        group['latencies'].append(latency_ms)
+        group['fallbacks'] += 1 if fallback_reason else 0
+        group['cache_hits'] += cache_hit
+        group['input_chars'] += input_chars
+        group['output_chars'] += output_chars
+
+    summary = []
+    for (day, operation, backend), group in sorted(groups.items()):
+        latencies = sorted(group['latencies'])
+        calls = len(latencies)
+        summary.append({
+            'day': day,
+            'operation': operation,
+            'backend': backend,
+            'calls': calls,
+            'p50_ms': _percentile(latencies, 50),
+            'p95_ms': _percentile(latencies, 95),
+            'p99_ms': _percentile(latencies, 99),
+            'fallback_rate': group['fallbacks'] / calls,
+            'cache_hit_rate': group['cache_hits'] / calls,
+            'input_chars': group['input_chars'],
+            'output_chars': group['output_chars'],
+        })
+    return summary
+
+
+def fallback_reasons(days=7):
+    """최근 days일 동안의 대체 사유별 횟수를 반환합니다."""
+    flush()
+    since = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    with _lock:
+        return _connect().execute(
+            'SELECT backend, fallback_reason, COUNT(*) FROM translation_calls '
+            'WHERE day >= ? AND fallback_reason IS NOT NULL '
+            'GROUP BY backend, fallback_reason ORDER BY COUNT(*) DESC',
+            (since,)
+        ).fetchall()
+
+
+def print_summary(days=7):
+    """요약 결과를 표 형태로 출력합니다."""
+    summary = summarize(days)
+    if not summary:
+        print(f"최근 {days}일 동안 기록된 번역이 없습니다. ({METRICS_DB})")
+        return
+
+    header = f"{'날짜':<10} {'작업':<10} {'백엔드':<16} {'호출':>6} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'대체율':>7} {'캐시':>6}"
+    print(header)
+    print('-' * len(header))
+    for row in summary:
+        print(f"{row['day']:<10} {row['operation']:<10} {row['backend']:<16} {row['calls']:>6} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+              f"{row['fallback_rate']:>7.1%} {row['cache_hit_rate']:>6.1%}")
+
+    reasons = fallback_reasons(days)
+    if reasons:
+        print("\n대체 사유:")
+        for backend, reason, count in reasons:
+            print(f"  {backend:<16} {count:>6}  {reason}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="번역 호출 기록 요약")
+    parser.add_argument('--days', type=int, default=7, help="요약할 기간 (일)")
+    args = parser.parse_args()
+    print_summary(args.days)
@@ -0,0 +1,185 @@
+"""
+TTS 오디오 캐시 모듈
+(텍스트, 언어, 속도)로 만든 해시를 키로 음성 파일을 디스크에 저장하고,
+자주 쓰는 음성은 메모리(LRU)에도 올려 둡니다. 같은 문장을 다시 들을 때는
+네트워크 요청이나 ffmpeg 변환 없이 저장된 바이트를 바로 돌려줍니다.
+디스크 용량이 상한을 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', 'tts_cache')
+TTS_CACHE_MAX_MB = float(os.getenv('TTS_CACHE_MAX_MB', '200'))
+TTS_CACHE_MEMORY_ITEMS = int(os.getenv('TTS_CACHE_MEMORY_ITEMS', '64'))
+
+_lock = threading.RLock()
+_memory = OrderedDict()  # key -> bytes (최근 사용 순)
+_disk_index = None       # 파일 이름 -> 파일 크기 (최근 사용 순, OrderedDict)
+_disk_bytes = 0
+_stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def make_key(text, lang='en', speed=1.0, audio_format='mp3', engine='gtts', variant=None):
+    """
+    캐시 키를 만듭니다. 공백 차이는 같은 문장으로 봅니다.
+    엔진마다 목소리가 다르므로 gTTS가 아닌 엔진은 키에 엔진 이름을 넣습니다.
+    (gTTS 키는 엔진을 나누기 전과 같아 이미 저장된 음성을 그대로 씀)
+    variant는 전송용으로 변환한 음성의 변환 설정입니다. (audio_encoding.variant)
+
+    Returns:
+        str: 64자리 16진수 해시
+    """
+    normalized = ' '.join((text or '').split())
+    parts = [normalized, lang, round(float(speed), 2), audio_format]
+    if engine != 'gtts':
+        parts.append(engine)
+    if variant:
+        parts.append(variant)
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _path(key, audio_format='mp3'):
+    return os.path.join(TTS_CACHE_DIR, key[:2], f"{key}.{audio_format}")
+
+
+def _load_index():
+    """디스크에 있는 파일 목록을 마지막 사용 시각 순으로 읽습니다. (_lock 안에서 호출)"""
+    global _disk_index, _disk_bytes
+    if _disk_index is not None:
+        return _disk_index
+
+    entries = []
+    if os.path.isdir(TTS_CACHE_DIR):
+        for root, _dirs, files in os.walk(TTS_CACHE_DIR):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name, stat.st_size))
+
+    entries.sort()
+    _disk_index = OrderedDict()
+    for _mtime, name, file_size in entries:
+        _disk_index[name] = file_size
+    _disk_bytes = sum(_disk_index.values())
+    return _disk_index
+
+
+def _remember(key, data):
+    """메모리 LRU에 넣고 개수 상한을 넘으면 가장 오래된 항목을 뺍니다. (_lock 안에서 호출)"""
+    _memory[key] = data
+    _memory.move_to_end(key)
+    while len(_memory) > TTS_CACHE_MEMORY_ITEMS:
+        _memory.popitem(last=False)
+
+
+def get(key, audio_format='mp3'):
+    """
+    캐시된 오디오를 반환합니다.
+
+    Returns:
+        bytes: 오디오 데이터 또는 None (없는 경우)
+    """
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            _memory.move_to_end(key)
+            _stats['memory_hits'] += 1
+            return data
+
+    path = _path(key, audio_format)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    with _lock:
+        _stats['disk_hits'] += 1
+        _remember(key, data)
+        index = _load_index()
+        name = os.path.basename(path)
+        if name in index:
+            index.move_to_end(name)
+    try:
+        # 다시 시작해도 최근 사용 순서가 유지되도록 수정 시각 갱신
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def contains(key, audio_format='mp3'):
+    """캐시에 있는지만 확인합니다. (적중 통계에 세지 않음)"""
+    with _lock:
+        if key in _memory:
+            return True
+    return os.path.exists(_path(key, audio_format))
+
+
+def put(key, data, audio_format='mp3'):
+    """오디오를 디스크와 메모리에 저장하고, 용량 상한을 넘으면 오래된 파일을 지웁니다."""
+    global _disk_bytes
+    if not data:
+        return
+
+    path = _path(key, audio_format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+    with _lock:
+        _remember(key, data)
+        index = _load_index()
+        name = os.path.basename(path)
+        _disk_bytes += len(data) - index.get(name, 0)
+        index[name] = len(data)
+        index.move_to_end(name)
+        _evict(index)
+
+
+def _evict(index):
+    """디스크 용량이 상한을 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다. (_lock 안에서 호출)"""
+    global _disk_bytes
+    max_bytes = TTS_CACHE_MAX_MB * 1024 * 1024
+    while _disk_bytes > max_bytes and len(index) > 1:
+        name, file_size = index.popitem(last=False)
+        _disk_bytes -= file_size
+        _stats['evictions'] += 1
+        _memory.pop(name.rsplit('.', 1)[0], None)
+        try:
+            os.remove(os.path.join(TTS_CACHE_DIR, name[:2], name))
+        except OSError:
+            pass
+
+
+def stats():
+    """
+    캐시 적중 통계를 반환합니다.
+
+    Returns:
+        dict: {'memory_hits', 'disk_hits', 'misses', 'evictions', 'hit_rate',
+               'memory_items', 'disk_items', 'disk_mb'}
+    """
+    with _lock:
+        index = _load_index()
+        result = dict(_stats)
+        lookups = result['memory_hits'] + result['disk_hits'] + result['misses']
+        result['hit_rate'] = (result['memory_hits'] + result['disk_hits']) / lookups if lookups else 0.0
+        result['memory_items'] = len(_memory)
+        result['disk_items'] = len(index)
+        result['disk_mb'] = _disk_bytes / (1024 * 1024)
+    return result
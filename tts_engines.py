@@ -0,0 +1,342 @@
+"""
+TTS 엔진 모듈
+음성 합성 엔진을 같은 인터페이스로 감쌉니다. 모든 엔진은 MP3 bytes를 돌려주므로
+tts_helper/tts_cache는 어떤 엔진이 만들었는지 신경 쓰지 않습니다.
+
+    gtts    Google 번역 음성 (네트워크 필요, 기본)
+    espeak  espeak-ng를 subprocess로 실행 (오프라인, 빠르고 지연 시간이 일정함)
+
+네트워크 엔진이 느리거나 실패하면 대체 엔진으로 바로 읽고,
+한동안(TTS_FALLBACK_COOLDOWN초) 네트워크 엔진을 건너뜁니다.
+
+설정 (.env):
+    TTS_ENGINE=gtts             # gtts 또는 espeak
+    TTS_FALLBACK_ENGINE=espeak  # 비우면 대체하지 않음
+    TTS_NETWORK_TIMEOUT=3       # 네트워크 엔진 응답을 기다릴 최대 시간 (초, 호출이 시작된 때부터)
+    TTS_FALLBACK_COOLDOWN=60    # 실패 후 네트워크 엔진을 건너뛸 시간 (초)
+    ESPEAK_BINARY=espeak-ng
+    ESPEAK_WPM=150              # 읽는 속도 (분당 단어 수)
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import tracing
+
+TTS_ENGINE = os.getenv('TTS_ENGINE', 'gtts').lower()
+TTS_FALLBACK_ENGINE = os.getenv('TTS_FALLBACK_ENGINE', 'espeak').lower()
+TTS_NETWORK_TIMEOUT = float(os.getenv('TTS_NETWORK_TIMEOUT', '3'))
+TTS_FALLBACK_COOLDOWN = float(os.getenv('TTS_FALLBACK_COOLDOWN', '60'))
+
+# gTTS는 요청 하나에 약 100자까지 보냄 (더 길면 gTTS가 나눠서 차례로 요청)
+TTS_CHUNK_CHARS = int(os.getenv('TTS_CHUNK_CHARS', '100'))
+TTS_CHUNK_WORKERS = int(os.getenv('TTS_CHUNK_WORKERS', '4'))
+
+ESPEAK_BINARY = os.getenv('ESPEAK_BINARY', 'espeak-ng')
+ESPEAK_WPM = int(os.getenv('ESPEAK_WPM', '150'))
+# gTTS 언어 코드 -> espeak-ng 음성 이름
+ESPEAK_VOICES = {'en': 'en-us', 'ko': 'ko'}
+
+
+class EngineUnavailable(Exception):
+    """엔진을 사용할 수 없음 (프로그램/라이브러리 없음)"""
+
+
+class TTSEngine:
+    """
+    TTS 엔진 인터페이스
+    synthesize()는 MP3 bytes를 반환하고, 실패하면 예외를 던집니다.
+    """
+
+    name = 'base'
+    # 네트워크를 쓰는 엔진이면 시간 제한과 대체 엔진을 적용
+    network = False
+
+    def is_available(self):
+        """이 환경에서 사용할 수 있는지 확인합니다."""
+        return True
+
+    def synthesize(self, text, lang='en', slow=False):
+        """
+        텍스트를 음성으로 변환합니다.
+
+        Args:
+            text (str): 읽을 텍스트
+            lang (str): 언어 코드
+            slow (bool): 느리게 읽기
+
+        Returns:
+            bytes: MP3 데이터
+        """
+        raise NotImplementedError
+
+
+# 문장 끝 부호(뒤에 닫는 따옴표/괄호가 올 수 있음) 다음의 공백에서 나눔 (부호는 앞 문장에 남김)
+_SENTENCE_PATTERN = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+_CLAUSE_PATTERN = re.compile(r'(?<=[,;:])\s+|\s+(?=[-\u2013\u2014]\s)')
+
+
+def _split_long(piece, max_chars):
+    """절 단위로도 너무 긴 조각을 단어 경계에서 자릅니다."""
+    parts = []
+    current = ''
+    for word in piece.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            parts.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_chunks(text, max_chars=TTS_CHUNK_CHARS):
+    """
+    텍스트를 gTTS 요청 하나에 들어가는 조각으로 나눕니다.
+    문장 → 절(쉼표 등) → 단어 순서로 나누고, 짧은 조각은 한도 안에서 다시 합쳐 요청 수를 줄입니다.
+
+    Returns:
+        list of str: 조각 목록
+    """
+    pieces = []
+    for sentence in _SENTENCE_PATTERN.split(' '.join((text or '').split())):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_PATTERN.split(sentence):
+            pieces.extend([clause] if len(clause) <= max_chars else _split_long(clause, max_chars))
+
+    chunks = []
+    for piece in (p.strip() for p in pieces):
+        if not piece:
+            continue
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+class GTTSEngine(TTSEngine):
+    """gTTS(Google 번역 음성) 엔진"""
+
+    name = 'gtts'
+    network = True
+
+    def __init__(self, chunk_workers=TTS_CHUNK_WORKERS):
+        self.chunk_workers = chunk_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        try:
+            import gtts  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.chunk_workers, thread_name_prefix='tts-chunk')
+        return self._executor
+
+    @staticmethod
+    def _fetch_chunk(chunk, lang, slow):
+        from gtts import gTTS
+
+        buffer = BytesIO()
+        gTTS(text=chunk, lang=lang, slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def synthesize(self, text, lang='en', slow=False):
+        """
+        긴 텍스트는 직접 나눈 조각을 공용 연결 풀로 동시에 요청하고,
+        받은 MP3 프레임을 다시 인코딩하지 않고 순서대로 이어 붙입니다.
+        """
+        import http_client
+
+        # gTTS가 공용 연결 풀을 사용하도록 설정
+        http_client.install()
+        chunks = split_chunks(text) or [text]
+        if len(chunks) == 1:
+            return self._fetch_chunk(chunks[0], lang, slow)
+
+        with tracing.span('tts.fetch', chunks=len(chunks), chars=len(text)):
+            parts = list(self._get_executor().map(lambda chunk: self._fetch_chunk(chunk, lang, slow), chunks))
+        return b''.join(parts)
+
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng를 실행해 기기 안에서 읽는 오프라인 엔진"""
+
+    name = 'espeak'
+
+    def __init__(self, binary=ESPEAK_BINARY, wpm=ESPEAK_WPM, timeout=5.0):
+        self.binary = binary
+        self.wpm = wpm
+        self.timeout = timeout
+
+    def is_available(self):
+        return shutil.which(self.binary) is not None
+
+    def _run(self, text, lang, slow):
+        """espeak-ng를 실행해 WAV bytes를 받습니다. (텍스트는 표준 입력으로 전달)"""
+        binary = shutil.which(self.binary)
+        if binary is None:
+            raise EngineUnavailable(f"{self.binary}를 찾을 수 없습니다.")
+        wpm = int(self.wpm * 0.7) if slow else self.wpm
+        result = subprocess.run(
+            [binary, '-v', ESPEAK_VOICES.get(lang, lang), '-s', str(wpm), '--stdout'],
+            input=text.encode('utf-8'),
+            capture_output=True,
+            timeout=self.timeout,
+            check=True,
+        )
+        return result.stdout
+
+    def synthesize(self, text, lang='en', slow=False):
+        from pydub import AudioSegment
+
+        # --stdout으로 받은 WAV는 헤더의 길이가 비어 있을 수 있어 wave로 프레임을 직접 읽음
+        with wave.open(BytesIO(self._run(text, lang, slow)), 'rb') as wav:
+            audio = AudioSegment(
+                data=wav.readframes(wav.getnframes()),
+                sample_width=wav.getsampwidth(),
+                frame_rate=wav.getframerate(),
+                channels=wav.getnchannels(),
+            )
+        buffer = BytesIO()
+        audio.export(buffer, format='mp3')
+        return buffer.getvalue()
+
+
+ENGINES = {
+    'gtts': GTTSEngine,
+    'espeak': EspeakEngine,
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+_network_down_until = 0.0
+
+
+def get_engine(name):
+    """
+    이름에 해당하는 엔진을 반환합니다. (엔진마다 한 번만 만듦)
+
+    Returns:
+        TTSEngine: 엔진 또는 None (알 수 없는 이름)
+    """
+    name = (name or '').lower()
+    if name not in ENGINES:
+        return None
+    with _engines_lock:
+        if name not in _engines:
+            _engines[name] = ENGINES[name]()
+        return _engines[name]
+
+
+class _NetworkCall:
+    """
+    데몬 스레드 하나에서 실행하는 네트워크 엔진 호출
+    공용 풀을 쓰지 않으므로 다른 작업(굽기/미리 만들기) 때문에 큐에서 기다리지 않고,
+    시간 제한은 호출이 시작될 때부터 잽니다.
+    시간 제한이 지난 뒤에 끝난 결과는 late(bytes)로 넘겨 버리지 않고 쓸 수 있게 합니다.
+    """
+
+    def __init__(self, func, args, late=None):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self._late = late
+        self._abandoned = False
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, args=(func, args), name='tts-network', daemon=True).start()
+
+    def _run(self, func, args):
+        try:
+            self.result = func(*args)
+        except BaseException as e:
+            self.error = e
+        with self._lock:
+            self.done.set()
+            abandoned = self._abandoned
+        if abandoned and self._late and self.error is None and self.result:
+            try:
+                self._late(self.result)
+            except Exception as e:
+                print(f"늦게 받은 음성 저장 오류: {str(e)}")
+
+    def wait(self, timeout):
+        """timeout초까지 기다립니다. 끝나지 않았으면 결과를 late로 넘기도록 표시하고 False를 반환합니다."""
+        if self.done.wait(timeout):
+            return True
+        with self._lock:
+            if self.done.is_set():
+                return True
+            self._abandoned = True
+        return False
+
+
+def _fallback_engine(primary):
+    fallback = get_engine(TTS_FALLBACK_ENGINE)
+    if fallback is None or fallback is primary or not fallback.is_available():
+        return None
+    return fallback
+
+
+def synthesize(text, lang='en', slow=False, engine=None, late=None):
+    """
+    설정된 엔진으로 음성을 만듭니다.
+    네트워크 엔진이 시작 후 TTS_NETWORK_TIMEOUT 안에 답하지 않거나 실패하면 대체 엔진으로 읽고,
+    TTS_FALLBACK_COOLDOWN 동안은 네트워크 엔진을 부르지 않고 바로 대체 엔진을 씁니다.
+
+    Args:
+        text (str): 읽을 텍스트
+        lang (str): 언어 코드
+        slow (bool): 느리게 읽기
+        engine (str): 사용할 엔진 이름 (None이면 TTS_ENGINE)
+        late (callable): 시간 제한 뒤에 네트워크 엔진이 끝나면 late(MP3 bytes) 호출 (캐시 저장용)
+
+    Returns:
+        tuple: (MP3 bytes, 실제로 사용한 엔진 이름)
+    """
+    global _network_down_until
+    primary = get_engine(engine or TTS_ENGINE)
+    if primary is None:
+        raise EngineUnavailable(f"알 수 없는 TTS 엔진입니다: {engine or TTS_ENGINE}")
+
+    fallback = _fallback_engine(primary) if primary.network else None
+    if fallback is None:
+        return primary.synthesize(text, lang, slow), primary.name
+
+    if time.monotonic() >= _network_down_until:
+        call = _NetworkCall(primary.synthesize, (text, lang, slow), late)
+        if not call.wait(TTS_NETWORK_TIMEOUT):
+            reason = 'timeout'
+        elif call.error is not None:
+            if not isinstance(call.error, Exception):
+                raise call.error
+            reason = type(call.error).__name__
+        else:
+            return call.result, primary.name
+        _network_down_until = time.monotonic() + TTS_FALLBACK_COOLDOWN
+        tracing.event('tts.fallback', tracing.WARNING, engine=primary.name, fallback=fallback.name, reason=reason)
+        print(f"{primary.name} 음성 실패({reason}), {TTS_FALLBACK_COOLDOWN:.0f}초 동안 {fallback.name} 사용")
+
+    return fallback.synthesize(text, lang, slow), fallback.name
+
+
+def available_engines():
+    """사용할 수 있는 엔진 이름 목록을 반환합니다."""
+    return [name for name in ENGINES if get_engine(name).is_available()]
@@ -0,0 +1,129 @@
+"""
+TTS(음성 합성) 헬퍼 모듈
+tts_engines의 엔진(기본 gTTS, 대체 espeak-ng)으로 문장을 읽어 주는 MP3를 메모리 안에서만 만듭니다.
+속도가 1.0이면 엔진 결과를 그대로 쓰고, 다른 속도는 기본 속도 음성 하나에서
+time_stretch로 만들어 속도마다 엔진을 다시 부르지 않습니다.
+만든 음성은 tts_cache에 저장되어 다시 들을 때 바로 나옵니다.
+네트워크 엔진이 실패해 대체 엔진으로 읽은 음성은 저장하지 않아, 다시 연결되면 원래 음성으로 돌아옵니다.
+브라우저로 보낼 때는 get_audio()가 MP3를 audio_encoding 형식(기본 Opus)으로 한 번 변환해 따로 저장합니다.
+"""
+
+import audio_encoding
+import tracing
+import tts_cache
+import tts_engines
+
+# 전송 형식으로 변환하지 못한 음성의 키 (MP3를 그대로 보냄)
+_encode_failed = set()
+
+
+def cache_key(text, lang='en', speed=1.0):
+    """설정된 엔진의 MP3 음성을 찾을 캐시 키를 만듭니다."""
+    return tts_cache.make_key(text, lang, speed, engine=tts_engines.TTS_ENGINE)
+
+
+def audio_key(text, lang='en', speed=1.0):
+    """브라우저로 보낼 음성의 캐시 키를 만듭니다. (tts_prefetch와 같은 키 사용)"""
+    if audio_encoding.is_passthrough():
+        return cache_key(text, lang, speed)
+    return tts_cache.make_key(text, lang, speed, audio_format=audio_encoding.extension(),
+                              engine=tts_engines.TTS_ENGINE, variant=audio_encoding.variant())
+
+
+def stored_key(text, lang='en', speed=1.0):
+    """
+    get_audio()가 실제로 캐시에 저장하는 (키, 형식)을 반환합니다.
+    변환에 실패한 음성은 MP3를 그대로 보내므로 MP3 키를 돌려줍니다.
+    """
+    key = audio_key(text, lang, speed)
+    if key in _encode_failed:
+        return cache_key(text, lang, speed), 'mp3'
+    return key, audio_encoding.extension() if not audio_encoding.is_passthrough() else 'mp3'
+
+
+def synthesize(text, lang='en', speed=1.0):
+    """
+    텍스트를 음성(MP3 bytes)으로 변환합니다.
+    속도가 1.0이 아니면 기본 속도 음성에서 음높이를 유지한 채 늘이거나 줄입니다.
+
+    Args:
+        text (str): 읽을 텍스트
+        lang (str): 언어 코드
+        speed (float): 재생 속도
+
+    Returns:
+        tuple: (MP3 데이터, 사용한 엔진 이름)
+    """
+    if speed == 1.0:
+        # 시간 제한 뒤에 도착한 음성도 버리지 않고 저장해 다음 요청에 씀
+        key = cache_key(text, lang, speed)
+        return tts_engines.synthesize(text, lang, late=lambda audio_bytes: tts_cache.put(key, audio_bytes))
+
+    base, engine = _get_speech(text, lang, 1.0)
+    try:
+        import time_stretch
+        return time_stretch.stretch_mp3(base, speed), engine
+    except ImportError:
+        # numpy/pydub가 없으면 느리게 읽기(0.7 이하) 또는 기본 속도 사용
+        return tts_engines.synthesize(text, lang, slow=True) if speed <= 0.7 else (base, engine)
+
+
+def _get_speech(text, lang, speed):
+    """캐시에서 찾거나 만들어 (MP3 데이터, 엔진 이름)을 반환합니다."""
+    key = cache_key(text, lang, speed)
+    audio_bytes = tts_cache.get(key)
+    if audio_bytes is not None:
+        return audio_bytes, tts_engines.TTS_ENGINE
+
+    audio_bytes, engine = synthesize(text, lang, speed)
+    if audio_bytes and engine == tts_engines.TTS_ENGINE:
+        tts_cache.put(key, audio_bytes)
+    return audio_bytes, engine
+
+
+def get_speech(text, lang='en', speed=1.0):
+    """
+    음성을 반환합니다. 캐시에 있으면 바로 반환하고, 없으면 만들어 저장합니다.
+
+    Returns:
+        bytes: MP3 데이터 (실패 시 예외 발생)
+    """
+    with tracing.span('tts.generate', lang=lang, speed=speed, chars=len(text)) as span:
+        audio_bytes, engine = _get_speech(text, lang, speed)
+        span.set(audio_bytes=len(audio_bytes), engine=engine)
+    return audio_bytes
+
+
+def get_audio(text, lang='en', speed=1.0):
+    """
+    브라우저로 보낼 음성을 반환합니다. (TTS_OUTPUT_FORMAT 형식, 기본 Opus)
+    변환한 음성은 캐시에 저장되어 다음부터는 변환 없이 바로 나옵니다.
+    변환할 수 없으면(ffmpeg/pydub 없음) MP3를 그대로 반환합니다.
+
+    Returns:
+        bytes: 오디오 데이터 (형식은 audio_encoding.mime_type으로 확인, 실패 시 예외 발생)
+    """
+    if audio_encoding.is_passthrough():
+        return get_speech(text, lang, speed)
+
+    key = audio_key(text, lang, speed)
+    if key in _encode_failed:
+        return get_speech(text, lang, speed)
+    audio_format = audio_encoding.extension()
+    audio_bytes = tts_cache.get(key, audio_format)
+    if audio_bytes is not None:
+        return audio_bytes
+
+    mp3_bytes, engine = _get_speech(text, lang, speed)
+    with tracing.span('tts.encode', format=audio_encoding.TTS_OUTPUT_FORMAT, mp3_bytes=len(mp3_bytes)) as span:
+        try:
+            audio_bytes = audio_encoding.transcode(mp3_bytes)
+        except Exception as e:
+            span.set(fallback=type(e).__name__)
+            _encode_failed.add(key)
+            return mp3_bytes
+        span.set(audio_bytes=len(audio_bytes))
+
+    if audio_bytes and engine == tts_engines.TTS_ENGINE:
+        tts_cache.put(key, audio_bytes, audio_format)
+    return audio_bytes
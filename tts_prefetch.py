@@ -0,0 +1,87 @@
+"""
+TTS 미리 만들기 모듈
+읽기 모드에서 페이지가 보이면 현재 페이지와 다음 몇 페이지의 음성을 선택한 속도로
+백그라운드에서 미리 만들어(전송 형식 변환까지) tts_cache에 넣어 둡니다.
+새 페이지에서 '듣기'를 누르면 기다리지 않고 바로 재생됩니다.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tts_cache
+
+# 현재 페이지 뒤로 미리 만들 페이지 수
+PREFETCH_PAGES = int(os.getenv('TTS_PREFETCH_PAGES', '2'))
+PREFETCH_WORKERS = int(os.getenv('TTS_PREFETCH_WORKERS', '2'))
+
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='tts-prefetch')
+_inflight = {}  # 캐시 키 -> Future
+_lock = threading.Lock()
+
+
+def _synthesize(text, lang, speed):
+    import tts_helper
+    try:
+        return tts_helper.get_audio(text, lang, speed)
+    except Exception as e:
+        print(f"음성 미리 만들기 오류: {str(e)}")
+        return None
+
+
+def schedule(text, lang='en', speed=1.0):
+    """
+    음성 만들기 작업을 백그라운드에 등록합니다.
+
+    Returns:
+        Future: 작업 또는 None (이미 캐시에 있는 경우)
+    """
+    if not text or not text.strip():
+        return None
+    import tts_helper
+
+    key = tts_helper.audio_key(text, lang, speed)
+    # 변환하지 못한 음성은 MP3로 저장되므로 실제로 저장되는 키로 확인
+    stored_key, audio_format = tts_helper.stored_key(text, lang, speed)
+
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        if tts_cache.contains(stored_key, audio_format):
+            return None
+        future = _executor.submit(_synthesize, text, lang, speed)
+        _inflight[key] = future
+        future.add_done_callback(lambda f, key=key: _forget(key))
+    return future
+
+
+def _forget(key):
+    with _lock:
+        _inflight.pop(key, None)
+
+
+def prefetch(story, page_index, speed=1.0, lookahead=PREFETCH_PAGES, lang='en'):
+    """현재 페이지와 다음 lookahead개 페이지의 음성을 미리 만듭니다."""
+    pages = story.get('pages', [])
+    for index in range(page_index, min(len(pages), page_index + lookahead + 1)):
+        schedule(pages[index].get('en', ''), lang, speed)
+
+
+def get_audio(text, lang='en', speed=1.0):
+    """
+    브라우저로 보낼 음성을 반환합니다. 미리 만드는 중이면 그 작업이 끝나기를 기다립니다.
+
+    Returns:
+        bytes: 오디오 데이터 (TTS_OUTPUT_FORMAT 형식, 실패 시 예외 발생)
+    """
+    import tts_helper
+
+    with _lock:
+        future = _inflight.get(tts_helper.audio_key(text, lang, speed))
+    if future is not None:
+        audio_bytes = future.result()
+        if audio_bytes:
+            return audio_bytes
+    # 미리 만들기가 없었거나 실패했으면 지금 만듦 (오류는 호출한 곳으로 전달)
+    return tts_helper.get_audio(text, lang, speed)
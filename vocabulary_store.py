@@ -0,0 +1,117 @@
+"""
+핵심 단어 저장 모듈
+동화책별 핵심 단어 분석 결과를 stories.json의 동화책 항목에 함께 저장합니다.
+동화책 ID + 본문 해시 + 프롬프트 버전으로 키를 만들어, 페이지 텍스트를 고치거나
+프롬프트가 바뀌면 저장된 결과를 자동으로 다시 분석합니다.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+
+import story_store
+
+
+def content_hash(story):
+    """동화책 영어 본문의 해시를 계산합니다."""
+    texts = [page.get('en', '') for page in story.get('pages', [])]
+    payload = json.dumps(texts, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def cache_key(story):
+    """동화책 ID, 본문 해시, 프롬프트 버전으로 저장 키를 만듭니다."""
+    from gemini_helper import VOCABULARY_PROMPT_VERSION
+    return f"{story['id']}:{content_hash(story)}:{VOCABULARY_PROMPT_VERSION}"
+
+
+def get_cached(story):
+    """
+    저장된 핵심 단어 분석 결과를 반환합니다.
+
+    Returns:
+        dict: {'explanation', 'vocabulary', 'source', 'cards'(미리 만든 경우)}
+            또는 None (없거나 오래된 경우)
+    """
+    stored = story.get('vocabulary')
+    if not stored or stored.get('cache_key') != cache_key(story):
+        return None
+    if not stored.get('vocabulary'):
+        return None
+    return stored
+
+
+def save(story, vocabulary_data, source, json_file=story_store.STORIES_FILE):
+    """분석 결과를 동화책 항목에 저장하고 저장된 값을 반환합니다."""
+    key = cache_key(story)
+    stored = {
+        'cache_key': key,
+        'explanation': vocabulary_data.get('explanation', ''),
+        'vocabulary': vocabulary_data.get('vocabulary', []),
+        'source': source,
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+    def _apply(saved_story):
+        # 분석하는 동안 본문이 바뀌었다면 오래된 결과이므로 저장하지 않음
+        if cache_key(saved_story) != key:
+            return False
+        saved_story['vocabulary'] = stored
+
+    story_store.update_story(story['id'], _apply, json_file)
+    story['vocabulary'] = stored
+    return stored
+
+
+def save_cards(story, json_file=story_store.STORIES_FILE):
+    """
+    저장된 핵심 단어로 단어 카드 묶음을 만들어 함께 저장합니다.
+
+    Returns:
+        list: 카드 목록 (저장된 핵심 단어가 없으면 빈 목록)
+    """
+    from gemini_helper import generate_vocabulary_cards
+
+    stored = get_cached(story)
+    if not stored:
+        return []
+
+    cards = generate_vocabulary_cards(stored['vocabulary'])
+    key = stored['cache_key']
+
+    def _apply(saved_story):
+        saved_vocabulary = saved_story.get('vocabulary')
+        if not saved_vocabulary or saved_vocabulary.get('cache_key') != key:
+            return False
+        saved_vocabulary['cards'] = cards
+
+    story_store.update_story(story['id'], _apply, json_file)
+    stored['cards'] = cards
+    return cards
+
+
+def analyze(story, json_file=story_store.STORIES_FILE):
+    """
+    핵심 단어를 새로 분석해 저장합니다.
+    Gemini 분석이 실패하면 간단한 단어 추출 방식을 사용합니다.
+
+    Returns:
+        dict: {'explanation', 'vocabulary', 'source'} ('source'는 'gemini' 또는 'simple')
+    """
+    from gemini_helper import extract_key_vocabulary, extract_vocabulary_simple
+
+    vocabulary_data = extract_key_vocabulary(story)
+    source = 'gemini'
+    if not vocabulary_data or not vocabulary_data.get('vocabulary'):
+        vocabulary_data = extract_vocabulary_simple(story)
+        source = 'simple'
+
+    if not vocabulary_data or not vocabulary_data.get('vocabulary'):
+        return {'explanation': '', 'vocabulary': [], 'source': source}
+
+    return save(story, vocabulary_data, source, json_file)
+
+
+def get_or_analyze(story, json_file=story_store.STORIES_FILE):
+    """저장된 결과가 있으면 바로 반환하고, 없으면 분석합니다."""
+    return get_cached(story) or analyze(story, json_file)